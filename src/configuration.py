@@ -1,6 +1,10 @@
+import os
+
 # Hosting
 HOST_IP_RANGE = '0.0.0.0'
 HOST_PORT = 9999
+HOST_WORKER_COUNT = int(os.environ.get('BIFROST_WORKER_COUNT', os.cpu_count() or 1))
+HOST_THREADS_PER_WORKER = int(os.environ.get('BIFROST_THREADS_PER_WORKER', 4))
 
 # Application
 APP_NAME = 'Bifröst'
@@ -10,6 +14,53 @@ APP_ROUTE_PREFIX = 'api/v1'
 
 # Caching
 MODEL_CACHE_AGE_IN_HOURS = 6
-MODEL_CACHE_IN_SECONDS = MODEL_CACHE_AGE_IN_HOURS * 60
+MODEL_CACHE_IN_SECONDS = MODEL_CACHE_AGE_IN_HOURS * 60 * 60
 MODEL_BULK_INFERENCE_CACHE_IN_HOURS = 1
 MODEL_BULK_INFERENCE_CACHE_IN_SECONDS = MODEL_BULK_INFERENCE_CACHE_IN_HOURS * 60
+MODEL_REGISTRY_MAX_AGE_IN_SECONDS = MODEL_CACHE_IN_SECONDS
+MODEL_CACHE_MAX_SIZE_IN_MEGABYTES = 512
+MODEL_CACHE_MAX_SIZE_IN_BYTES = MODEL_CACHE_MAX_SIZE_IN_MEGABYTES * 1024 * 1024
+MODEL_BULK_INFERENCE_CACHE_MAX_SIZE_IN_MEGABYTES = 64
+MODEL_BULK_INFERENCE_CACHE_MAX_SIZE_IN_BYTES = MODEL_BULK_INFERENCE_CACHE_MAX_SIZE_IN_MEGABYTES * 1024 * 1024
+FEATURE_MATRIX_CACHE_MAX_SIZE_IN_MEGABYTES = 256
+FEATURE_MATRIX_CACHE_MAX_SIZE_IN_BYTES = FEATURE_MATRIX_CACHE_MAX_SIZE_IN_MEGABYTES * 1024 * 1024
+
+# Incremental Training
+MODEL_INCREMENTAL_UPDATE_BOOST_ROUNDS = 10
+MODEL_FULL_RETRAINING_INTERVAL_IN_UPDATES = 24
+
+# Training Profiles
+# One of fast, balanced or accurate, optionally overridden per pair as a comma separated list, e.g. BTCUSDT=accurate,DOGEBTC=fast.
+MODEL_TRAINING_PROFILE = os.environ.get('BIFROST_TRAINING_PROFILE', 'balanced')
+MODEL_TRAINING_PROFILES_BY_PAIR = {entry.split('=')[0].strip().upper(): entry.split('=')[1].strip().lower() for entry in os.environ.get('BIFROST_TRAINING_PROFILES_BY_PAIR', '').split(',') if '=' in entry}
+
+# Hyperparameter Search
+MODEL_HYPERPARAMETER_SEARCH_ENABLED = os.environ.get('BIFROST_HYPERPARAMETER_SEARCH_ENABLED', 'false').lower() == 'true'
+MODEL_HYPERPARAMETER_SEARCH_BUDGET_IN_SECONDS = 60
+MODEL_TUNED_PARAMETERS_MAX_AGE_IN_DAYS = 7
+MODEL_TUNED_PARAMETERS_MAX_AGE_IN_SECONDS = MODEL_TUNED_PARAMETERS_MAX_AGE_IN_DAYS * 24 * 60 * 60
+
+# Concurrency
+MODEL_TRAINING_TIMEOUT_IN_SECONDS = 10 * 60
+
+# Background Retraining
+MODEL_RETRAINING_ENABLED = True
+MODEL_RETRAINING_DELAY_AFTER_CANDLE_CLOSE_IN_SECONDS = 30
+MODEL_RETRAINING_IDLE_EXPIRY_IN_HOURS = 24
+MODEL_RETRAINING_IDLE_EXPIRY_IN_SECONDS = MODEL_RETRAINING_IDLE_EXPIRY_IN_HOURS * 60 * 60
+
+# Market Data Streaming
+# Off by default, as streaming from Binance requires the websocket-client package.
+MARKET_DATA_STREAMING_ENABLED = os.environ.get('BIFROST_STREAMING_ENABLED', 'false').lower() == 'true'
+MARKET_DATA_STREAMING_IDLE_EXPIRY_IN_SECONDS = MODEL_RETRAINING_IDLE_EXPIRY_IN_SECONDS
+
+# Startup Prewarming
+# Pair/period combinations loaded into memory in the background at startup, as a comma separated list, e.g. BTCUSDT=1h,BTCUSDT=4h,ETHUSDT=1h.
+PREWARM_PAIRS = [(entry.split('=')[0].strip().upper(), entry.split('=')[1].strip()) for entry in os.environ.get('BIFROST_PREWARM_PAIRS', '').split(',') if '=' in entry]
+
+# Backtesting
+BACKTEST_MIN_TRAINING_CANDLES = 100
+BACKTEST_MAX_WORKERS = None
+
+# Batch Forecasting
+BATCH_MODEL_WORKER_COUNT = os.cpu_count() or 1
@@ -2,16 +2,36 @@ from models.binance import ForecastRequest
 from pandas import DataFrame
 from .config_data_access import ConfigDataAccess
 from .fs_cache_data_access import FsCacheDataAccess
+from .kline_ring_buffer_data_access import KlineRingBufferDataAccess
+from .memory_cache_data_access import MemoryCacheDataAccess
+from .single_flight_data_access import SingleFlightDataAccess
+from .kline_resampling_data_access import get_finer_periods, get_interval_start, resample_klines
+from .metrics_data_access import metrics_data_access
+from .rate_limited_client_data_access import RateLimitedClientDataAccess
+from enums.intervals import KLINE_INTERVAL_DURATIONS_IN_MS
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
 import requests
-import json
+import threading
 import pandas as pd
 from datetime import datetime as dt, timedelta
 import numpy as np
 
 
+def get_kline_request_weight(limit: int) -> int:
+    '''Get the request weight Binance charges for a /klines call of a given limit.'''
+    if limit < 100:
+        return 1
+
+    if limit < 500:
+        return 2
+
+    return 5 if limit <= 1000 else 10
+
+
 class BinanceDataAccess():
     '''A client for fetching market information from the Binance exchange.'''
-    def __init__(self, config_data_access: ConfigDataAccess, cache_data_access: FsCacheDataAccess):
+    def __init__(self, config_data_access: ConfigDataAccess, cache_data_access: FsCacheDataAccess, kline_buffer_data_access: KlineRingBufferDataAccess = None):
         if config_data_access is None:
             raise Exception('Valid config_data_access is required.')
 
@@ -21,89 +41,296 @@ class BinanceDataAccess():
         self.base_url = config_data_access.binance_base_api_url
         self.cache_data_access = cache_data_access
         self.window_length_in_days = config_data_access.window_length_in_days
+        self.max_klines_per_request = config_data_access.binance_max_klines_per_request
+        self.max_concurrent_requests = config_data_access.binance_max_concurrent_requests
+        # A single keep-alive connection pool shared by all fetches, bounded to the backfill concurrency.
+        self.session = requests.Session()
+        adapter: HTTPAdapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_concurrent_requests, pool_block=True)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.client = RateLimitedClientDataAccess(session=self.session,
+                                                  weight_budget_per_minute=config_data_access.binance_weight_budget_per_minute,
+                                                  max_retries=config_data_access.binance_max_retries,
+                                                  max_wait_in_seconds=config_data_access.binance_max_throttle_wait_in_seconds)
+        self.backfill_executor = ThreadPoolExecutor(max_workers=self.max_concurrent_requests, thread_name_prefix='binance-backfill')
+        self.__market_data_fetches__ = SingleFlightDataAccess(timeout_in_seconds=config_data_access.market_data_fetch_timeout_in_seconds)
+        # Live klines of streamed pairs, served from memory while their stream keeps them fresh.
+        self.kline_buffer_data_access = kline_buffer_data_access
+        self.live_kline_max_age_in_seconds = config_data_access.live_kline_max_age_in_seconds
+        self.__cache_write_lock__ = threading.Lock()
+        # The loaded window of every pair, shared by all requests until its next candle is due or the window start moves.
+        self.__hot_windows__ = MemoryCacheDataAccess(cache_max_age_in_seconds=24 * 60 * 60, max_allowed_bytes=config_data_access.hot_window_max_size_in_bytes)
 
-    def __get_market_data_from_binance__(self, pair: str, start_time_ms: int, end_time_ms: int, period: str) -> list:
-        '''Fetch symbol price information from Binance'''
+    def __get_market_data_from_binance__(self, pair: str, start_time_ms: int, end_time_ms: int, period: str) -> dict:
+        '''Fetch symbol price information from Binance as typed kline columns.'''
         url: str = f'{self.base_url}/klines'
         request: dict = {
             'symbol': pair,
             'interval': period,
             'startTime': start_time_ms,
-            'endTime': end_time_ms
+            'endTime': end_time_ms,
+            'limit': self.max_klines_per_request
         }
-        response: requests.Response = requests.get(url, params=request)
-        response_text: str = response.text
+        with metrics_data_access.time_stage('exchange_fetch'):
+            response: requests.Response = self.client.get(url, params=request, weight=get_kline_request_weight(self.max_klines_per_request))
+            response_content: bytes = response.content
 
         if not response.status_code == 200:
-            raise Exception(f'Failed to fetch market data from Binance with error: {response_text}')
+            raise Exception(f'Failed to fetch market data from Binance with error: {response.text}')
 
-        return json.loads(response_text)
+        with metrics_data_access.time_stage('kline_decode'):
+            return self.cache_data_access.decode_klines(response_content)
 
-    def __get_market_data_from_cache__(self, pair: str, period: str) -> list:
-        '''Get pair market data from cache first.'''
+    def __get_market_data_from_cache__(self, pair: str, period: str, start_time_ms: int = None) -> dict:
+        '''Get pair market data columns from cache first.'''
         key: str = f'{pair}.{period}'
-        response: list = self.cache_data_access.get_from_cache(key=key)
+
+        with metrics_data_access.time_stage('cache_read'):
+            response: dict = self.cache_data_access.get_klines_from_cache(key=key, start_time_ms=start_time_ms)
 
         if response is None:
-            return []
+            return self.cache_data_access.klines_to_columns([])
 
         return response
 
+    def __columns_to_market_data_frame__(self, columns: dict) -> pd.DataFrame:
+        '''Convert the market data columns into a dataframe.'''
+        with metrics_data_access.time_stage('dataframe_build'):
+            data: pd.DataFrame = pd.DataFrame({
+                # Cached columns are read-only memory maps, which older pandas cannot convert to datetimes in place.
+                'time': pd.to_datetime(np.array(columns['time'], dtype=np.int64), unit='ms'),
+                'open': np.asarray(columns['open'], dtype=np.float64),
+                'high': np.asarray(columns['high'], dtype=np.float64),
+                'low': np.asarray(columns['low'], dtype=np.float64),
+                'close': np.asarray(columns['close'], dtype=np.float64),
+                'volume': np.asarray(columns['volume'], dtype=np.float64).astype(np.int64)
+            })
+            data.index = data['time']
+
+        return data
+
     def __json_to_market_data_frame__(self, json_data: list) -> pd.DataFrame:
         '''Convert the market data json into a dataframe.'''
-        data: pd.DataFrame = pd.DataFrame(json_data)
-        data.columns = ['time', 'open', 'high', 'low', 'close', 'volume', 'close_time', 'qav', 'num_trades', 'taker_base_vol', 'taker_quote_vol', 'ignore']
-        data = data.iloc[:, :6]
-        data['time'] = pd.to_datetime(data['time'], unit='ms')
-        data['open'] = data['open'].astype(np.float64)
-        data['high'] = data['high'].astype(np.float64)
-        data['low'] = data['low'].astype(np.float64)
-        data['close'] = data['close'].astype(np.float64)
-        data['volume'] = data['volume'].astype(np.float64).astype(np.int64)
-        data.index = data['time']
+        return self.__columns_to_market_data_frame__(self.cache_data_access.klines_to_columns(json_data))
 
-        return data
+    def __cache_market_data__(self, pair: str, period: str, data) -> int:
+        '''Append new pair market data to cache and return the last durable candle time.'''
+        key: str = f'{pair}.{period}'
+
+        # Backfills and streamed candles may append to the same key concurrently.
+        with self.__cache_write_lock__:
+            self.__hot_windows__.remove_from_cache(key)
+
+            return self.cache_data_access.append_klines_to_cache(key=key, data=data)
+
+    def get_hot_window_statistics(self) -> dict:
+        '''Get the entry count, approximate size and hit, miss, eviction and expiration counts of the in-memory market data windows.'''
+        return self.__hot_windows__.get_statistics()
+
+    def track_live_klines(self, pair: str, period: str) -> bool:
+        '''Start keeping the configured window of a pair in memory, seeded by its next fetch and updated with ingested live klines. Returns whether live klines are supported for the pair and period.'''
+        if self.kline_buffer_data_access is None or period not in KLINE_INTERVAL_DURATIONS_IN_MS:
+            return False
+
+        # The window starts at midnight, so up to a day more than its length is held.
+        capacity: int = (self.window_length_in_days + 1) * 24 * 60 * 60 * 1000 // KLINE_INTERVAL_DURATIONS_IN_MS[period] + 1
+        self.kline_buffer_data_access.track(f'{pair}.{period}', capacity)
+
+        return True
+
+    def untrack_live_klines(self, pair: str, period: str):
+        '''Stop keeping a pair in memory.'''
+        if self.kline_buffer_data_access is not None:
+            self.kline_buffer_data_access.untrack(f'{pair}.{period}')
 
-    def __cache_market_data__(self, pair: str, period: str, data):
-        '''Persist pair market data to cache.'''
+    def ingest_live_klines(self, pair: str, period: str, klines: list, is_closed: bool) -> bool:
+        '''Apply live updates of raw klines to the in-memory window of a pair and persist them to cache once closed. Returns whether the in-memory window was updated, which it is not until seeded by a fetch or after a gap.'''
+        columns: dict = self.cache_data_access.klines_to_columns(klines)
+        is_updated: bool = self.kline_buffer_data_access is not None and self.kline_buffer_data_access.upsert(f'{pair}.{period}', columns, KLINE_INTERVAL_DURATIONS_IN_MS.get(period))
+
+        if is_closed:
+            self.__cache_live_klines__(pair, period, columns)
+
+        return is_updated
+
+    def __cache_live_klines__(self, pair: str, period: str, columns: dict) -> int:
+        '''Append closed live klines to cache should they continue it. Otherwise, e.g. after the stream dropped candles while reconnecting, they are skipped and the in-memory window unseeded, so that the next fetch backfills the missing klines from the last durable one onwards. Returns the last durable candle time, should they have been appended.'''
         key: str = f'{pair}.{period}'
+        cached_data: dict = self.cache_data_access.get_klines_from_cache(key=key)
+        last_durable_entry: int = None if cached_data is None or len(cached_data['time']) == 0 else int(cached_data['time'][-1])
+        interval_in_ms: int = KLINE_INTERVAL_DURATIONS_IN_MS.get(period)
+
+        if len(columns['time']) == 0:
+            return None
+
+        if last_durable_entry is None or (interval_in_ms is not None and int(columns['time'][0]) > last_durable_entry + interval_in_ms):
+            metrics_data_access.increment('bifrost_market_data_stream_gaps_total', {'period': period})
+
+            if self.kline_buffer_data_access is not None:
+                self.kline_buffer_data_access.reset(key)
+
+            return None
+
+        return self.__cache_market_data__(pair, period, columns)
+
+    def reset_live_klines(self):
+        '''Drop the in-memory windows of all pairs, e.g. after live updates may have been missed, so that each is seeded by its next fetch.'''
+        if self.kline_buffer_data_access is not None:
+            self.kline_buffer_data_access.reset()
+
+    def __plan_backfill_windows__(self, start_time_ms: int, end_time_ms: int, period: str) -> list:
+        '''Split a time range into consecutive (start, end) windows that each fit in a single kline request.'''
+        window_length_in_ms: int = KLINE_INTERVAL_DURATIONS_IN_MS[period] * self.max_klines_per_request
+
+        return [(window_start, min(window_start + window_length_in_ms - 1, end_time_ms)) for window_start in range(start_time_ms, end_time_ms + 1, window_length_in_ms)]
+
+    def __backfill_market_data__(self, pair: str, period: str, start_time_ms: int, end_time_ms: int) -> int:
+        '''Fetch all windows of a time range concurrently and append them to cache in order. Returns the last durable candle time.'''
+        windows: list = self.__plan_backfill_windows__(start_time_ms, end_time_ms, period)
+        last_durable_entry: int = None
+
+        print(f'Backfilling "{pair}" ({period}) with {len(windows)} concurrent requests.')
+
+        # Results are yielded in window order, so each page is appended as soon as it and all earlier pages arrived.
+        for delta_data in self.backfill_executor.map(lambda window: self.__get_market_data_from_binance__(pair, window[0], window[1], period), windows):
+            last_durable_entry = self.__cache_market_data__(pair, period, delta_data) or last_durable_entry
+
+        return last_durable_entry
+
+    def __page_market_data__(self, pair: str, period: str, start_time_ms: int, end_time_ms: int, now: dt) -> int:
+        '''Walk forward one page at a time for intervals without a fixed length. Returns the last durable candle time.'''
+        last_cache_entry: int = start_time_ms
+        last_cache_entry_datetime: dt = dt.fromtimestamp(last_cache_entry / 1000)
+        last_durable_entry: int = None
 
-        self.cache_data_access.write_to_cache(key=key, data=data)
+        while not self.__is_same_hour__(last_cache_entry_datetime, now):
+            delta_data: dict = self.__get_market_data_from_binance__(pair, str(last_cache_entry), str(end_time_ms), period)
+            last_durable_entry = self.__cache_market_data__(pair, period, delta_data)
+
+            # A page that ends where the previous one did holds no new candles.
+            if last_durable_entry is None or last_durable_entry == last_cache_entry:
+                break
+
+            last_cache_entry = last_durable_entry
+            last_cache_entry_datetime = dt.fromtimestamp(last_cache_entry / 1000)
+
+        return last_durable_entry
+
+    def __is_same_hour__(self, x: dt, y: dt) -> bool:
+        '''Whether two times fall in the same hour of the same day.'''
+        return x.day == y.day and x.month == y.month and x.year == y.year and x.hour == y.hour
 
     def get_market_data(self, request: ForecastRequest) -> DataFrame:
         '''Get the kline market data for a given symbol <pair> with a candle length of <period>, for <window_length_in_days> days ago to now.'''
+        # Concurrent requests for the same pair share a single cache refresh and each get their own shallow copy of the result.
+        data: DataFrame = self.__market_data_fetches__.execute(f'{request.pair_name}.{request.period}', lambda: self.__get_market_data__(request))
+
+        if data is None:
+            return None
+
+        return data.copy(deep=False)
+
+    def __get_market_data__(self, request: ForecastRequest) -> DataFrame:
+        '''Refresh the cache for a given request and load the configured window from it.'''
         now: int = dt.now()
         pair: str = request.pair_name
         start: str = str(int((dt(now.year, now.month, now.day) - timedelta(days=self.window_length_in_days)).timestamp() * 1000))
         end: str = str(int(now.timestamp() * 1000))
+        live_data: dict = self.__get_live_market_data__(pair, request.period, int(start))
+
+        if live_data is not None:
+            metrics_data_access.increment('bifrost_market_data_reads_total', {'source': 'live'})
+
+            return self.__columns_to_market_data_frame__(live_data)
+
+        hot_window: dict = self.__hot_windows__.get_from_cache(f'{pair}.{request.period}')
+
+        if hot_window is not None and hot_window['start_time_ms'] == int(start) and now.timestamp() * 1000 < hot_window['refresh_due_at_ms']:
+            metrics_data_access.increment('bifrost_market_data_reads_total', {'source': 'memory'})
+
+            return hot_window['data']
 
         print(f'Fetching data for "{pair}" from "{start}" to "{end}" ({self.window_length_in_days} days).')
 
-        data: list = self.__get_market_data_from_cache__(pair, request.period)
-        last_cache_entry: int = int(start)
+        self.__refresh_market_data__(pair, request.period, int(start), int(end), now)
+        data: dict = self.__get_market_data_from_cache__(pair, request.period, start_time_ms=int(start))
+        metrics_data_access.increment('bifrost_market_data_reads_total', {'source': 'cache'})
 
-        if len(data) > 1:
-            last_cache_entry = data[-1][0]
+        if len(data['time']) <= 1:
+            return None
 
-        last_cache_entry_time: str = str(last_cache_entry)
-        last_cache_entry_datetime: dt = dt.fromtimestamp(last_cache_entry / 1000)
-        last_delta_data: list = None
+        if self.kline_buffer_data_access is not None:
+            self.kline_buffer_data_access.seed(f'{pair}.{request.period}', data)
 
-        while not (last_cache_entry_datetime.day == now.day and last_cache_entry_datetime.month == now.month and last_cache_entry_datetime.year == now.year and last_cache_entry_datetime.hour == now.hour):
-            delta_data: list = self.__get_market_data_from_binance__(pair, last_cache_entry_time, end, request.period)
+        return self.__write_hot_window__(pair, request.period, int(start), data)
 
-            if last_delta_data == delta_data:
-                break
+    def __refresh_market_data__(self, pair: str, period: str, start_time_ms: int, end_time_ms: int, now: dt):
+        '''Bring the cache of a pair up to date from a start time onwards. Coarser intervals are resampled from a cached finer interval where possible, and only fetched from the exchange otherwise.'''
+        data: dict = self.__get_market_data_from_cache__(pair, period)
+        last_cache_entry: int = start_time_ms
 
-            data: list = data + delta_data
+        if len(data['time']) > 1:
+            last_cache_entry = int(data['time'][-1])
 
-            if len(data) <= 1:
-                return None
+        if self.__is_same_hour__(dt.fromtimestamp(last_cache_entry / 1000), now):
+            return
 
-            last_cache_entry = data[-1][0]
-            last_cache_entry_time = str(last_cache_entry)
-            last_cache_entry_datetime = dt.fromtimestamp(last_cache_entry / 1000)
-            self.__cache_market_data__(pair, request.period, data)
-            last_delta_data = delta_data
+        source_period: str = self.__get_resampling_source__(pair, period, last_cache_entry, end_time_ms)
 
-        return self.__json_to_market_data_frame__(data)
+        if source_period is not None:
+            self.__resample_market_data__(pair, source_period, period, last_cache_entry, end_time_ms, now)
+        elif period in KLINE_INTERVAL_DURATIONS_IN_MS:
+            self.__backfill_market_data__(pair, period, last_cache_entry, end_time_ms)
+        else:
+            self.__page_market_data__(pair, period, last_cache_entry, end_time_ms, now)
+
+    def __get_resampling_source__(self, pair: str, period: str, start_time_ms: int, end_time_ms: int) -> str:
+        '''Get the coarsest finer interval of a pair that is cached from the start of the kline a start time falls into and can be caught up with a single request. Otherwise None.'''
+        for finer_period in get_finer_periods(period):
+            data: dict = self.cache_data_access.get_klines_from_cache(key=f'{pair}.{finer_period}')
+
+            if data is None or len(data['time']) == 0 or int(data['time'][0]) > get_interval_start(start_time_ms, period):
+                continue
+
+            if (end_time_ms - int(data['time'][-1])) // KLINE_INTERVAL_DURATIONS_IN_MS[finer_period] <= self.max_klines_per_request:
+                return finer_period
+
+        return None
+
+    def __resample_market_data__(self, pair: str, source_period: str, period: str, start_time_ms: int, end_time_ms: int, now: dt):
+        '''Refresh the cache of a finer interval and append the coarser klines resampled from it, from the kline a start time falls into onwards.'''
+        interval_start_time_ms: int = get_interval_start(start_time_ms, period)
+
+        self.__refresh_market_data__(pair, source_period, interval_start_time_ms, end_time_ms, now)
+        print(f'Resampling "{pair}" ({period}) from {source_period} klines.')
+
+        with metrics_data_access.time_stage('resample'):
+            source_data: dict = self.__get_market_data_from_cache__(pair, source_period, start_time_ms=interval_start_time_ms)
+            self.__cache_market_data__(pair, period, resample_klines(source_data, period))
+
+        metrics_data_access.increment('bifrost_market_data_resamples_total', {'period': period, 'source_period': source_period})
+
+    def __write_hot_window__(self, pair: str, period: str, start_time_ms: int, data: dict) -> DataFrame:
+        '''Build the data frame of a loaded window and keep it in memory until its next candle is due. Its typed columns are private copies of the memory-mapped cache and are handed to every request as shallow copies, so they are never modified in place.'''
+        market_data: DataFrame = self.__columns_to_market_data_frame__(data)
+        last_open_time_ms: int = int(data['time'][-1])
+        # Intervals without a fixed length are refreshed hourly, like the cache itself.
+        interval_in_ms: int = KLINE_INTERVAL_DURATIONS_IN_MS.get(period, 60 * 60 * 1000)
+        hot_window: dict = {'data': market_data, 'start_time_ms': start_time_ms, 'refresh_due_at_ms': last_open_time_ms + interval_in_ms}
+
+        self.__hot_windows__.write_to_cache(f'{pair}.{period}', hot_window)
+
+        return market_data
+
+    def __get_live_market_data__(self, pair: str, period: str, start_time_ms: int) -> dict:
+        '''Get the in-memory window of a streamed pair from a start time onwards, should it be fresh and cover the start time. Otherwise None.'''
+        if self.kline_buffer_data_access is None:
+            return None
+
+        # The window start only moves forward, so a buffer seeded from an earlier start always covers it.
+        data: dict = self.kline_buffer_data_access.get_klines(f'{pair}.{period}', start_time_ms=start_time_ms, max_age_in_seconds=self.live_kline_max_age_in_seconds)
+
+        if data is None or len(data['time']) <= 1:
+            return None
+
+        return data
@@ -1,6 +1,25 @@
+import os
+
+
 class ConfigDataAccess():
     '''A class holding all static application configuration.'''
     def __init__(self):
         self.window_length_in_days = 60
         self.data_dir_relative_path = 'pair_data'
-        self.binance_base_api_url = 'https://api.binance.com/api/v3'
+        self.model_dir_relative_path = 'model_data'
+        self.model_versions_to_keep = 3
+        # Overridable to point the service at a local stand-in, like test/stubs/binance_stub_server.py, for offline and load test runs.
+        self.binance_base_api_url = os.environ.get('BIFROST_BINANCE_BASE_API_URL', 'https://api.binance.com/api/v3')
+        self.binance_stream_url = os.environ.get('BIFROST_BINANCE_STREAM_URL', 'wss://stream.binance.com:9443')
+        self.binance_max_klines_per_request = 1000
+        self.binance_max_concurrent_requests = 8
+        self.market_data_fetch_timeout_in_seconds = 300
+        # Binance allows 6000 request weight per minute and IP, of which a share is left to other clients sharing the IP.
+        self.binance_weight_budget_per_minute = int(os.environ.get('BIFROST_BINANCE_WEIGHT_BUDGET_PER_MINUTE', 4800))
+        self.binance_max_retries = 4
+        # Calls that would have to wait longer for budget, or out a ban, fail instead.
+        self.binance_max_throttle_wait_in_seconds = 60
+        # Streamed windows that saw no live update for longer are refreshed from the cache and the REST API instead.
+        self.live_kline_max_age_in_seconds = 60
+        # Loaded market data windows are kept in memory until their next candle is due, within this budget.
+        self.hot_window_max_size_in_bytes = 256 * 1024 * 1024
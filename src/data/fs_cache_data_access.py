@@ -2,8 +2,21 @@ from .config_data_access import ConfigDataAccess
 import os
 import os.path
 import json
+import struct
+import numpy as np
 from pathlib import Path
 
+# Columnar kline file layout: a fixed size header followed by one fixed-width column region per kline field.
+KLINE_FILE_MAGIC = b'FAKL'
+KLINE_FILE_VERSION = 1
+KLINE_FILE_HEADER_FORMAT = '<4sIQQ'
+KLINE_FILE_HEADER_SIZE = 64
+KLINE_FILE_MIN_CAPACITY = 1024
+KLINE_COLUMNS = (('time', np.int64), ('open', np.float64), ('high', np.float64), ('low', np.float64), ('close', np.float64), ('volume', np.float64))
+KLINE_COLUMN_WIDTH = 8
+# The JSON punctuation stripped from a kline array payload, leaving only its comma separated values.
+KLINE_PAYLOAD_PUNCTUATION = b'[]"'
+
 
 class FsCacheDataAccess():
     '''A proxy to the file system for the respective cache directory configured.'''
@@ -41,3 +54,193 @@ class FsCacheDataAccess():
 
         with open(file_name, 'w') as f:
             f.write(json.dumps(data))
+
+    def __get_kline_file_name__(self, key: str) -> str:
+        '''Get the columnar kline file name for a given key.'''
+        return f'{self.data_dir_path}/{key}.fak'
+
+    def __read_kline_header__(self, file_name: str) -> tuple:
+        '''Read the (capacity, count) pair from a columnar kline file header.'''
+        with open(file_name, 'rb') as f:
+            header: bytes = f.read(struct.calcsize(KLINE_FILE_HEADER_FORMAT))
+
+        magic, version, capacity, count = struct.unpack(KLINE_FILE_HEADER_FORMAT, header)
+
+        if magic != KLINE_FILE_MAGIC or version != KLINE_FILE_VERSION:
+            raise Exception(f'Unsupported kline cache file "{file_name}".')
+
+        return capacity, count
+
+    def klines_to_columns(self, klines: list) -> dict:
+        '''Convert a list of raw Binance klines into typed columns.'''
+        if len(klines) == 0:
+            return {name: np.empty(0, dtype=dtype) for name, dtype in KLINE_COLUMNS}
+
+        values: np.ndarray = np.array([kline[:len(KLINE_COLUMNS)] for kline in klines], dtype=np.float64)
+
+        return {name: values[:, i].astype(dtype) for i, (name, dtype) in enumerate(KLINE_COLUMNS)}
+
+    def decode_klines(self, payload) -> dict:
+        '''Decode a JSON array of raw Binance klines, as returned by the exchange or stored in legacy cache files, straight into typed columns without creating a Python object per value.'''
+        if payload is None:
+            raise Exception('Valid payload is required.')
+
+        payload = payload.encode() if isinstance(payload, str) else payload
+
+        if not payload.lstrip().startswith(b'['):
+            raise Exception('Valid kline payload is required.')
+
+        row_count: int = payload.count(b'[') - 1
+
+        if row_count < 1:
+            return self.klines_to_columns([])
+
+        # Without brackets and quotes, the payload is a flat list of numbers that numpy parses in a single native pass.
+        values: np.ndarray = np.fromstring(payload.translate(None, KLINE_PAYLOAD_PUNCTUATION), dtype=np.float64, sep=',')
+        field_count: int = len(values) // row_count
+
+        if field_count < len(KLINE_COLUMNS) or field_count * row_count != len(values):
+            raise Exception('Valid kline payload is required.')
+
+        values = values.reshape(row_count, field_count)
+
+        return {name: values[:, i].astype(dtype) for i, (name, dtype) in enumerate(KLINE_COLUMNS)}
+
+    def __migrate_legacy_klines__(self, key: str) -> bool:
+        '''Convert a legacy JSON kline file for the key into the columnar format, should one exist.'''
+        file_name: str = f'{self.data_dir_path}/{key}.fa'
+
+        if not os.path.isfile(file_name):
+            return False
+
+        with open(file_name, 'rb') as f:
+            columns: dict = self.decode_klines(f.read())
+
+        # Legacy files repeat the boundary candle of every fetched page, so only the latest copy of each candle is kept.
+        is_latest_copy: np.ndarray = np.append(columns['time'][1:] != columns['time'][:-1], True)
+        columns = {name: column[is_latest_copy] for name, column in columns.items()}
+
+        print(f'Migrating legacy kline cache "{key}" with {len(columns["time"])} entries to the columnar format.')
+        self.write_klines_to_cache(key=key, data=columns)
+
+        return True
+
+    def get_klines_from_cache(self, key: str, start_time_ms: int = None) -> dict:
+        '''Fetch memory-mapped kline columns from cache should the key exist, optionally from a start time onwards. Otherwise None.'''
+        if key is None:
+            raise Exception('Valid key is required.')
+
+        file_name: str = self.__get_kline_file_name__(key)
+
+        if not os.path.isfile(file_name) and not self.__migrate_legacy_klines__(key):
+            return None
+
+        capacity, count = self.__read_kline_header__(file_name)
+
+        if count == 0:
+            return self.klines_to_columns([])
+
+        columns: dict = {}
+
+        for i, (name, dtype) in enumerate(KLINE_COLUMNS):
+            offset: int = KLINE_FILE_HEADER_SIZE + i * capacity * KLINE_COLUMN_WIDTH
+            columns[name] = np.memmap(file_name, dtype=dtype, mode='r', offset=offset, shape=(count,))
+
+        if start_time_ms is not None:
+            start_index: int = int(np.searchsorted(columns['time'], int(start_time_ms), side='left'))
+            columns = {name: column[start_index:] for name, column in columns.items()}
+
+        return columns
+
+    def __write_kline_file__(self, file_name: str, columns: dict, capacity: int):
+        '''Atomically write a complete columnar kline file with room for <capacity> klines.'''
+        count: int = len(columns['time'])
+        temporary_file_name: str = f'{file_name}.tmp'
+
+        Path(self.data_dir_path).mkdir(parents=True, exist_ok=True)
+
+        with open(temporary_file_name, 'wb') as f:
+            f.write(struct.pack(KLINE_FILE_HEADER_FORMAT, KLINE_FILE_MAGIC, KLINE_FILE_VERSION, capacity, count))
+
+            for i, (name, dtype) in enumerate(KLINE_COLUMNS):
+                f.seek(KLINE_FILE_HEADER_SIZE + i * capacity * KLINE_COLUMN_WIDTH)
+                f.write(np.ascontiguousarray(columns[name], dtype=dtype).tobytes())
+
+            f.truncate(KLINE_FILE_HEADER_SIZE + len(KLINE_COLUMNS) * capacity * KLINE_COLUMN_WIDTH)
+            f.flush()
+            os.fsync(f.fileno())
+
+        os.replace(temporary_file_name, file_name)
+
+    def write_klines_to_cache(self, key: str, data):
+        '''Atomically replace the kline columns for a given key with either raw Binance klines or a dict of columns.'''
+        if key is None:
+            raise Exception('Valid key is required.')
+
+        if data is None:
+            raise Exception('Valid data is required.')
+
+        columns: dict = self.klines_to_columns(data) if isinstance(data, list) else data
+
+        self.__write_kline_file__(self.__get_kline_file_name__(key), columns, max(KLINE_FILE_MIN_CAPACITY, len(columns['time'])))
+
+    def append_klines_to_cache(self, key: str, data) -> int:
+        '''Append only the klines newer than the last durable kline for a given key, replacing the overlapping boundary kline, and return the last durable kline time.'''
+        if key is None:
+            raise Exception('Valid key is required.')
+
+        if data is None:
+            raise Exception('Valid data is required.')
+
+        columns: dict = self.klines_to_columns(data) if isinstance(data, list) else data
+        file_name: str = self.__get_kline_file_name__(key)
+
+        if not os.path.isfile(file_name) and not self.__migrate_legacy_klines__(key):
+            if len(columns['time']) == 0:
+                return None
+
+            self.write_klines_to_cache(key=key, data=columns)
+
+            return int(columns['time'][-1])
+
+        capacity, count = self.__read_kline_header__(file_name)
+
+        if count == 0:
+            last_durable_time: int = np.iinfo(np.int64).min
+        else:
+            last_durable_time: int = int(np.memmap(file_name, dtype=np.int64, mode='r', offset=KLINE_FILE_HEADER_SIZE + (count - 1) * KLINE_COLUMN_WIDTH, shape=(1,))[0])
+
+        # The boundary kline is usually still open when first cached, so a fresher copy of it replaces the durable one.
+        first_index: int = int(np.searchsorted(columns['time'], last_durable_time, side='left'))
+        columns = {name: column[first_index:] for name, column in columns.items()}
+        replaces_boundary: bool = len(columns['time']) > 0 and int(columns['time'][0]) == last_durable_time
+        write_index: int = count - 1 if replaces_boundary else count
+        new_count: int = write_index + len(columns['time'])
+
+        if new_count <= count and not replaces_boundary:
+            return None if count == 0 else last_durable_time
+
+        if new_count > capacity:
+            existing_columns: dict = self.get_klines_from_cache(key=key)
+            merged_columns: dict = {name: np.concatenate([existing_columns[name][:write_index], columns[name]]) for name in existing_columns.keys()}
+
+            self.__write_kline_file__(file_name, merged_columns, max(KLINE_FILE_MIN_CAPACITY, 2 * new_count))
+
+            return int(merged_columns['time'][-1])
+
+        # Column data is made durable before the header count is advanced, so an interrupted append leaves the
+        # previous klines intact and the next append simply overwrites the uncommitted tail. A torn boundary kline
+        # is refreshed by the next fetch, which always restarts from the last durable kline time.
+        with open(file_name, 'r+b') as f:
+            for i, (name, dtype) in enumerate(KLINE_COLUMNS):
+                f.seek(KLINE_FILE_HEADER_SIZE + (i * capacity + write_index) * KLINE_COLUMN_WIDTH)
+                f.write(np.ascontiguousarray(columns[name], dtype=dtype).tobytes())
+
+            f.flush()
+            os.fsync(f.fileno())
+            f.seek(0)
+            f.write(struct.pack(KLINE_FILE_HEADER_FORMAT, KLINE_FILE_MAGIC, KLINE_FILE_VERSION, capacity, new_count))
+            f.flush()
+            os.fsync(f.fileno())
+
+        return int(columns['time'][-1])
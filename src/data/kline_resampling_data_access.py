@@ -0,0 +1,46 @@
+from .fs_cache_data_access import KLINE_COLUMNS
+from enums.intervals import KLINE_INTERVAL_DURATIONS_IN_MS, KLINE_INTERVAL_ALIGNMENT_OFFSETS_IN_MS
+import numpy as np
+
+
+def get_interval_start(time_ms, period: str):
+    '''Get the open time of the <period> kline that a time, or an array of times, falls into.'''
+    duration_in_ms: int = KLINE_INTERVAL_DURATIONS_IN_MS[period]
+    offset_in_ms: int = KLINE_INTERVAL_ALIGNMENT_OFFSETS_IN_MS.get(period, 0)
+
+    return (time_ms - offset_in_ms) // duration_in_ms * duration_in_ms + offset_in_ms
+
+
+def get_finer_periods(period: str) -> list:
+    '''Get the fixed intervals whose klines line up with the boundaries of a coarser interval, coarsest first, so that it can be resampled from any of them.'''
+    if period not in KLINE_INTERVAL_DURATIONS_IN_MS:
+        return []
+
+    duration_in_ms: int = KLINE_INTERVAL_DURATIONS_IN_MS[period]
+    offset_in_ms: int = KLINE_INTERVAL_ALIGNMENT_OFFSETS_IN_MS.get(period, 0)
+    # Every coarser kline has to start and end on a finer kline boundary.
+    finer_periods: list = [finer_period for finer_period, finer_duration_in_ms in KLINE_INTERVAL_DURATIONS_IN_MS.items()
+                           if finer_duration_in_ms < duration_in_ms and duration_in_ms % finer_duration_in_ms == 0 and (offset_in_ms - KLINE_INTERVAL_ALIGNMENT_OFFSETS_IN_MS.get(finer_period, 0)) % finer_duration_in_ms == 0]
+
+    return sorted(finer_periods, key=lambda finer_period: -KLINE_INTERVAL_DURATIONS_IN_MS[finer_period])
+
+
+def resample_klines(columns: dict, period: str) -> dict:
+    '''Aggregate time ordered kline columns into the klines of a coarser interval, each with the first open, highest high, lowest low, last close and summed volume of the klines it spans.'''
+    times: np.ndarray = np.asarray(columns['time'], dtype=np.int64)
+
+    if len(times) == 0:
+        return {name: np.empty(0, dtype=dtype) for name, dtype in KLINE_COLUMNS}
+
+    interval_starts: np.ndarray = get_interval_start(times, period)
+    first_indices: np.ndarray = np.flatnonzero(np.concatenate(([True], interval_starts[1:] != interval_starts[:-1])))
+    last_indices: np.ndarray = np.append(first_indices[1:], len(times)) - 1
+
+    return {
+        'time': interval_starts[first_indices],
+        'open': np.asarray(columns['open'], dtype=np.float64)[first_indices],
+        'high': np.maximum.reduceat(np.asarray(columns['high'], dtype=np.float64), first_indices),
+        'low': np.minimum.reduceat(np.asarray(columns['low'], dtype=np.float64), first_indices),
+        'close': np.asarray(columns['close'], dtype=np.float64)[last_indices],
+        'volume': np.add.reduceat(np.asarray(columns['volume'], dtype=np.float64), first_indices)
+    }
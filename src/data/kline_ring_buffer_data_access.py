@@ -0,0 +1,117 @@
+from .fs_cache_data_access import KLINE_COLUMNS
+import numpy as np
+import threading
+import time
+
+
+class KlineRingBufferDataAccess():
+    '''Keeps the most recent klines of tracked pair/period combinations in preallocated, fixed-size ring buffers of typed columns, updating the live candle in place.'''
+    def __init__(self):
+        self.__buffers__ = {}
+        self.__lock__ = threading.Lock()
+
+    def track(self, key: str, capacity: int):
+        '''Start buffering a key, holding at most <capacity> of its latest klines. Nothing is buffered until the key is seeded.'''
+        if key is None:
+            raise Exception('Valid key is required.')
+
+        if capacity is None or capacity < 1:
+            raise Exception('Valid capacity is required.')
+
+        with self.__lock__:
+            if key not in self.__buffers__:
+                self.__buffers__[key] = {'capacity': capacity, 'columns': None, 'end': 0, 'count': 0, 'updated_at': None}
+
+    def untrack(self, key: str):
+        '''Stop buffering a key and release its buffer.'''
+        with self.__lock__:
+            self.__buffers__.pop(key, None)
+
+    def is_tracked(self, key: str) -> bool:
+        with self.__lock__:
+            return key in self.__buffers__
+
+    def reset(self, key: str = None):
+        '''Drop the buffered klines of a key, or of all keys, while still tracking them, so that they are seeded afresh.'''
+        with self.__lock__:
+            for buffer_key in list(self.__buffers__.keys()) if key is None else [key]:
+                self.__clear__(self.__buffers__.get(buffer_key))
+
+    def __clear__(self, buffer: dict):
+        if buffer is not None:
+            buffer['columns'], buffer['end'], buffer['count'] = None, 0, 0
+
+    def seed(self, key: str, columns: dict) -> bool:
+        '''Replace the buffered klines of a tracked key with the latest ones of complete, time ordered columns. Returns whether the key is tracked.'''
+        with self.__lock__:
+            buffer: dict = self.__buffers__.get(key)
+
+            if buffer is None:
+                return False
+
+            count: int = min(buffer['capacity'], len(columns['time']))
+            buffer['columns'] = {name: np.empty(buffer['capacity'], dtype=dtype) for name, dtype in KLINE_COLUMNS}
+
+            for name, _ in KLINE_COLUMNS:
+                buffer['columns'][name][:count] = columns[name][len(columns['time']) - count:]
+
+            buffer['end'], buffer['count'], buffer['updated_at'] = count % buffer['capacity'], count, time.monotonic()
+
+            return True
+
+    def upsert(self, key: str, columns: dict, interval_in_ms: int = None) -> bool:
+        '''Apply time ordered kline updates to a seeded key: a kline with the latest buffered open time replaces it, newer ones are appended over the oldest and older ones are ignored. A gap of more than one interval unseeds the key, so that it is seeded afresh. Returns whether the updates were applied.'''
+        with self.__lock__:
+            buffer: dict = self.__buffers__.get(key)
+
+            if buffer is None or buffer['columns'] is None:
+                return False
+
+            capacity: int = buffer['capacity']
+
+            for i in range(len(columns['time'])):
+                open_time: int = int(columns['time'][i])
+                last_index: int = (buffer['end'] - 1) % capacity
+                last_open_time: int = int(buffer['columns']['time'][last_index]) if buffer['count'] > 0 else None
+
+                if last_open_time is not None and open_time < last_open_time:
+                    continue
+
+                if last_open_time is not None and open_time > last_open_time and interval_in_ms is not None and open_time - last_open_time > interval_in_ms:
+                    self.__clear__(buffer)
+
+                    return False
+
+                if last_open_time is None or open_time > last_open_time:
+                    last_index = buffer['end']
+                    buffer['end'] = (buffer['end'] + 1) % capacity
+                    buffer['count'] = min(capacity, buffer['count'] + 1)
+
+                for name, _ in KLINE_COLUMNS:
+                    buffer['columns'][name][last_index] = columns[name][i]
+
+            buffer['updated_at'] = time.monotonic()
+
+            return True
+
+    def get_klines(self, key: str, start_time_ms: int = None, max_age_in_seconds: float = None) -> dict:
+        '''Get a time ordered copy of the buffered kline columns of a seeded key, optionally from a start time onwards, should they have been updated within the max age. Otherwise None.'''
+        with self.__lock__:
+            buffer: dict = self.__buffers__.get(key)
+
+            if buffer is None or buffer['columns'] is None:
+                return None
+
+            if max_age_in_seconds is not None and time.monotonic() - buffer['updated_at'] > max_age_in_seconds:
+                return None
+
+            first_index: int = (buffer['end'] - buffer['count']) % buffer['capacity']
+            # Unwrap the ring into chronological order with a single gather per column.
+            indices: np.ndarray = (first_index + np.arange(buffer['count'])) % buffer['capacity']
+            columns: dict = {name: buffer['columns'][name][indices] for name, _ in KLINE_COLUMNS}
+
+        if start_time_ms is not None:
+            start_index: int = int(np.searchsorted(columns['time'], int(start_time_ms), side='left'))
+            columns = {name: column[start_index:] for name, column in columns.items()}
+
+        return columns
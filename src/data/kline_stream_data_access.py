@@ -0,0 +1,195 @@
+import json
+import logging
+import queue
+import threading
+import time
+
+try:
+    import websocket
+except ImportError:
+    # Streaming from the exchange requires the optional websocket-client package, while the local stand-in feed for tests does not.
+    websocket = None
+
+# Published after the exchange connection was re-established, as kline updates may have been missed in between.
+KLINE_STREAM_RECONNECTED_EVENT = {'e': 'reconnected'}
+
+
+def get_stream_name(pair: str, period: str) -> str:
+    '''Get the Binance kline stream name of a pair/period combination.'''
+    return f'{pair.lower()}@kline_{period}'
+
+
+def get_kline_event(pair: str, period: str, kline: list, is_closed: bool) -> dict:
+    '''Wrap a raw Binance kline in a kline stream event, as the exchange publishes them.'''
+    return {
+        'e': 'kline',
+        'E': int(time.time() * 1000),
+        's': pair,
+        'k': {'t': kline[0], 'T': kline[6], 's': pair, 'i': period, 'o': kline[1], 'h': kline[2], 'l': kline[3], 'c': kline[4], 'v': kline[5],
+              'n': kline[8], 'x': is_closed, 'q': kline[7], 'V': kline[9], 'Q': kline[10], 'B': '0'}
+    }
+
+
+def get_kline_from_event(event: dict) -> tuple:
+    '''Get the (pair, period, raw Binance kline, is closed) tuple of a kline stream event.'''
+    k: dict = event['k']
+
+    return k['s'], k['i'], [k['t'], k['o'], k['h'], k['l'], k['c'], k['v'], k['T'], k['q'], k['n'], k['V'], k['Q'], k['B']], k['x']
+
+
+class KlineStreamDataAccess():
+    '''The subscriptions and event queue shared by kline stream feeds.'''
+    def __init__(self):
+        self.__subscriptions__ = set()
+        self.__events__ = queue.Queue()
+        self.__lock__ = threading.Lock()
+
+    def get_subscriptions(self) -> list:
+        '''Get all subscribed (pair, period) combinations.'''
+        with self.__lock__:
+            return sorted(self.__subscriptions__)
+
+    def subscribe(self, pair: str, period: str):
+        '''Start receiving kline updates of a pair/period combination.'''
+        with self.__lock__:
+            if (pair, period) in self.__subscriptions__:
+                return
+
+            self.__subscriptions__.add((pair, period))
+
+        self.__on_subscriptions_changed__('SUBSCRIBE', [get_stream_name(pair, period)])
+
+    def unsubscribe(self, pair: str, period: str):
+        '''Stop receiving kline updates of a pair/period combination.'''
+        with self.__lock__:
+            if (pair, period) not in self.__subscriptions__:
+                return
+
+            self.__subscriptions__.remove((pair, period))
+
+        self.__on_subscriptions_changed__('UNSUBSCRIBE', [get_stream_name(pair, period)])
+
+    def publish_event(self, event: dict):
+        '''Queue a stream event for consumers.'''
+        self.__events__.put(event)
+
+    def get_events(self, timeout_in_seconds: float = 1) -> list:
+        '''Wait up to a timeout for stream events and get all that are queued.'''
+        events: list = []
+
+        try:
+            events.append(self.__events__.get(timeout=timeout_in_seconds))
+
+            while True:
+                events.append(self.__events__.get_nowait())
+        except queue.Empty:
+            return events
+
+    def close(self):
+        '''Release the feed.'''
+        pass
+
+    def __on_subscriptions_changed__(self, method: str, stream_names: list):
+        pass
+
+
+class LocalKlineStreamDataAccess(KlineStreamDataAccess):
+    '''An in-process stand-in for the Binance kline stream for tests, delivering the klines published to it.'''
+    def publish(self, pair: str, period: str, kline: list, is_closed: bool = False):
+        '''Publish an update of a raw Binance kline.'''
+        self.publish_event(get_kline_event(pair, period, kline, is_closed))
+
+
+class BinanceKlineStreamDataAccess(KlineStreamDataAccess):
+    '''A client for the Binance combined kline websocket stream that reconnects with exponential backoff and resubscribes all subscriptions on every connection.'''
+    def __init__(self, stream_url: str, reconnect_delay_in_seconds: float = 1, max_reconnect_delay_in_seconds: float = 60, receive_timeout_in_seconds: float = 5):
+        if websocket is None:
+            raise Exception('The websocket-client package is required to stream from Binance.')
+
+        if stream_url is None:
+            raise Exception('Valid stream_url is required.')
+
+        super().__init__()
+        self.stream_url = stream_url
+        self.reconnect_delay_in_seconds = reconnect_delay_in_seconds
+        self.max_reconnect_delay_in_seconds = max_reconnect_delay_in_seconds
+        self.receive_timeout_in_seconds = receive_timeout_in_seconds
+        self.__connection__ = None
+        self.__request_id__ = 0
+        self.__thread__ = None
+        self.__stop_event__ = threading.Event()
+
+    def close(self):
+        '''Stop the receiving thread and close the connection.'''
+        self.__stop_event__.set()
+
+        with self.__lock__:
+            connection = self.__connection__
+
+        if connection is not None:
+            connection.close()
+
+    def __on_subscriptions_changed__(self, method: str, stream_names: list):
+        with self.__lock__:
+            connection = self.__connection__
+
+            if self.__thread__ is None or not self.__thread__.is_alive():
+                self.__stop_event__.clear()
+                self.__thread__ = threading.Thread(target=self.__run__, name='binance-kline-stream', daemon=True)
+                self.__thread__.start()
+
+        # Without a connection, the subscriptions are sent once connected.
+        if connection is not None:
+            self.__send__(connection, method, stream_names)
+
+    def __send__(self, connection, method: str, stream_names: list):
+        with self.__lock__:
+            self.__request_id__ += 1
+            request_id: int = self.__request_id__
+
+        connection.send(json.dumps({'method': method, 'params': stream_names, 'id': request_id}))
+
+    def __run__(self):
+        '''Receive stream events until closed, reconnecting whenever the connection drops.'''
+        delay_in_seconds: float = self.reconnect_delay_in_seconds
+        has_connected: bool = False
+
+        while not self.__stop_event__.is_set():
+            connection = None
+
+            try:
+                connection = websocket.create_connection(f'{self.stream_url}/stream', timeout=self.receive_timeout_in_seconds)
+                stream_names: list = [get_stream_name(pair, period) for pair, period in self.get_subscriptions()]
+
+                with self.__lock__:
+                    self.__connection__ = connection
+
+                if len(stream_names) > 0:
+                    self.__send__(connection, 'SUBSCRIBE', stream_names)
+
+                if has_connected:
+                    self.publish_event(KLINE_STREAM_RECONNECTED_EVENT)
+
+                has_connected, delay_in_seconds = True, self.reconnect_delay_in_seconds
+
+                while not self.__stop_event__.is_set():
+                    try:
+                        message: dict = json.loads(connection.recv())
+                    except websocket.WebSocketTimeoutException:
+                        continue
+
+                    # Subscription acknowledgements carry no data.
+                    if 'data' in message:
+                        self.publish_event(message['data'])
+            except Exception:
+                if not self.__stop_event__.is_set():
+                    logging.exception('The Binance kline stream disconnected.')
+            finally:
+                with self.__lock__:
+                    self.__connection__ = None
+
+                if connection is not None:
+                    connection.close()
+
+            self.__stop_event__.wait(delay_in_seconds)
+            delay_in_seconds = min(self.max_reconnect_delay_in_seconds, delay_in_seconds * 2)
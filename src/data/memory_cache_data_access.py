@@ -1,26 +1,89 @@
-from expiringdict import ExpiringDict
+from collections import OrderedDict
 import logging
+import sys
+import threading
+import time
 
 
 class MemoryCacheDataAccess():
-    def __init__(self, cache_max_age_in_seconds: int = 10, max_allowed_items=2147483647):
-        '''Initialize the cache store with a max time in seconds each entry is allowed to live for as well as a max item count before killing off older entries, defaulted to INT.MAX_VALUE.'''
-        self.__cache__ = ExpiringDict(max_len=max_allowed_items,
-                                      max_age_seconds=cache_max_age_in_seconds)
+    '''A thread-safe, least recently used in-memory cache whose entries expire after a max age and are evicted once an approximate byte budget is exceeded.'''
+    def __init__(self, cache_max_age_in_seconds: int = 10, max_allowed_items=2147483647, max_allowed_bytes: int = 2147483647):
+        '''Initialize the cache store with a max time in seconds each entry is allowed to live for, a max item count and a max approximate total size in bytes before evicting the least recently used entries, defaulted to INT.MAX_VALUE.'''
+        self.cache_max_age_in_seconds = cache_max_age_in_seconds
+        self.max_allowed_items = max_allowed_items
+        self.max_allowed_bytes = max_allowed_bytes
+        self.size_in_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.__cache__ = OrderedDict()
+        self.__lock__ = threading.Lock()
+
+    def __get_approximate_size__(self, value, depth: int = 0) -> int:
+        '''Estimate the memory held by a value, including arrays, data frames and the measured boosters of models it references a few levels deep.'''
+        if hasattr(value, 'memory_usage') and callable(value.memory_usage):
+            memory_usage = value.memory_usage(deep=False)
+
+            return int(memory_usage.sum()) if hasattr(memory_usage, 'sum') else int(memory_usage)
+
+        if hasattr(value, 'nbytes'):
+            return int(value.nbytes)
+
+        size: int = sys.getsizeof(value)
+
+        if depth >= 4 or isinstance(value, (str, bytes, int, float, bool)):
+            return size
+
+        if isinstance(value, dict):
+            return size + sum(self.__get_approximate_size__(v, depth + 1) for v in value.values())
+
+        if isinstance(value, (list, tuple, set)):
+            return size + sum(self.__get_approximate_size__(v, depth + 1) for v in value)
+
+        if hasattr(value, 'model_size_in_bytes'):
+            # Boosters are only measured once when trained or loaded, as serializing them on every cache write is expensive.
+            attributes: dict = {key: attribute for key, attribute in vars(value).items() if key != 'model'}
+
+            return size + int(value.model_size_in_bytes) + self.__get_approximate_size__(attributes, depth + 1)
+
+        if hasattr(value, '__dict__'):
+            return size + self.__get_approximate_size__(vars(value), depth + 1)
+
+        return size
+
+    def __remove__(self, key: str):
+        '''Remove an entry and release its size from the budget. Must be called while holding the lock.'''
+        value, expires_at, size = self.__cache__.pop(key)
+        self.size_in_bytes -= size
 
     def get_from_cache(self, key: str):
         '''Fetch data from cache should the key exist. Otherwise None.'''
         if key is None:
             raise Exception('Valid key is required.')
 
-        value = self.__cache__.get(key)
+        with self.__lock__:
+            entry: tuple = self.__cache__.get(key)
 
-        if value is None:
-            logging.warning(f'No item with the key "{key}" existed in the cache.')
-        else:
-            logging.info(f'Item for key "{key}" retrieved from cache with value: {value}')
+            if entry is not None and entry[1] <= time.monotonic():
+                self.__remove__(key)
+                self.expirations += 1
+                entry = None
 
-        return value
+            if entry is None:
+                self.misses += 1
+            else:
+                self.__cache__.move_to_end(key)
+                self.hits += 1
+
+        if entry is None:
+            logging.warning('No item with the key "%s" existed in the cache.', key)
+
+            return None
+
+        logging.debug('Item for key "%s" retrieved from cache.', key)
+
+        return entry[0]
 
     def write_to_cache(self, key: str, data):
         '''Write data to the cache for a given key.'''
@@ -30,6 +93,39 @@ class MemoryCacheDataAccess():
         if data is None:
             raise Exception('Valid data is required.')
 
-        logging.info(f'Setting cache key "{key}" with value: {data}')
+        size: int = self.__get_approximate_size__(data)
+
+        with self.__lock__:
+            if key in self.__cache__:
+                self.__remove__(key)
+
+            self.__cache__[key] = (data, time.monotonic() + self.cache_max_age_in_seconds, size)
+            self.size_in_bytes += size
+
+            # The newest entry is always kept, even when it alone exceeds the budget.
+            while len(self.__cache__) > 1 and (len(self.__cache__) > self.max_allowed_items or self.size_in_bytes > self.max_allowed_bytes):
+                self.__remove__(next(iter(self.__cache__)))
+                self.evictions += 1
+
+        logging.debug('Set cache key "%s" with an approximate size of %d bytes.', key, size)
+
+    def remove_from_cache(self, key: str):
+        '''Remove the entry for a given key, should it exist.'''
+        if key is None:
+            raise Exception('Valid key is required.')
+
+        with self.__lock__:
+            if key in self.__cache__:
+                self.__remove__(key)
 
-        self.__cache__[key] = data
+    def get_statistics(self) -> dict:
+        '''Get the entry count, approximate size and hit, miss, eviction and expiration counts of the cache.'''
+        with self.__lock__:
+            return {
+                'items': len(self.__cache__),
+                'size_in_bytes': self.size_in_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations
+            }
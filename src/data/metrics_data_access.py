@@ -0,0 +1,114 @@
+from bisect import bisect_left
+from contextlib import contextmanager
+import threading
+import time
+
+DEFAULT_HISTOGRAM_BUCKETS_IN_SECONDS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 300)
+
+
+class MetricsDataAccess():
+    '''An in-process store of counters, gauges and latency histograms that renders in the Prometheus text exposition format.'''
+    def __init__(self, histogram_buckets_in_seconds: tuple = DEFAULT_HISTOGRAM_BUCKETS_IN_SECONDS):
+        self.histogram_buckets_in_seconds = histogram_buckets_in_seconds
+        self.__counters__ = {}
+        self.__gauges__ = {}
+        self.__histograms__ = {}
+        self.__collectors__ = []
+        self.__lock__ = threading.Lock()
+
+    def __get_label_key__(self, labels: dict) -> tuple:
+        '''Get a hashable, order independent key for a label set.'''
+        return tuple(sorted(labels.items())) if labels else ()
+
+    def increment(self, name: str, labels: dict = None, value: float = 1):
+        '''Increase a counter.'''
+        key: tuple = (name, self.__get_label_key__(labels))
+
+        with self.__lock__:
+            self.__counters__[key] = self.__counters__.get(key, 0) + value
+
+    def set_gauge(self, name: str, value: float, labels: dict = None):
+        '''Set a gauge to a value.'''
+        key: tuple = (name, self.__get_label_key__(labels))
+
+        with self.__lock__:
+            self.__gauges__[key] = value
+
+    def observe(self, name: str, value: float, labels: dict = None):
+        '''Record a value in a histogram.'''
+        key: tuple = (name, self.__get_label_key__(labels))
+        bucket_index: int = bisect_left(self.histogram_buckets_in_seconds, value)
+
+        with self.__lock__:
+            histogram: dict = self.__histograms__.get(key)
+
+            if histogram is None:
+                histogram = {'buckets': [0] * (len(self.histogram_buckets_in_seconds) + 1), 'sum': 0.0, 'count': 0}
+                self.__histograms__[key] = histogram
+
+            histogram['buckets'][bucket_index] += 1
+            histogram['sum'] += value
+            histogram['count'] += 1
+
+    @contextmanager
+    def time_stage(self, stage: str):
+        '''Record the duration of a processing stage in the stage latency histogram.'''
+        start: float = time.perf_counter()
+
+        try:
+            yield
+        finally:
+            self.observe('bifrost_stage_duration_seconds', time.perf_counter() - start, {'stage': stage})
+
+    def register_collector(self, collect):
+        '''Register a callable that refreshes gauges from other components, only invoked when the metrics are rendered.'''
+        with self.__lock__:
+            self.__collectors__.append(collect)
+
+    def __format_labels__(self, label_key: tuple, extra_labels: tuple = ()) -> str:
+        '''Format a label set for the exposition format.'''
+        labels: tuple = label_key + extra_labels
+
+        if len(labels) == 0:
+            return ''
+
+        return '{' + ','.join(f'{name}="{value}"' for name, value in labels) + '}'
+
+    def render(self) -> str:
+        '''Render all metrics in the Prometheus text exposition format.'''
+        for collect in list(self.__collectors__):
+            collect(self)
+
+        with self.__lock__:
+            counters: dict = dict(self.__counters__)
+            gauges: dict = dict(self.__gauges__)
+            histograms: dict = {key: {'buckets': list(h['buckets']), 'sum': h['sum'], 'count': h['count']} for key, h in self.__histograms__.items()}
+
+        lines: list = []
+
+        for metric_type, samples in (('counter', counters), ('gauge', gauges)):
+            for name in sorted({name for name, _ in samples.keys()}):
+                lines.append(f'# TYPE {name} {metric_type}')
+                lines += [f'{name}{self.__format_labels__(label_key)} {value}' for (sample_name, label_key), value in sorted(samples.items()) if sample_name == name]
+
+        for name in sorted({name for name, _ in histograms.keys()}):
+            lines.append(f'# TYPE {name} histogram')
+
+            for (sample_name, label_key), histogram in sorted(histograms.items()):
+                if sample_name != name:
+                    continue
+
+                cumulative_count: int = 0
+
+                for upper_bound, bucket_count in zip(list(self.histogram_buckets_in_seconds) + ['+Inf'], histogram['buckets']):
+                    cumulative_count += bucket_count
+                    lines.append(f'{name}_bucket{self.__format_labels__(label_key, (("le", upper_bound),))} {cumulative_count}')
+
+                lines.append(f'{name}_sum{self.__format_labels__(label_key)} {histogram["sum"]}')
+                lines.append(f'{name}_count{self.__format_labels__(label_key)} {histogram["count"]}')
+
+        return '\n'.join(lines) + '\n'
+
+
+# The process-wide metrics store shared by all instrumented components.
+metrics_data_access = MetricsDataAccess()
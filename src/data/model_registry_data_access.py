@@ -0,0 +1,204 @@
+from .config_data_access import ConfigDataAccess
+import os
+import os.path
+import json
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import xgboost as xgb
+
+try:
+    import fcntl
+except ImportError:
+    # File locks are only needed for multi-process serving, which is supported on POSIX hosts only.
+    fcntl = None
+
+
+class ModelRegistryDataAccess():
+    '''A versioned store of trained boosters and the metadata required to predict with them, persisted on the file system.'''
+    def __init__(self, config_data_access: ConfigDataAccess):
+        if config_data_access is None:
+            raise Exception('Valid config_data_access is required.')
+
+        self.model_dir_path = f'{os.getcwd()}/{config_data_access.model_dir_relative_path}'
+        self.versions_to_keep = config_data_access.model_versions_to_keep
+
+    def __get_key_dir_path__(self, key: str) -> str:
+        '''Get the directory holding all versions of a given key.'''
+        return f'{self.model_dir_path}/{key}'
+
+    @contextmanager
+    def lock(self, key: str):
+        '''Hold an exclusive lock for a given key that is shared by all processes using the same registry directory.'''
+        if key is None:
+            raise Exception('Valid key is required.')
+
+        Path(self.model_dir_path).mkdir(parents=True, exist_ok=True)
+
+        with open(f'{self.model_dir_path}/{key}.lock', 'a') as f:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+    def get_versions(self, key: str) -> list:
+        '''Get all committed versions for a given key, oldest first.'''
+        if key is None:
+            raise Exception('Valid key is required.')
+
+        key_dir_path: str = self.__get_key_dir_path__(key)
+
+        if not os.path.isdir(key_dir_path):
+            return []
+
+        # The metadata file is written last, so only versions that have one are complete.
+        return sorted(int(file_name.split('.')[0]) for file_name in os.listdir(key_dir_path) if file_name.endswith('.meta.json'))
+
+    def save_model(self, key: str, model: 'xgb.Booster', metadata: dict) -> int:
+        '''Persist a booster and its metadata as a new version for a given key and return the version.'''
+        if key is None:
+            raise Exception('Valid key is required.')
+
+        if model is None:
+            raise Exception('Valid model is required.')
+
+        if metadata is None:
+            raise Exception('Valid metadata is required.')
+
+        key_dir_path: str = self.__get_key_dir_path__(key)
+        existing_versions: list = self.get_versions(key)
+        version: int = max([int(time.time() * 1000)] + [v + 1 for v in existing_versions])
+        model_file_name: str = f'{key_dir_path}/{version}.model.json'
+        metadata_file_name: str = f'{key_dir_path}/{version}.meta.json'
+
+        Path(key_dir_path).mkdir(parents=True, exist_ok=True)
+        model.save_model(f'{model_file_name}.tmp.json')
+        os.replace(f'{model_file_name}.tmp.json', model_file_name)
+
+        with open(f'{metadata_file_name}.tmp', 'w') as f:
+            f.write(json.dumps({**metadata, 'version': version, 'saved_at': version / 1000}))
+
+        os.replace(f'{metadata_file_name}.tmp', metadata_file_name)
+
+        return version
+
+    def get_model(self, key: str, version: int = None, max_age_in_seconds: float = None) -> tuple:
+        '''Load the (booster, metadata) pair of a specific or the latest version for a given key, should one exist that is not older than the max age. Otherwise None.'''
+        versions: list = self.get_versions(key)
+
+        if version is None and len(versions) > 0:
+            version = versions[-1]
+
+        if version not in versions:
+            return None
+
+        key_dir_path: str = self.__get_key_dir_path__(key)
+
+        with open(f'{key_dir_path}/{version}.meta.json', 'r') as f:
+            metadata: dict = json.loads(f.read())
+
+        if max_age_in_seconds is not None and time.time() - metadata['saved_at'] > max_age_in_seconds:
+            return None
+
+        import xgboost as xgb
+
+        model: xgb.Booster = xgb.Booster()
+        model.load_model(f'{key_dir_path}/{version}.model.json')
+
+        return model, metadata
+
+    def save_parameters(self, key: str, parameters: dict):
+        '''Persist the tuned training parameters for a given key, replacing any previous ones, so that later trainings can skip the search.'''
+        if key is None:
+            raise Exception('Valid key is required.')
+
+        if parameters is None:
+            raise Exception('Valid parameters is required.')
+
+        key_dir_path: str = self.__get_key_dir_path__(key)
+        parameters_file_name: str = f'{key_dir_path}/parameters.json'
+
+        Path(key_dir_path).mkdir(parents=True, exist_ok=True)
+
+        with open(f'{parameters_file_name}.tmp', 'w') as f:
+            f.write(json.dumps({'parameters': parameters, 'saved_at': time.time()}))
+
+        os.replace(f'{parameters_file_name}.tmp', parameters_file_name)
+
+    def get_parameters(self, key: str, max_age_in_seconds: float = None) -> dict:
+        '''Load the tuned training parameters for a given key, should they exist and not be older than the max age. Otherwise None.'''
+        if key is None:
+            raise Exception('Valid key is required.')
+
+        parameters_file_name: str = f'{self.__get_key_dir_path__(key)}/parameters.json'
+
+        if not os.path.isfile(parameters_file_name):
+            return None
+
+        with open(parameters_file_name, 'r') as f:
+            persisted_parameters: dict = json.loads(f.read())
+
+        if max_age_in_seconds is not None and time.time() - persisted_parameters['saved_at'] > max_age_in_seconds:
+            return None
+
+        return persisted_parameters['parameters']
+
+    def save_training_profile(self, key: str, training_profile: str):
+        '''Persist the training profile selected for a given key, replacing any previous one, so that all processes sharing the registry train it alike.'''
+        if key is None:
+            raise Exception('Valid key is required.')
+
+        if training_profile is None:
+            raise Exception('Valid training_profile is required.')
+
+        key_dir_path: str = self.__get_key_dir_path__(key)
+        training_profile_file_name: str = f'{key_dir_path}/training_profile.json'
+
+        Path(key_dir_path).mkdir(parents=True, exist_ok=True)
+
+        with open(f'{training_profile_file_name}.tmp', 'w') as f:
+            f.write(json.dumps({'training_profile': training_profile, 'saved_at': time.time()}))
+
+        os.replace(f'{training_profile_file_name}.tmp', training_profile_file_name)
+
+    def get_training_profile(self, key: str) -> str:
+        '''Load the training profile selected for a given key, should one have been. Otherwise None.'''
+        if key is None:
+            raise Exception('Valid key is required.')
+
+        training_profile_file_name: str = f'{self.__get_key_dir_path__(key)}/training_profile.json'
+
+        if not os.path.isfile(training_profile_file_name):
+            return None
+
+        with open(training_profile_file_name, 'r') as f:
+            return json.loads(f.read())['training_profile']
+
+    def prune(self, key: str, versions_to_keep: int = None, max_age_in_seconds: float = None) -> list:
+        '''Remove all but the newest versions for a given key as well as any older than the max age. Returns the removed versions.'''
+        versions: list = self.get_versions(key)
+        versions_to_keep = self.versions_to_keep if versions_to_keep is None else versions_to_keep
+        stale_versions: list = versions[:max(0, len(versions) - versions_to_keep)]
+
+        if max_age_in_seconds is not None:
+            oldest_allowed_version: float = (time.time() - max_age_in_seconds) * 1000
+            stale_versions = sorted(set(stale_versions + [v for v in versions if v < oldest_allowed_version]))
+
+        key_dir_path: str = self.__get_key_dir_path__(key)
+
+        for version in stale_versions:
+            # Remove the metadata first so a partially pruned version is never considered committed.
+            for suffix in ('meta.json', 'model.json'):
+                file_name: str = f'{key_dir_path}/{version}.{suffix}'
+
+                if os.path.isfile(file_name):
+                    os.remove(file_name)
+
+        return stale_versions
@@ -0,0 +1,151 @@
+from .metrics_data_access import metrics_data_access
+import random
+import threading
+import time
+import requests
+
+# The header in which Binance reports the request weight used by the caller's IP in the current minute.
+USED_WEIGHT_HEADER = 'X-MBX-USED-WEIGHT-1M'
+# Statuses that throttle every call of the client rather than just the failed one, as the exchange bans IPs that keep calling.
+THROTTLING_STATUS_CODES = (418, 429)
+
+
+class RateLimitedClientDataAccess():
+    '''An HTTP client shared by all exchange calls that keeps the request weight used per minute, as reported by the exchange, within a budget. Calls are delayed once the budget is used up, and throttled or failed calls are retried with jittered exponential backoff, honouring Retry-After.'''
+    def __init__(self,
+                 session: requests.Session,
+                 weight_budget_per_minute: int,
+                 max_retries: int = 4,
+                 max_wait_in_seconds: float = 60,
+                 backoff_in_seconds: float = 0.5,
+                 max_backoff_in_seconds: float = 30,
+                 window_length_in_seconds: float = 60,
+                 random_state: int = None):
+        if session is None:
+            raise Exception('Valid session is required.')
+
+        if weight_budget_per_minute is None or weight_budget_per_minute < 1:
+            raise Exception('Valid weight_budget_per_minute is required.')
+
+        self.session = session
+        self.weight_budget_per_minute = weight_budget_per_minute
+        self.max_retries = max_retries
+        self.max_wait_in_seconds = max_wait_in_seconds
+        self.backoff_in_seconds = backoff_in_seconds
+        self.max_backoff_in_seconds = max_backoff_in_seconds
+        self.window_length_in_seconds = window_length_in_seconds
+        self.__random__ = random.Random(random_state)
+        self.__condition__ = threading.Condition()
+        self.__window_start__ = 0
+        self.__used_weight__ = 0
+        self.__blocked_until__ = 0
+        metrics_data_access.set_gauge('bifrost_exchange_weight_budget', weight_budget_per_minute)
+
+    def get_used_weight(self) -> int:
+        '''Get the request weight used in the current minute, as far as known.'''
+        with self.__condition__:
+            self.__roll_window__(time.time())
+
+            return self.__used_weight__
+
+    def get(self, url: str, params: dict = None, weight: int = 1) -> requests.Response:
+        '''Send a GET request of a given weight once the budget allows, retrying throttled and failed attempts. Returns the response of the last attempt.'''
+        for attempt in range(self.max_retries + 1):
+            self.__acquire__(weight)
+
+            try:
+                response: requests.Response = self.session.get(url, params=params)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt == self.max_retries:
+                    raise
+
+                metrics_data_access.increment('bifrost_exchange_retries_total', {'reason': 'connection'})
+                time.sleep(self.__get_backoff__(attempt))
+                continue
+
+            metrics_data_access.increment('bifrost_exchange_requests_total', {'status': response.status_code})
+            self.__record_used_weight__(response)
+
+            if not self.__is_retryable__(response.status_code) or attempt == self.max_retries:
+                return response
+
+            delay_in_seconds: float = max(self.__get_retry_after__(response), self.__get_backoff__(attempt))
+            metrics_data_access.increment('bifrost_exchange_retries_total', {'reason': response.status_code})
+
+            if response.status_code in THROTTLING_STATUS_CODES:
+                # Every call waits out the ban, not just this one.
+                self.__block__(delay_in_seconds)
+            else:
+                time.sleep(delay_in_seconds)
+
+        return response
+
+    def __is_retryable__(self, status_code: int) -> bool:
+        return status_code in THROTTLING_STATUS_CODES or status_code >= 500
+
+    def __get_backoff__(self, attempt: int) -> float:
+        '''Get a random delay of up to an exponentially growing cap, so that concurrent retries spread out.'''
+        return self.__random__.uniform(0, min(self.max_backoff_in_seconds, self.backoff_in_seconds * 2 ** attempt))
+
+    def __get_retry_after__(self, response: requests.Response) -> float:
+        '''Get the delay in seconds asked for by the Retry-After header, should there be one.'''
+        try:
+            return max(0.0, float(response.headers.get('Retry-After', 0)))
+        except ValueError:
+            return 0.0
+
+    def __roll_window__(self, now: float):
+        '''Start counting afresh once a new minute began, as the exchange does.'''
+        window_start: float = now // self.window_length_in_seconds * self.window_length_in_seconds
+
+        if window_start > self.__window_start__:
+            self.__window_start__, self.__used_weight__ = window_start, 0
+            metrics_data_access.set_gauge('bifrost_exchange_weight_used', 0)
+
+    def __acquire__(self, weight: int):
+        '''Wait until the call is neither banned nor over budget and reserve its weight. A call heavier than the whole budget is sent alone at the start of a minute.'''
+        waited_in_seconds: float = 0
+
+        with self.__condition__:
+            while True:
+                now: float = time.time()
+                self.__roll_window__(now)
+
+                if now >= self.__blocked_until__ and (self.__used_weight__ + weight <= self.weight_budget_per_minute or self.__used_weight__ == 0):
+                    break
+
+                wait_in_seconds: float = self.__blocked_until__ - now if now < self.__blocked_until__ else self.__window_start__ + self.window_length_in_seconds - now
+
+                if waited_in_seconds + wait_in_seconds > self.max_wait_in_seconds:
+                    raise Exception(f'The exchange request weight budget is exhausted for another {wait_in_seconds:.0f} seconds.')
+
+                self.__condition__.wait(wait_in_seconds)
+                waited_in_seconds += time.time() - now
+
+            self.__used_weight__ += weight
+            used_weight: int = self.__used_weight__
+
+        metrics_data_access.set_gauge('bifrost_exchange_weight_used', used_weight)
+
+        if waited_in_seconds > 0:
+            metrics_data_access.increment('bifrost_exchange_throttled_requests_total')
+            metrics_data_access.increment('bifrost_exchange_throttled_seconds_total', value=waited_in_seconds)
+
+    def __record_used_weight__(self, response: requests.Response):
+        '''Adopt the used weight reported by the exchange, which also counts calls of other clients sharing the IP.'''
+        try:
+            reported_weight: int = int(response.headers[USED_WEIGHT_HEADER])
+        except (KeyError, ValueError):
+            return
+
+        with self.__condition__:
+            self.__roll_window__(time.time())
+            self.__used_weight__ = max(self.__used_weight__, reported_weight)
+            used_weight: int = self.__used_weight__
+
+        metrics_data_access.set_gauge('bifrost_exchange_weight_used', used_weight)
+
+    def __block__(self, delay_in_seconds: float):
+        '''Hold back every call for a delay.'''
+        with self.__condition__:
+            self.__blocked_until__ = max(self.__blocked_until__, time.time() + delay_in_seconds)
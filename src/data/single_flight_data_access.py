@@ -0,0 +1,48 @@
+import threading
+
+
+class SingleFlightDataAccess():
+    '''Deduplicates concurrent loads of the same key so that only one caller does the work while the others wait for and share its result.'''
+    def __init__(self, timeout_in_seconds: float = None):
+        '''Initialize the store with the max time in seconds a waiting caller blocks for before giving up, defaulted to no limit.'''
+        self.timeout_in_seconds = timeout_in_seconds
+        self.__flights__ = {}
+        self.__lock__ = threading.Lock()
+
+    def execute(self, key: str, load):
+        '''Run load() for the key, or wait on the result of an identical call already in flight. Errors from the load are raised to every caller.'''
+        if key is None:
+            raise Exception('Valid key is required.')
+
+        if load is None:
+            raise Exception('Valid load is required.')
+
+        with self.__lock__:
+            flight: dict = self.__flights__.get(key)
+            is_leader: bool = flight is None
+
+            if is_leader:
+                flight = {'done': threading.Event(), 'result': None, 'error': None}
+                self.__flights__[key] = flight
+
+        if is_leader:
+            try:
+                flight['result'] = load()
+            except BaseException as e:
+                flight['error'] = e
+                raise
+            finally:
+                with self.__lock__:
+                    del self.__flights__[key]
+
+                flight['done'].set()
+
+            return flight['result']
+
+        if not flight['done'].wait(timeout=self.timeout_in_seconds):
+            raise Exception(f'Timed out after {self.timeout_in_seconds} seconds waiting for "{key}".')
+
+        if flight['error'] is not None:
+            raise flight['error']
+
+        return flight['result']
@@ -1,16 +1,24 @@
+import copy
+import os
 import pandas as pd
 import numpy as np
-import xgboost as xgb
-from sklearn.metrics import mean_squared_error, mean_absolute_error, ConfusionMatrixDisplay, accuracy_score
-from sklearn.model_selection import GridSearchCV
-from sklearn.multioutput import MultiOutputRegressor
-from sklearn.utils import shuffle
+from data.metrics_data_access import metrics_data_access
+from engines.feature_pipeline_engine import FeaturePipelineEngine
+from engines.hyperparameter_search_engine import HyperparameterSearchEngine
+from enums.training_profiles import TRAINING_PROFILES
+from typing import TYPE_CHECKING
+
+# XGBoost and scikit-learn take seconds to import, so they are only imported once a model is trained or restored.
+if TYPE_CHECKING:
+    import xgboost as xgb
 
 
 class BifrostGradientBoosterEngine():
     '''A class that abstracts the complexities of building classification, regression and timeseries forecasting models using XGBoost.'''
     is_timeseries_problem: bool = False
     global_scaling_factor: int = 1
+    incremental_update_count: int = 0
+    training_profile: str = None
     default_parameters = {
         'learning_rate': 0.1,
         'max_depth': 3,
@@ -48,10 +56,19 @@ class BifrostGradientBoosterEngine():
         self.column_name_to_predict = column_name_to_predict
         self.use_binary_classifier = use_binary_classifier
         self.model = None
+        self.model_size_in_bytes = 0
         self.data_time_column_name = data_time_column_name
+        self.parameters = None
+        self.tuned_num_boost_round = None
+        self.feature_names = None
+        self.training_data_range = None
+        self.feature_pipeline = FeaturePipelineEngine(column_name_to_predict=column_name_to_predict, data_time_column_name=data_time_column_name)
+
+        if self.data_time_column_name is not None:
+            self.training_data_range = [str(self.data[self.data_time_column_name].min()), str(self.data[self.data_time_column_name].max())]
 
         if enable_global_scaling:
-            self.global_scaling_factor = self.__determine_common_scale__(self.data)
+            self.global_scaling_factor = self.feature_pipeline.determine_common_scale(self.data)
             self.__apply_common_scale__(data=self.data, scale=self.global_scaling_factor)
 
             print(f'Global scaling has been set to {self.global_scaling_factor}.')
@@ -70,36 +87,12 @@ class BifrostGradientBoosterEngine():
         if replace_whitespace:
             self.replace_whitespace()
 
-    def __determine_common_scale__(self, data: pd.DataFrame) -> float:
-        '''Determine a common denominator that can be used to scale values up in order to never break XGBoost with too small values.'''
-        maximum_common_scale: int = 1
-
-        for column in data.columns:
-            column_is_long_float_type = data[column].dtype == np.float64
-
-            if column_is_long_float_type:
-                first_column_value_str = str(data[column].values[0])
-                should_scale = len(first_column_value_str.split('.')[1]) > 1
-                maximum_local_scale = 1
-
-                while should_scale:
-                    maximum_local_scale *= 10
-                    should_scale = len(str(data[column].values[0] * maximum_local_scale).split('.')[1]) > 1
-
-                maximum_common_scale = max(maximum_common_scale, maximum_local_scale)
-
-        return maximum_common_scale
-
     def __apply_common_scale__(self, data: pd.DataFrame, scale: int, reverse: bool = False):
         '''Apply a common multiplier to all numerical values.'''
-        for column in data.columns:
-            column_is_long_float_type = data[column].dtype == np.float64
+        float_column_names: list = [c for c in data.columns if data[c].dtype == np.float64]
 
-            if column_is_long_float_type:
-                if reverse:
-                    data[column] = data[column] / scale
-                else:
-                    data[column] = data[column] * scale
+        if len(float_column_names) > 0:
+            data[float_column_names] = data[float_column_names] / scale if reverse else data[float_column_names] * scale
 
     def __get_training_test_dfs__(self, training_split: float):
         '''Split data into a training and testing dataframe.'''
@@ -107,21 +100,13 @@ class BifrostGradientBoosterEngine():
 
         return self.data[:training_record_count], self.data[training_record_count:]
 
-    def __get_x_y_dfs__(self, df: pd.DataFrame, column_name_to_predict: str):
-        '''Split a dataframe into x (regressors) and y (value to predict) dataframes.'''
-        x: pd.DataFrame = df.drop(columns=[column_name_to_predict])
-        y: pd.DataFrame = df.loc[:, [column_name_to_predict]]
+    def __get_matrix__(self, x: np.ndarray, y: np.ndarray, name: str) -> 'xgb.DMatrix':
+        '''Convert a feature matrix and its labels into a XGBoost matrix.'''
+        matrix: xgb.DMatrix = self.feature_pipeline.get_matrix(x, y)
 
-        return x, y
+        print(f'[{name}] Matrix X: {x.shape}, Matrix Y: {(0 if y is None else len(y), 1)}')
 
-    def __get_df_matrix__(self, df: pd.DataFrame, column_name_to_predict: str, name: str):
-        '''Covenvert a dataframe into a XGBoost matrix.'''
-        x, y = self.__get_x_y_dfs__(df, column_name_to_predict=column_name_to_predict)
-        matrix = xgb.DMatrix(data=x, label=y)
-
-        print(f'[{name}] Matrix X: {x.shape}, Matrix Y: {y.shape}')
-
-        return matrix, x, y
+        return matrix
 
     def __calculate_mape_score__(self, y_true: pd.Series, y_pred: pd.Series) -> float:
         '''Calculate the Mean Absolute Percentage Error score.'''
@@ -131,6 +116,8 @@ class BifrostGradientBoosterEngine():
 
     def __print_model_assessment__(self, test_column_data: pd.Series, predictions: pd.Series):
         '''Print a model assessment in the console.'''
+        from sklearn.metrics import mean_squared_error, mean_absolute_error, accuracy_score
+
         if not self.use_binary_classifier:
             print(f'Mean Absolute Error: {mean_absolute_error(test_column_data, predictions)} ({mean_absolute_error(test_column_data, predictions) / self.global_scaling_factor} reverse-scaled.)')
             print(f'Mean Squared Error: {np.sqrt(mean_squared_error(test_column_data, predictions))} ({np.sqrt(mean_squared_error(test_column_data, predictions)) / self.global_scaling_factor} reverse-scaled.)')
@@ -140,19 +127,9 @@ class BifrostGradientBoosterEngine():
 
     def __featurize_time_from_column__(self, data: pd.DataFrame, column_name: str, column_prefix: str = 't_') -> pd.DataFrame:
         '''Convert time data in to features to be used in regression.'''
-        __data__: pd.DataFrame = data.copy()
-
-        parsed_date_temporary_column: pd.Series = pd.to_datetime(__data__[column_name])
-        __data__.drop(columns=[column_name], inplace=True)
-
-        __data__[f'{column_prefix}year'] = parsed_date_temporary_column.dt.year
-        __data__[f'{column_prefix}month'] = parsed_date_temporary_column.dt.month
-        __data__[f'{column_prefix}day'] = parsed_date_temporary_column.dt.day
-        __data__[f'{column_prefix}hour'] = parsed_date_temporary_column.dt.hour
-        __data__[f'{column_prefix}minute'] = parsed_date_temporary_column.dt.minute
-        __data__[f'{column_prefix}day_of_year'] = parsed_date_temporary_column.dt.dayofyear
-        __data__[f'{column_prefix}day_of_week'] = parsed_date_temporary_column.dt.dayofweek
-        __data__[f'{column_prefix}quarter'] = parsed_date_temporary_column.dt.quarter
+        self.feature_pipeline.data_time_column_name = column_name
+        self.feature_pipeline.time_feature_prefix = column_prefix
+        __data__: pd.DataFrame = self.feature_pipeline.featurize(data)
         self.is_timeseries_problem = True
 
         print(f'Extracted time series features from column "{column_name}" and dropped the original column.')
@@ -200,73 +177,186 @@ class BifrostGradientBoosterEngine():
 
     def fit(self,
             enable_hyperparameter_optimization: bool,
-            training_split: float = 0.8):
-        '''Initiate the model training.'''
+            training_split: float = 0.8,
+            thread_count: int = None,
+            parameters: dict = None,
+            optimization_budget_in_seconds: float = None,
+            training_profile: str = None):
+        '''Initiate the model training, optionally limiting the threads XGBoost may use, starting from previously tuned parameters or searching for them within a time budget. Tuned parameters carry the boosting rounds they were validated with under num_boost_round. A named training profile instead stops boosting early against the testing split, uses histogram-based trees and defaults the thread count to its own budget.'''
+        import xgboost as xgb
+
+        if training_profile is not None and training_profile not in TRAINING_PROFILES:
+            raise Exception('Valid training_profile is required.')
+
         self.training_split = training_split
+        self.training_profile = training_profile
 
         if not self.is_timeseries_problem:
+            from sklearn.utils import shuffle
+
             self.data = shuffle(self.data)
 
-        training_df, testing_df = self.__get_training_test_dfs__(training_split=training_split)
-        training_matrix, training_x, training_y = self.__get_df_matrix__(training_df, column_name_to_predict=self.column_name_to_predict, name='Training')
-        testing_matrix, testing_x, testing_y = self.__get_df_matrix__(testing_df, column_name_to_predict=self.column_name_to_predict, name='Testing')
-        parameters_to_use = self.default_parameters
+        self.feature_names = [c for c in self.data.columns if c != self.column_name_to_predict]
+        self.feature_pipeline = self.__create_feature_pipeline__()
+        # The prepared data is converted to a single float32 matrix once and split by row, rather than per split.
+        x, y = self.feature_pipeline.transform(self.data, apply_scale=False)
+        training_record_count: int = int(len(x) * training_split)
+        training_x, training_y = x[:training_record_count], y[:training_record_count]
+        training_matrix: xgb.DMatrix = self.__get_matrix__(training_x, training_y, name='Training')
+        testing_matrix: xgb.DMatrix = self.__get_matrix__(x[training_record_count:], y[training_record_count:], name='Testing')
+        parameters_to_use: dict = {**self.default_parameters, **(parameters or {})}
+        self.tuned_num_boost_round = parameters_to_use.pop('num_boost_round', None)
+        early_stopping_rounds: int = None
+
+        if training_profile is not None:
+            profile: dict = TRAINING_PROFILES[training_profile]
+            parameters_to_use.update({'tree_method': profile['tree_method'], 'max_bin': profile['max_bin']})
+            early_stopping_rounds = profile['early_stopping_rounds'] if training_record_count < len(x) else None
+            thread_count = thread_count or min(profile['thread_count'], os.cpu_count() or 1)
 
         if enable_hyperparameter_optimization:
-            grid_result: MultiOutputRegressor = None
-
-            if self.use_binary_classifier:
-                xgbc0 = xgb.XGBClassifier(objective='binary:logistic',
-                                          booster='gbtree',
-                                          eval_metric='auc',
-                                          tree_method='hist',
-                                          grow_policy='lossguide',
-                                          use_label_encoder=False)
-                default_params = {}
-                gparams = xgbc0.get_params()
-
-                for key in gparams.keys():
-                    gp = gparams[key]
-                    default_params[key] = [gp]
-
-                grid_search = GridSearchCV(
-                    estimator=xgb.XGBClassifier(),
-                    param_grid=default_params,
-                    cv=3,
-                    scoring='accuracy',
-                    verbose=1,
-                    return_train_score=True,
-                    n_jobs=-1
-                )
-                grid_result = MultiOutputRegressor(grid_search).fit(training_x, training_y)
-            else:
-                grid_search = GridSearchCV(
-                    estimator=xgb.XGBRegressor(),
-                    param_grid=self.tuning_parameter_range,
-                    cv=3,
-                    scoring='neg_mean_squared_error',
-                    verbose=1,
-                    n_jobs=-1
-                )
-                grid_result = MultiOutputRegressor(grid_search).fit(training_x, training_y)
-
-            parameters_to_use = grid_result.estimators_[0].best_params_
+            # Candidates are scored on forward-chaining splits of the training rows only, so the testing rows never leak into the search.
+            search_engine = HyperparameterSearchEngine(parameter_range=self.tuning_parameter_range,
+                                                       budget_in_seconds=optimization_budget_in_seconds,
+                                                       thread_count=thread_count)
+            search_result: dict = search_engine.search(training_x, training_y, self.feature_names, parameters_to_use)
+            parameters_to_use, self.tuned_num_boost_round = search_result['parameters'], search_result['num_boost_round']
             print('Hyperparameter optimization completed successfully.')
 
-        self.model = xgb.train(
-            params=parameters_to_use,
-            dtrain=training_matrix,
-            num_boost_round=1000,
-            evals=[(testing_matrix, self.column_name_to_predict)],
-            verbose_eval=200
-        )
+        num_boost_round: int = self.tuned_num_boost_round or 1000
+
+        # A profile bounds the rounds itself and stops early against the testing split.
+        if training_profile is not None:
+            num_boost_round = profile['max_boost_rounds']
+
+        if thread_count is not None:
+            parameters_to_use = {**parameters_to_use, 'nthread': thread_count}
+
+        with metrics_data_access.time_stage('training'):
+            self.model = xgb.train(
+                params=parameters_to_use,
+                dtrain=training_matrix,
+                num_boost_round=num_boost_round,
+                evals=[(testing_matrix, self.column_name_to_predict)],
+                early_stopping_rounds=early_stopping_rounds,
+                verbose_eval=200
+            )
+
+        if early_stopping_rounds is not None:
+            # Drop the rounds boosted after the best one, which only waited for an improvement that never came.
+            self.model = self.model[:self.model.best_iteration + 1]
+            print(f'Kept the best {self.model.num_boosted_rounds()} of at most {num_boost_round} boosting rounds ({training_profile} profile).')
+
+        self.model_size_in_bytes = self.__get_model_size_in_bytes__()
+        metrics_data_access.increment('bifrost_model_trainings_total', {'mode': 'full'})
+        self.parameters = dict(parameters_to_use)
 
         return self
 
+    def __get_model_size_in_bytes__(self) -> int:
+        '''Measure the serialized size of the booster, which caches read instead of serializing it on every write.'''
+        return len(self.model.save_raw()) if self.model is not None else 0
+
+    def get_tuned_parameters(self) -> dict:
+        '''Get the training parameters to persist for later trainings of the same series, including the boosting rounds they were validated with, should those be known.'''
+        if self.tuned_num_boost_round is None:
+            return dict(self.parameters)
+
+        return {**self.parameters, 'num_boost_round': self.tuned_num_boost_round}
+
+    def __create_feature_pipeline__(self) -> FeaturePipelineEngine:
+        '''Create the feature pipeline matching the scale, dropped columns and feature order of this model.'''
+        return FeaturePipelineEngine(column_name_to_predict=self.column_name_to_predict,
+                                     data_time_column_name=self.data_time_column_name,
+                                     global_scaling_factor=self.global_scaling_factor,
+                                     columns_to_drop=self.columns_to_drop,
+                                     feature_names=self.feature_names)
+
+    def get_metadata(self) -> dict:
+        '''Get everything besides the booster itself that is required to predict with the trained model.'''
+        return {
+            'column_name_to_predict': self.column_name_to_predict,
+            'use_binary_classifier': self.use_binary_classifier,
+            'data_time_column_name': self.data_time_column_name,
+            'is_timeseries_problem': self.is_timeseries_problem,
+            'global_scaling_factor': self.global_scaling_factor,
+            'columns_to_drop': self.columns_to_drop,
+            'feature_names': self.feature_names,
+            'training_data_range': self.training_data_range,
+            'training_split': self.training_split,
+            'parameters': self.parameters,
+            'tuned_num_boost_round': self.tuned_num_boost_round,
+            'incremental_update_count': self.incremental_update_count,
+            'training_profile': self.training_profile
+        }
+
+    @classmethod
+    def from_trained_model(cls, model: 'xgb.Booster', metadata: dict):
+        '''Restore a trained, predict-only engine from a booster and the metadata produced by get_metadata.'''
+        engine: BifrostGradientBoosterEngine = cls.__new__(cls)
+        engine.data = None
+        engine.model = model
+
+        for key, value in metadata.items():
+            setattr(engine, key, value)
+
+        engine.model_size_in_bytes = engine.__get_model_size_in_bytes__()
+        engine.feature_pipeline = engine.__create_feature_pipeline__()
+
+        return engine
+
+    def update(self,
+               data: pd.DataFrame,
+               num_boost_round: int = 10,
+               refresh_leaves: bool = False,
+               features: tuple = None):
+        '''Get a copy of the trained time series model that continued boosting on, or refreshed its leaf values with, only the rows newer than its training data. The data may start with the last already-trained row to seed the shifted labels. Already featurized (x, y) rows of the data, with unshifted labels, may be passed to skip featurization.'''
+        import xgboost as xgb
+
+        if self.model is None or self.data_time_column_name is None or self.training_data_range is None:
+            raise Exception('A trained time series model is required.')
+
+        is_new_row: np.ndarray = (pd.to_datetime(data[self.data_time_column_name]) > pd.Timestamp(self.training_data_range[1])).to_numpy()
+
+        if not is_new_row.any():
+            return self
+
+        first_new_row: int = int(is_new_row.argmax())
+        first_featurized_row: int = 0
+
+        if features is None:
+            # Only the new rows and the one before them, which seeds the shifted labels, are featurized.
+            first_featurized_row = max(0, first_new_row - 1)
+            features = self.feature_pipeline.transform(data.iloc[first_featurized_row:])
+
+        x: np.ndarray = features[0][first_new_row - first_featurized_row:]
+        y: np.ndarray = self.feature_pipeline.shift_label(features[1])[first_new_row - first_featurized_row:]
+        matrix: xgb.DMatrix = self.__get_matrix__(x, y, name='Update')
+        parameters_to_use: dict = dict(self.parameters)
+
+        if refresh_leaves:
+            parameters_to_use.update({'process_type': 'update', 'updater': 'refresh', 'refresh_leaf': True})
+            num_boost_round = self.model.num_boosted_rounds()
+
+        # The booster is copied by xgb.train, so the current model keeps serving predictions until the copy is swapped in.
+        updated_engine: BifrostGradientBoosterEngine = copy.copy(self)
+
+        with metrics_data_access.time_stage('training'):
+            updated_engine.model = xgb.train(params=parameters_to_use, dtrain=matrix, num_boost_round=num_boost_round, xgb_model=self.model)
+
+        metrics_data_access.increment('bifrost_model_trainings_total', {'mode': 'incremental'})
+        updated_engine.model_size_in_bytes = updated_engine.__get_model_size_in_bytes__()
+        updated_engine.incremental_update_count = self.incremental_update_count + 1
+        updated_engine.training_data_range = [self.training_data_range[0], str(pd.to_datetime(data[self.data_time_column_name]).max())]
+
+        print(f'Incrementally updated the model with {len(x)} new rows ({updated_engine.incremental_update_count} updates since the last full training).')
+
+        return updated_engine
+
     def evaluate(self):
         '''Evaluate the already-trained model.'''
         training_df, testing_df = self.__get_training_test_dfs__(training_split=self.training_split)
-        testing_matrix, testing_x, testing_y = self.__get_df_matrix__(testing_df, column_name_to_predict=self.column_name_to_predict, name='Testing')
+        testing_y: pd.Series = testing_df[self.column_name_to_predict]
 
         # Predict.
         predictions: pd.Series = self.predict(future_data=testing_df, bypass_scale_application=True)
@@ -276,6 +366,8 @@ class BifrostGradientBoosterEngine():
             (testing_df[self.column_name_to_predict] / self.global_scaling_factor).rename('Test Data').plot(legend=True)
             predictions.rename('Predictions').plot(legend=True)
         else:
+            from sklearn.metrics import ConfusionMatrixDisplay
+
             predictions = (predictions > 0.5).astype(int)
             ConfusionMatrixDisplay.from_predictions(y_true=testing_y, y_pred=predictions)
 
@@ -287,20 +379,17 @@ class BifrostGradientBoosterEngine():
                 future_data: pd.DataFrame,
                 bypass_scale_application: bool = False) -> pd.Series:
         '''Generate a prediction on the pre-trained model given a current state's feature set.'''
-        __future_data__: pd.DataFrame = future_data.copy()
-
-        if self.is_timeseries_problem and self.data_time_column_name in future_data.columns:
-            __future_data__ = self.__featurize_time_from_column__(__future_data__, self.data_time_column_name)
-            __future_data__.drop(columns=self.columns_to_drop, inplace=True)
+        # The raw frame is read column by column into the feature matrix, so it is never copied.
+        x, y = self.feature_pipeline.transform(future_data, apply_scale=not bypass_scale_application, include_label=False)
 
-        if not bypass_scale_application:
-            self.__apply_common_scale__(__future_data__, self.global_scaling_factor)
+        return pd.Series(self.predict_features(x), index=future_data.index)
 
-        matrix, x, y = self.__get_df_matrix__(__future_data__, column_name_to_predict=self.column_name_to_predict, name='Prediction')
-        predictions = pd.Series(self.model.predict(matrix)) / self.global_scaling_factor
-        predictions.index = __future_data__.index
+    def predict_features(self, x: np.ndarray) -> np.ndarray:
+        '''Generate predictions from an already featurized and scaled float32 matrix in the feature order of the model.'''
+        matrix: xgb.DMatrix = self.__get_matrix__(x, None, name='Prediction')
 
-        return predictions
+        with metrics_data_access.time_stage('prediction'):
+            return self.model.predict(matrix) / self.global_scaling_factor
 
     def visualize(self, verbose: bool = False):
         '''Visualize the decision tree structrure that backs the model.'''
@@ -308,4 +397,6 @@ class BifrostGradientBoosterEngine():
             for importance_type in ('weight', 'gain', 'cover', 'total_gain', 'total_cover'):
                 print(f'{importance_type}: {self.model.get_score(importance_type=importance_type)}')
 
+        import xgboost as xgb
+
         return xgb.to_graphviz(self.model, num_trees=0, size='10,10')
@@ -0,0 +1,65 @@
+import logging
+import threading
+import time
+
+
+class CachePrewarmingEngine():
+    '''Loads the market data and models of a configured list of pair/period combinations into memory in the background, so that the server answers health checks right away and their first requests do not pay for loading them.'''
+    def __init__(self, prewarm, keys: list):
+        '''Initialize the engine with a prewarm(pair_name, period) callable that loads a pair into memory, and the (pair_name, period) combinations to load.'''
+        if prewarm is None:
+            raise Exception('Valid prewarm is required.')
+
+        self.prewarm = prewarm
+        self.keys = list(keys or [])
+        self.__statuses__ = {key: 'pending' for key in self.keys}
+        self.__lock__ = threading.Lock()
+        self.__thread__ = None
+        self.__started_at__ = None
+        self.__finished_at__ = None
+
+    def start(self):
+        '''Start prewarming in a background thread, should it not have been started yet.'''
+        with self.__lock__:
+            if self.__thread__ is not None:
+                return
+
+            self.__started_at__ = time.monotonic()
+            self.__thread__ = threading.Thread(target=self.__run__, name='cache-prewarming', daemon=True)
+            self.__thread__.start()
+
+    def is_complete(self) -> bool:
+        '''Whether every combination has been prewarmed or failed to.'''
+        with self.__lock__:
+            return all(status != 'pending' for status in self.__statuses__.values())
+
+    def get_status(self) -> dict:
+        '''Get the prewarming state of every combination, keyed by <pair_name>.<period>, and the seconds it took so far.'''
+        with self.__lock__:
+            statuses: dict = {f'{pair_name}.{period}': status for (pair_name, period), status in self.__statuses__.items()}
+            is_complete: bool = all(status != 'pending' for status in self.__statuses__.values())
+            elapsed_in_seconds: float = None
+
+            if self.__started_at__ is not None:
+                elapsed_in_seconds = (self.__finished_at__ or time.monotonic()) - self.__started_at__
+
+        return {'is_complete': is_complete, 'elapsed_in_seconds': elapsed_in_seconds, 'pairs': statuses}
+
+    def __run__(self):
+        '''Prewarm every combination in order, carrying on past failures.'''
+        for pair_name, period in self.keys:
+            status: str = 'failed'
+
+            try:
+                self.prewarm(pair_name, period)
+                status = 'warm'
+            except Exception:
+                logging.exception('Prewarming failed for "%s" (%s).', pair_name, period)
+
+            with self.__lock__:
+                self.__statuses__[(pair_name, period)] = status
+
+        with self.__lock__:
+            self.__finished_at__ = time.monotonic()
+
+        logging.info('Prewarmed %d pair/period combinations.', len(self.keys))
@@ -0,0 +1,100 @@
+from data.memory_cache_data_access import MemoryCacheDataAccess
+from .feature_pipeline_engine import FeaturePipelineEngine
+import numpy as np
+import pandas as pd
+import threading
+
+
+class FeatureMatrixCacheEngine():
+    '''Keeps the featurized and scaled matrix of each pair/period in memory and extends it with newly closed candles only, so that rows are never featurized twice.'''
+    def __init__(self, cache_max_age_in_seconds: int = 10, max_allowed_bytes: int = 2147483647):
+        self.__matrices__ = MemoryCacheDataAccess(cache_max_age_in_seconds=cache_max_age_in_seconds, max_allowed_bytes=max_allowed_bytes)
+        self.__lock__ = threading.Lock()
+
+    def __get_signature__(self, feature_pipeline: FeaturePipelineEngine) -> tuple:
+        '''Get what a cached matrix depends on, so that it is rebuilt when a model with a different scale or feature set takes over.'''
+        return (feature_pipeline.global_scaling_factor, tuple(feature_pipeline.feature_names), feature_pipeline.data_time_column_name)
+
+    def __create_entry__(self, signature: tuple, feature_count: int, capacity: int) -> dict:
+        return {
+            'signature': signature,
+            'time': np.empty(capacity, dtype=np.int64),
+            'x': np.empty((capacity, feature_count), dtype=np.float32),
+            'y': np.empty(capacity, dtype=np.float32),
+            'start': 0,
+            'count': 0
+        }
+
+    def __append_rows__(self, entry: dict, times: np.ndarray, x: np.ndarray, y: np.ndarray) -> dict:
+        '''Append rows, compacting away rows that slid out of the window and doubling the capacity once full. Rows already handed out are never written to.'''
+        start, count = entry['start'], entry['count']
+        row_count: int = len(times)
+
+        if start + count + row_count > len(entry['time']):
+            compacted_entry: dict = self.__create_entry__(entry['signature'], x.shape[1], max(2 * (count + row_count), 1024))
+
+            for name in ('time', 'x', 'y'):
+                compacted_entry[name][:count] = entry[name][start:start + count]
+
+            compacted_entry['count'] = count
+            entry, start = compacted_entry, 0
+
+        end: int = start + count
+        entry['time'][end:end + row_count] = times
+        entry['x'][end:end + row_count] = x
+        entry['y'][end:end + row_count] = y
+
+        return {**entry, 'count': count + row_count}
+
+    def get_features(self, key: str, feature_pipeline: FeaturePipelineEngine, market_data: pd.DataFrame, start_time=None) -> tuple:
+        '''Get the (x, y) float32 matrix and unshifted labels of the market data rows from a start time onwards. Closed candles come from the cache, extended as needed, while the still open latest candle is always featurized afresh.'''
+        if key is None:
+            raise Exception('Valid key is required.')
+
+        if feature_pipeline is None or feature_pipeline.feature_names is None:
+            raise Exception('Valid feature_pipeline is required.')
+
+        times: np.ndarray = market_data[feature_pipeline.data_time_column_name].to_numpy().astype('datetime64[ns]').astype(np.int64)
+        start_index: int = 0 if start_time is None else int(np.searchsorted(times, pd.Timestamp(start_time).value))
+        closed_count: int = max(0, len(times) - 1)
+        signature: tuple = self.__get_signature__(feature_pipeline)
+
+        with self.__lock__:
+            entry: dict = self.__matrices__.get_from_cache(key)
+
+            if entry is None or entry['signature'] != signature:
+                entry = self.__create_entry__(signature, len(feature_pipeline.feature_names), max(2 * closed_count, 1024))
+
+            cached_times: np.ndarray = entry['time'][entry['start']:entry['start'] + entry['count']]
+            offset: int = int(np.searchsorted(cached_times, times[0])) if len(times) > 0 else 0
+            overlap_count: int = min(len(cached_times) - offset, closed_count)
+
+            # The market data has to continue the cached rows exactly, otherwise the window moved back or has gaps and the cache is rebuilt.
+            if len(cached_times) > 0 and (offset == len(cached_times) and closed_count > 0 or overlap_count > 0 and (cached_times[offset] != times[0] or cached_times[offset + overlap_count - 1] != times[overlap_count - 1])):
+                entry = self.__create_entry__(signature, len(feature_pipeline.feature_names), max(2 * closed_count, 1024))
+                offset, overlap_count = 0, 0
+
+            if overlap_count < closed_count:
+                x, y = feature_pipeline.transform(market_data.iloc[overlap_count:closed_count])
+                entry = self.__append_rows__(entry, times[overlap_count:closed_count], x, y)
+                # Rows before the window are dropped with the next compaction.
+                entry['start'], entry['count'] = entry['start'] + offset, entry['count'] - offset
+                offset = 0
+
+            self.__matrices__.write_to_cache(key, entry)
+
+        first_row: int = entry['start'] + offset + min(start_index, closed_count)
+        last_row: int = entry['start'] + offset + closed_count
+        x_parts: list = [entry['x'][first_row:last_row]]
+        y_parts: list = [entry['y'][first_row:last_row]]
+
+        if len(times) > closed_count:
+            open_x, open_y = feature_pipeline.transform(market_data.iloc[closed_count:])
+            x_parts.append(open_x)
+            y_parts.append(open_y)
+
+        return np.concatenate(x_parts), np.concatenate(y_parts)
+
+    def get_statistics(self) -> dict:
+        '''Get the entry count, approximate size and hit, miss, eviction and expiration counts of the cache.'''
+        return self.__matrices__.get_statistics()
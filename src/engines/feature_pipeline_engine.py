@@ -0,0 +1,118 @@
+import numpy as np
+import pandas as pd
+from data.metrics_data_access import metrics_data_access
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import xgboost as xgb
+
+MAX_SCALE_EXPONENT = 18
+SCALE_RELATIVE_TOLERANCE = 1e-12
+
+
+class FeaturePipelineEngine():
+    '''Turns raw data into the contiguous float32 feature matrix of a model in a single vectorized pass. It is fit once at training time, storing the scale, dropped columns and feature order, and shared by training, updates, evaluation and prediction.'''
+    def __init__(self,
+                 column_name_to_predict: str,
+                 data_time_column_name: str = None,
+                 global_scaling_factor: int = 1,
+                 columns_to_drop: list = None,
+                 feature_names: list = None,
+                 time_feature_prefix: str = 't_'):
+        if column_name_to_predict is None:
+            raise Exception('Valid column_name_to_predict is required.')
+
+        self.column_name_to_predict = column_name_to_predict
+        self.data_time_column_name = data_time_column_name
+        self.global_scaling_factor = global_scaling_factor
+        self.columns_to_drop = list(columns_to_drop or [])
+        self.feature_names = None if feature_names is None else list(feature_names)
+        self.time_feature_prefix = time_feature_prefix
+
+    def determine_common_scale(self, data: pd.DataFrame) -> int:
+        '''Determine the smallest power of ten that leaves at most one decimal on the first value of every float column, so that XGBoost never sees too small values.'''
+        float_column_names: list = [c for c in data.columns if data[c].dtype == np.float64]
+
+        if len(float_column_names) == 0 or len(data) == 0:
+            return 1
+
+        first_values: np.ndarray = np.abs(np.nan_to_num(data[float_column_names].iloc[0].to_numpy(dtype=np.float64)))
+        scaled_values: np.ndarray = first_values[:, None] * np.power(10.0, np.arange(MAX_SCALE_EXPONENT + 1))[None, :]
+        has_at_most_one_decimal: np.ndarray = np.abs(scaled_values - np.round(scaled_values, 1)) <= scaled_values * SCALE_RELATIVE_TOLERANCE
+        exponents: np.ndarray = np.where(has_at_most_one_decimal.any(axis=1), has_at_most_one_decimal.argmax(axis=1), MAX_SCALE_EXPONENT)
+
+        return 10 ** int(exponents.max())
+
+    def get_time_features(self, times) -> dict:
+        '''Get the calendar features of a time column as integer arrays, keyed by feature name.'''
+        times = np.asarray(times)
+
+        if not np.issubdtype(times.dtype, np.datetime64):
+            times = pd.to_datetime(times).to_numpy()
+
+        times = times.astype('datetime64[ns]')
+        years: np.ndarray = times.astype('datetime64[Y]')
+        months: np.ndarray = times.astype('datetime64[M]')
+        days: np.ndarray = times.astype('datetime64[D]')
+        hours: np.ndarray = times.astype('datetime64[h]')
+        month_numbers: np.ndarray = months.astype(np.int64) % 12 + 1
+
+        return {
+            f'{self.time_feature_prefix}year': years.astype(np.int64) + 1970,
+            f'{self.time_feature_prefix}month': month_numbers,
+            f'{self.time_feature_prefix}day': (days - months.astype('datetime64[D]')).astype(np.int64) + 1,
+            f'{self.time_feature_prefix}hour': (hours - days.astype('datetime64[h]')).astype(np.int64),
+            f'{self.time_feature_prefix}minute': (times.astype('datetime64[m]') - hours.astype('datetime64[m]')).astype(np.int64),
+            f'{self.time_feature_prefix}day_of_year': (days - years.astype('datetime64[D]')).astype(np.int64) + 1,
+            # The epoch fell on a Thursday, while Monday is day 0.
+            f'{self.time_feature_prefix}day_of_week': (days.astype(np.int64) + 3) % 7,
+            f'{self.time_feature_prefix}quarter': (month_numbers - 1) // 3 + 1
+        }
+
+    def featurize(self, data: pd.DataFrame) -> pd.DataFrame:
+        '''Get a copy of a data frame with its time column replaced by calendar features.'''
+        with metrics_data_access.time_stage('featurization'):
+            time_features: dict = self.get_time_features(data[self.data_time_column_name].to_numpy())
+
+            return pd.concat([data.drop(columns=[self.data_time_column_name]), pd.DataFrame(time_features, index=data.index)], axis=1)
+
+    def transform(self, data: pd.DataFrame, apply_scale: bool = True, include_label: bool = True, shift_label: bool = False) -> tuple:
+        '''Get the (x, y) float32 feature matrix and label vector of raw or already prepared data. Feature columns present in the data are used as is, scaled when raw, and calendar features are derived from the time column otherwise.'''
+        if self.feature_names is None:
+            raise Exception('A fitted feature pipeline is required.')
+
+        with metrics_data_access.time_stage('featurization'):
+            row_count: int = len(data)
+            scale: float = self.global_scaling_factor if apply_scale else 1
+            x: np.ndarray = np.empty((row_count, len(self.feature_names)), dtype=np.float32)
+            time_features: dict = None
+
+            for index, feature_name in enumerate(self.feature_names):
+                if feature_name in data.columns:
+                    column: pd.Series = data[feature_name]
+                    x[:, index] = column.to_numpy() * scale if column.dtype == np.float64 and scale != 1 else column.to_numpy()
+                    continue
+
+                if time_features is None:
+                    time_features = self.get_time_features(data[self.data_time_column_name].to_numpy())
+
+                x[:, index] = time_features[feature_name]
+
+            if not include_label:
+                return x, None
+
+            label: pd.Series = data[self.column_name_to_predict]
+            y: np.ndarray = (label.to_numpy() * scale if label.dtype == np.float64 and scale != 1 else label.to_numpy()).astype(np.float32)
+
+            return x, self.shift_label(y) if shift_label else y
+
+    def shift_label(self, y: np.ndarray) -> np.ndarray:
+        '''Move all Y values one into the future as we would want to predict the future Y given a current state (X).'''
+        return np.concatenate([np.zeros(min(1, len(y)), dtype=y.dtype), y[:-1]])
+
+    def get_matrix(self, x: np.ndarray, y: np.ndarray = None) -> 'xgb.DMatrix':
+        '''Wrap a feature matrix, and optionally its labels, in a named XGBoost matrix.'''
+        import xgboost as xgb
+
+        with metrics_data_access.time_stage('dmatrix_build'):
+            return xgb.DMatrix(data=x, label=y, feature_names=self.feature_names)
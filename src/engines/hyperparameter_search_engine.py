@@ -0,0 +1,135 @@
+from data.metrics_data_access import metrics_data_access
+import itertools
+import numpy as np
+import time
+
+# Evaluation metrics where a higher score is better. All others are minimized.
+MAXIMIZED_EVAL_METRICS = ('auc', 'aucpr', 'map', 'ndcg')
+
+
+class HyperparameterSearchEngine():
+    '''Searches XGBoost parameters within a budget by successive halving: many candidates are evaluated with few early-stopped boosting rounds and only the best fraction advances to more rounds. Candidates are scored on forward-chaining time series splits so that no fold ever validates on data older than its training data.'''
+    def __init__(self,
+                 parameter_range: dict,
+                 split_count: int = 3,
+                 max_candidates: int = 81,
+                 min_boost_rounds: int = 20,
+                 max_boost_rounds: int = 1000,
+                 reduction_factor: int = 3,
+                 budget_in_seconds: float = None,
+                 thread_count: int = None,
+                 random_state: int = 1502):
+        if parameter_range is None or len(parameter_range) == 0:
+            raise Exception('Valid parameter_range is required.')
+
+        if split_count < 1:
+            raise Exception('Valid split_count is required.')
+
+        if reduction_factor < 2:
+            raise Exception('Valid reduction_factor is required.')
+
+        self.parameter_range = parameter_range
+        self.split_count = split_count
+        self.max_candidates = max_candidates
+        self.min_boost_rounds = min_boost_rounds
+        self.max_boost_rounds = max_boost_rounds
+        self.reduction_factor = reduction_factor
+        self.budget_in_seconds = budget_in_seconds
+        self.thread_count = thread_count
+        self.random_state = random_state
+
+    def get_candidates(self) -> list:
+        '''Get a reproducible random sample of at most max_candidates parameter combinations from the range.'''
+        names: list = list(self.parameter_range.keys())
+        combinations: list = [dict(zip(names, values)) for values in itertools.product(*[self.parameter_range[name] for name in names])]
+
+        if len(combinations) <= self.max_candidates:
+            return combinations
+
+        indices: np.ndarray = np.random.default_rng(self.random_state).choice(len(combinations), size=self.max_candidates, replace=False)
+
+        return [combinations[i] for i in sorted(indices)]
+
+    def get_splits(self, row_count: int) -> list:
+        '''Get forward-chaining (training end, validation end) row bounds, each training on everything before its validation block.'''
+        block_size: int = row_count // (self.split_count + 1)
+
+        if block_size < 1:
+            raise Exception(f'At least {self.split_count + 1} rows are required.')
+
+        return [(block_size * (i + 1), block_size * (i + 2) if i < self.split_count - 1 else row_count) for i in range(self.split_count)]
+
+    def search(self, x: np.ndarray, y: np.ndarray, feature_names: list = None, base_parameters: dict = None) -> dict:
+        '''Get the best parameter combination for a time ordered feature matrix and labels, along with the boosting rounds it needed and its validation score.'''
+        import xgboost as xgb
+
+        started_at: float = time.monotonic()
+        base_parameters = dict(base_parameters or {})
+
+        if self.thread_count is not None:
+            base_parameters['nthread'] = self.thread_count
+
+        # Every split's matrices are built once and shared by all candidates and rounds.
+        splits: list = [(xgb.DMatrix(x[:training_end], label=y[:training_end], feature_names=feature_names),
+                         xgb.DMatrix(x[training_end:validation_end], label=y[training_end:validation_end], feature_names=feature_names))
+                        for training_end, validation_end in self.get_splits(len(x))]
+        candidates: list = self.get_candidates()
+        results: dict = {}
+        boost_rounds: int = self.min_boost_rounds
+        is_over_budget: bool = False
+
+        with metrics_data_access.time_stage('hyperparameter_search'):
+            while not is_over_budget:
+                for candidate_index, candidate in enumerate(candidates):
+                    # At least one candidate is always evaluated, however small the budget.
+                    if len(results) > 0 and self.budget_in_seconds is not None and time.monotonic() - started_at > self.budget_in_seconds:
+                        is_over_budget = True
+                        break
+
+                    results[candidate_index] = self.__evaluate__({**base_parameters, **candidate}, splits, boost_rounds)
+
+                rung_results: list = [(candidate_index, results[candidate_index]) for candidate_index in range(len(candidates)) if candidate_index in results and results[candidate_index]['boost_rounds'] == boost_rounds]
+
+                if is_over_budget or len(rung_results) <= 1 or boost_rounds >= self.max_boost_rounds:
+                    break
+
+                rung_results.sort(key=lambda result: result[1]['sort_key'])
+                survivor_count: int = max(1, len(rung_results) // self.reduction_factor)
+                candidates = [candidates[candidate_index] for candidate_index, _ in rung_results[:survivor_count]]
+                results = {i: result for i, (_, result) in enumerate(rung_results[:survivor_count])}
+                boost_rounds = min(self.max_boost_rounds, boost_rounds * self.reduction_factor)
+
+        # Prefer the candidates that survived the most rounds, then the best score among them.
+        best_index: int = min(results.keys(), key=lambda i: (-results[i]['boost_rounds'], results[i]['sort_key']))
+        best_result: dict = results[best_index]
+
+        print(f'Hyperparameter search finished in {time.monotonic() - started_at:.1f} seconds with a validation score of {best_result["score"]} after {best_result["best_iteration"] + 1} rounds. -> {candidates[best_index]}')
+
+        return {
+            'parameters': {**{k: v for k, v in base_parameters.items() if k != 'nthread'}, **candidates[best_index]},
+            'num_boost_round': best_result['best_iteration'] + 1,
+            'score': best_result['score']
+        }
+
+    def __evaluate__(self, parameters: dict, splits: list, boost_rounds: int) -> dict:
+        '''Score a parameter combination by its mean early-stopped validation score across all splits.'''
+        import xgboost as xgb
+
+        eval_metric = parameters.get('eval_metric', 'rmse')
+        is_maximized: bool = (eval_metric[-1] if isinstance(eval_metric, list) else eval_metric) in MAXIMIZED_EVAL_METRICS
+        scores: list = []
+        best_iterations: list = []
+
+        for training_matrix, validation_matrix in splits:
+            booster: xgb.Booster = xgb.train(params=parameters,
+                                             dtrain=training_matrix,
+                                             num_boost_round=boost_rounds,
+                                             evals=[(validation_matrix, 'validation')],
+                                             early_stopping_rounds=max(5, boost_rounds // 10),
+                                             verbose_eval=False)
+            scores.append(booster.best_score)
+            best_iterations.append(booster.best_iteration)
+
+        score: float = float(np.mean(scores))
+
+        return {'score': score, 'sort_key': -score if is_maximized else score, 'best_iteration': int(np.max(best_iterations)), 'boost_rounds': boost_rounds}
@@ -1,38 +1,268 @@
 from pandas import DataFrame
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import get_context
+from contextlib import nullcontext
+import os
 import pandas as pd
 import numpy as np
 import re
 from .bifrost_gradient_booster_engine import BifrostGradientBoosterEngine
+from .feature_matrix_cache_engine import FeatureMatrixCacheEngine
 from data.memory_cache_data_access import MemoryCacheDataAccess
-from configuration import MODEL_CACHE_IN_SECONDS
+from data.model_registry_data_access import ModelRegistryDataAccess
+from data.single_flight_data_access import SingleFlightDataAccess
+from enums.training_profiles import TRAINING_PROFILES
+from configuration import MODEL_CACHE_IN_SECONDS, MODEL_CACHE_MAX_SIZE_IN_BYTES, MODEL_REGISTRY_MAX_AGE_IN_SECONDS, MODEL_TRAINING_TIMEOUT_IN_SECONDS
+from configuration import MODEL_INCREMENTAL_UPDATE_BOOST_ROUNDS, MODEL_FULL_RETRAINING_INTERVAL_IN_UPDATES
+from configuration import BACKTEST_MIN_TRAINING_CANDLES, BACKTEST_MAX_WORKERS
+from configuration import FEATURE_MATRIX_CACHE_MAX_SIZE_IN_BYTES
+from configuration import MODEL_TRAINING_PROFILE, MODEL_TRAINING_PROFILES_BY_PAIR
+from configuration import MODEL_HYPERPARAMETER_SEARCH_ENABLED, MODEL_HYPERPARAMETER_SEARCH_BUDGET_IN_SECONDS, MODEL_TUNED_PARAMETERS_MAX_AGE_IN_SECONDS
+
+
+def __run_backtest_fold__(fold_index: int, training_data: DataFrame, testing_data: DataFrame, thread_count: int, training_profile: str) -> dict:
+    '''Train a model on the data preceding a fold and predict every candle in it.'''
+    model: BifrostGradientBoosterEngine = BifrostGradientBoosterEngine(data=training_data,
+                                                                       column_name_to_predict='close',
+                                                                       data_time_column_name='time',
+                                                                       enable_global_scaling=True) \
+        .fit(enable_hyperparameter_optimization=False, thread_count=thread_count, training_profile=training_profile)
+    predictions: pd.Series = model.predict(future_data=testing_data)
+
+    return {
+        'fold': fold_index,
+        'training_data_range': model.training_data_range,
+        'time': [str(time) for time in testing_data.time],
+        'actual_closing_prices': testing_data.close.tolist(),
+        'predicted_closing_prices': predictions.tolist()
+    }
 
 
 class MarketDataForecastingEngine():
     '''A class that performs forecasts for given market data.'''
-    def __init__(self):
-        self.__model_cache__ = MemoryCacheDataAccess(cache_max_age_in_seconds=MODEL_CACHE_IN_SECONDS)
+    def __init__(self,
+                 model_registry_data_access: ModelRegistryDataAccess = None,
+                 training_profile: str = MODEL_TRAINING_PROFILE,
+                 training_profiles_by_pair: dict = None):
+        if training_profile not in TRAINING_PROFILES:
+            raise Exception('Valid training_profile is required.')
+
+        self.__model_cache__ = MemoryCacheDataAccess(cache_max_age_in_seconds=MODEL_CACHE_IN_SECONDS, max_allowed_bytes=MODEL_CACHE_MAX_SIZE_IN_BYTES)
+        self.model_registry_data_access = model_registry_data_access
+        self.__model_trainings__ = SingleFlightDataAccess(timeout_in_seconds=MODEL_TRAINING_TIMEOUT_IN_SECONDS)
+        self.__feature_matrices__ = FeatureMatrixCacheEngine(cache_max_age_in_seconds=MODEL_CACHE_IN_SECONDS, max_allowed_bytes=FEATURE_MATRIX_CACHE_MAX_SIZE_IN_BYTES)
+        self.training_profile = training_profile
+        self.training_profiles_by_pair = dict(MODEL_TRAINING_PROFILES_BY_PAIR if training_profiles_by_pair is None else training_profiles_by_pair)
+        self.__requested_training_profiles__ = {}
+
+    def __get_model_from_registry__(self, model_key: str) -> BifrostGradientBoosterEngine:
+        '''Restore the latest sufficiently fresh persisted model, should a registry be configured and one exist.'''
+        if self.model_registry_data_access is None:
+            return None
+
+        persisted_model: tuple = self.model_registry_data_access.get_model(model_key, max_age_in_seconds=MODEL_REGISTRY_MAX_AGE_IN_SECONDS)
+
+        if persisted_model is None:
+            return None
+
+        print(f'Restored model "{model_key}" version {persisted_model[1]["version"]} from the registry.')
+
+        return BifrostGradientBoosterEngine.from_trained_model(*persisted_model)
+
+    def __save_model_to_registry__(self, model_key: str, model: BifrostGradientBoosterEngine):
+        '''Persist a newly trained model and prune stale versions, should a registry be configured.'''
+        if self.model_registry_data_access is None:
+            return
+
+        self.model_registry_data_access.save_model(model_key, model.model, model.get_metadata())
+        self.model_registry_data_access.prune(model_key)
+
+    def get_model_cache_statistics(self) -> dict:
+        '''Get the entry count, approximate size and hit, miss, eviction and expiration counts of the in-memory model cache.'''
+        return self.__model_cache__.get_statistics()
+
+    def get_feature_matrix_cache_statistics(self) -> dict:
+        '''Get the entry count, approximate size and hit, miss, eviction and expiration counts of the featurized matrix cache.'''
+        return self.__feature_matrices__.get_statistics()
+
+    def get_training_profile(self, period: str, asset_name: str, training_profile: str = None) -> str:
+        '''Get the training profile of a model: the one last requested for it, otherwise the one configured for its pair, otherwise the default. A requested profile is persisted alongside the model, should a registry be configured, so that background retrainings, restarts and all worker processes keep using it. It is held in memory and only reloaded from the registry once the model is retrained.'''
+        model_key: str = f'{asset_name}-{period}'
+        selected_training_profile: str = self.__get_selected_training_profile__(model_key)
+
+        if training_profile is not None:
+            if training_profile not in TRAINING_PROFILES:
+                raise Exception('Valid training_profile is required.')
+
+            if training_profile != selected_training_profile:
+                self.__select_training_profile__(model_key, training_profile)
+                selected_training_profile = training_profile
+
+        return selected_training_profile or self.training_profiles_by_pair.get(asset_name.upper()) or self.training_profile
+
+    def __get_selected_training_profile__(self, model_key: str) -> str:
+        '''Get the training profile last requested for a model, loading it from the registry, should one be configured, only once it is not held in memory.'''
+        if self.model_registry_data_access is None or model_key in self.__requested_training_profiles__:
+            return self.__requested_training_profiles__.get(model_key)
+
+        training_profile: str = self.model_registry_data_access.get_training_profile(model_key)
+        self.__requested_training_profiles__[model_key] = training_profile
+
+        return training_profile
+
+    def __select_training_profile__(self, model_key: str, training_profile: str):
+        '''Remember the training profile requested for a model, persisting it should a registry be configured.'''
+        if self.model_registry_data_access is not None:
+            self.model_registry_data_access.save_training_profile(model_key, training_profile)
+
+        self.__requested_training_profiles__[model_key] = training_profile
+
+    def __forget_selected_training_profile__(self, model_key: str):
+        '''Reload the training profile of a model from the registry on its next lookup, as another worker process may have selected a different one.'''
+        if self.model_registry_data_access is not None:
+            self.__requested_training_profiles__.pop(model_key, None)
+
+    def get_features(self, model: BifrostGradientBoosterEngine, market_data: DataFrame, period: str, asset_name: str, start_time=None) -> tuple:
+        '''Get the (x, y) featurized matrix and unshifted labels of the market data rows from a start time onwards, as expected by a model.'''
+        return self.__feature_matrices__.get_features(f'{asset_name}-{period}', model.feature_pipeline, market_data, start_time=start_time)
+
+    def get_close_predictions(self, market_data: DataFrame, period: str, asset_name: str, start_time=None, training_profile: str = None) -> pd.Series:
+        '''Predict the close of every candle from a start time onwards, reusing the already featurized rows of earlier calls.'''
+        model: BifrostGradientBoosterEngine = self.get_trained_model(market_data, period, asset_name, training_profile=training_profile)
+        x, y = self.get_features(model, market_data, period, asset_name, start_time=start_time)
+
+        return pd.Series(model.predict_features(x), index=market_data.index[len(market_data) - len(x):])
+
+    def get_trained_model(self, market_data: DataFrame, period: str, asset_name: str, training_profile: str = None) -> BifrostGradientBoosterEngine:
+        '''Create and train the model, retraining it should it have been trained with a different profile than the one selected.'''
+        model_key: str = f'{asset_name}-{period}'
+        training_profile = self.get_training_profile(period, asset_name, training_profile)
+        model: BifrostGradientBoosterEngine = self.__model_cache__.get_from_cache(model_key)
+
+        if model is not None and model.training_profile == training_profile:
+            return model
+
+        # Concurrent cache misses for the same model share one restore or training run.
+        return self.__model_trainings__.execute(model_key, lambda: self.__restore_or_train_model__(market_data, period, asset_name, training_profile))
+
+    def restore_model(self, market_data: DataFrame, period: str, asset_name: str) -> bool:
+        '''Load the persisted model of a pair into memory and featurize its market data for it, without ever training one. Returns whether a model with the selected training profile was available.'''
+        model_key: str = f'{asset_name}-{period}'
+        training_profile: str = self.get_training_profile(period, asset_name)
+        model: BifrostGradientBoosterEngine = self.__model_cache__.get_from_cache(model_key)
+
+        if model is None or model.training_profile != training_profile:
+            model = self.__get_model_from_registry__(model_key)
+
+            if model is None or model.training_profile != training_profile:
+                return False
+
+            self.__model_cache__.write_to_cache(model_key, model)
+
+        self.get_features(model, market_data, period, asset_name)
+
+        return True
 
-    def get_trained_model(self, market_data: DataFrame, period: str, asset_name: str) -> BifrostGradientBoosterEngine:
-        '''Create and train the model.'''
+    def __lock_model__(self, model_key: str):
+        '''Get a lock that serializes training a model across worker processes sharing the registry.'''
+        if self.model_registry_data_access is None:
+            return nullcontext()
+
+        return self.model_registry_data_access.lock(model_key)
+
+    def __restore_or_train_model__(self, market_data: DataFrame, period: str, asset_name: str, training_profile: str) -> BifrostGradientBoosterEngine:
+        '''Restore the model from cache or the registry and only train it should neither have it with the selected profile.'''
         model_key: str = f'{asset_name}-{period}'
         model: BifrostGradientBoosterEngine = self.__model_cache__.get_from_cache(model_key)
 
-        if model is not None:
+        if model is not None and model.training_profile == training_profile:
+            return model
+
+        # Another worker process may have trained the model while this one waited for the lock.
+        with self.__lock_model__(model_key):
+            model = self.__get_model_from_registry__(model_key)
+
+            if model is not None and model.training_profile == training_profile:
+                self.__model_cache__.write_to_cache(model_key, model)
+
+                return model
+
+            return self.__train_model__(market_data, period, asset_name, training_profile)
+
+    def train_model(self, market_data: DataFrame, period: str, asset_name: str) -> BifrostGradientBoosterEngine:
+        '''Train a new model and atomically swap it in for all subsequent predictions. Warm models are updated incrementally with new candles until a full retraining is due.'''
+        model_key: str = f'{asset_name}-{period}'
+
+        return self.__model_trainings__.execute(model_key, lambda: self.__retrain_model__(market_data, period, asset_name))
+
+    def __retrain_model__(self, market_data: DataFrame, period: str, asset_name: str) -> BifrostGradientBoosterEngine:
+        '''Swap in a model another worker process already trained on this market data, or otherwise update or fully retrain the current one.'''
+        model_key: str = f'{asset_name}-{period}'
+        self.__forget_selected_training_profile__(model_key)
+        training_profile: str = self.get_training_profile(period, asset_name)
+
+        with self.__lock_model__(model_key):
+            persisted_model: BifrostGradientBoosterEngine = self.__get_model_from_registry__(model_key)
+
+            if persisted_model is not None and persisted_model.training_profile == training_profile and persisted_model.training_data_range is not None and pd.Timestamp(persisted_model.training_data_range[1]) >= market_data.time.max():
+                self.__model_cache__.write_to_cache(model_key, persisted_model)
+
+                return persisted_model
+
+            model: BifrostGradientBoosterEngine = self.__model_cache__.get_from_cache(model_key) or persisted_model
+
+            if model is not None and model.training_profile == training_profile and model.training_data_range is not None and model.incremental_update_count < MODEL_FULL_RETRAINING_INTERVAL_IN_UPDATES:
+                return self.__update_model__(model, market_data, period, asset_name)
+
+            return self.__train_model__(market_data, period, asset_name, training_profile)
+
+    def __update_model__(self, model: BifrostGradientBoosterEngine, market_data: DataFrame, period: str, asset_name: str) -> BifrostGradientBoosterEngine:
+        '''Continue boosting a warm model on the candles since its last training and swap it into the cache and registry.'''
+        model_key: str = f'{asset_name}-{period}'
+        new_market_data: DataFrame = market_data[market_data.time >= pd.Timestamp(model.training_data_range[1])]
+        features: tuple = self.get_features(model, market_data, period, asset_name, start_time=model.training_data_range[1])
+        updated_model: BifrostGradientBoosterEngine = model.update(data=new_market_data, num_boost_round=MODEL_INCREMENTAL_UPDATE_BOOST_ROUNDS, features=features)
+
+        if updated_model is model:
             return model
 
-        model = BifrostGradientBoosterEngine(data=market_data.copy(),
-                                             column_name_to_predict='close',
-                                             data_time_column_name='time',
-                                             enable_global_scaling=True) \
-            .fit(enable_hyperparameter_optimization=False)
+        self.__save_model_to_registry__(model_key, updated_model)
+        self.__model_cache__.write_to_cache(model_key, updated_model)
 
+        return updated_model
+
+    def __get_tuned_parameters__(self, model_key: str) -> dict:
+        '''Get the persisted tuned parameters of a model, should a registry be configured and sufficiently fresh ones exist.'''
+        if self.model_registry_data_access is None:
+            return None
+
+        return self.model_registry_data_access.get_parameters(model_key, max_age_in_seconds=MODEL_TUNED_PARAMETERS_MAX_AGE_IN_SECONDS)
+
+    def __train_model__(self, market_data: DataFrame, period: str, asset_name: str, training_profile: str) -> BifrostGradientBoosterEngine:
+        '''Train a new model with a training profile and swap it into the cache and registry. Parameters tuned for the pair before are reused, otherwise they are searched for when enabled.'''
+        model_key: str = f'{asset_name}-{period}'
+        tuned_parameters: dict = self.__get_tuned_parameters__(model_key)
+        is_search_required: bool = MODEL_HYPERPARAMETER_SEARCH_ENABLED and tuned_parameters is None
+        model: BifrostGradientBoosterEngine = BifrostGradientBoosterEngine(data=market_data.copy(),
+                                                                           column_name_to_predict='close',
+                                                                           data_time_column_name='time',
+                                                                           enable_global_scaling=True) \
+            .fit(enable_hyperparameter_optimization=is_search_required,
+                 parameters=tuned_parameters,
+                 optimization_budget_in_seconds=MODEL_HYPERPARAMETER_SEARCH_BUDGET_IN_SECONDS,
+                 training_profile=training_profile)
+
+        if is_search_required and self.model_registry_data_access is not None:
+            self.model_registry_data_access.save_parameters(model_key, model.get_tuned_parameters())
+
+        self.__save_model_to_registry__(model_key, model)
         self.__model_cache__.write_to_cache(model_key, model)
 
         return model
 
-    def get_next_candle_close_prediction(self, market_data: DataFrame, period: str, asset_name: str) -> float:
+    def get_next_candle_close_prediction(self, market_data: DataFrame, period: str, asset_name: str, training_profile: str = None) -> float:
         '''Get the predicted next closing price of the asset.'''
-        predictions: pd.Series = self.get_trained_model(market_data, period, asset_name) \
+        predictions: pd.Series = self.get_trained_model(market_data, period, asset_name, training_profile=training_profile) \
             .predict(future_data=market_data.iloc[-1:])
         prediction_candle_close: float = predictions.values[0]
         prior_candle_close: float = market_data.close.values[-1]
@@ -41,3 +271,62 @@ class MarketDataForecastingEngine():
         prior_candle_time_delta: np.timedelta64 = np.timedelta64(int(period_split[1]), period_split[2])
 
         return (prior_candle_close, prior_candle_time, prediction_candle_close, (prior_candle_time + prior_candle_time_delta))
+
+    def backtest(self, market_data: DataFrame, start_time, end_time, retrain_stride: int, max_workers: int = None, training_profile: str = None):
+        '''Walk forward over the candles between the start and end time, retraining every <retrain_stride> candles on all data before them. The request is validated right away, while the returned generator trains the folds in parallel worker processes and yields them as they complete, followed by aggregate error metrics.'''
+        if market_data is None:
+            raise Exception('Valid market_data is required.')
+
+        if retrain_stride is None or retrain_stride < 1:
+            raise Exception('Valid retrain_stride is required.')
+
+        if training_profile is not None and training_profile not in TRAINING_PROFILES:
+            raise Exception('Valid training_profile is required.')
+
+        is_in_range: np.ndarray = ((market_data.time >= pd.Timestamp(start_time)) & (market_data.time <= pd.Timestamp(end_time))).values
+        testing_positions: np.ndarray = np.flatnonzero(is_in_range)
+        testing_positions = testing_positions[testing_positions >= BACKTEST_MIN_TRAINING_CANDLES]
+
+        if len(testing_positions) == 0:
+            raise Exception(f'At least {BACKTEST_MIN_TRAINING_CANDLES} candles are required before the backtest start time.')
+
+        folds: list = [testing_positions[i:i + retrain_stride] for i in range(0, len(testing_positions), retrain_stride)]
+
+        return self.__run_backtest__(market_data, folds, max_workers, training_profile or self.training_profile)
+
+    def __run_backtest__(self, market_data: DataFrame, folds: list, max_workers: int, training_profile: str):
+        '''Train and predict the folds in worker processes, yielding each as it completes and the error metrics over all of them last.'''
+        cpu_count: int = os.cpu_count() or 1
+        worker_count: int = min(len(folds), max_workers or BACKTEST_MAX_WORKERS or cpu_count)
+        # Each fold limits its training to its share of the cores through the thread budget passed to fit.
+        thread_count: int = max(1, cpu_count // worker_count)
+        actual_closing_prices: list = []
+        predicted_closing_prices: list = []
+
+        # Worker processes are spawned rather than forked as the serving process runs background threads.
+        with ProcessPoolExecutor(max_workers=worker_count, mp_context=get_context('spawn')) as executor:
+            futures: list = [executor.submit(__run_backtest_fold__, i, market_data.iloc[:fold[0]], market_data.iloc[fold[0]:fold[-1] + 1], thread_count, training_profile) for i, fold in enumerate(folds)]
+
+            try:
+                for future in as_completed(futures):
+                    fold_result: dict = future.result()
+                    actual_closing_prices += fold_result['actual_closing_prices']
+                    predicted_closing_prices += fold_result['predicted_closing_prices']
+
+                    yield fold_result
+            finally:
+                for future in futures:
+                    future.cancel()
+
+        yield {'summary': {'fold_count': len(folds), 'step_count': len(actual_closing_prices), **self.__get_error_metrics__(actual_closing_prices, predicted_closing_prices)}}
+
+    def __get_error_metrics__(self, actual: list, predicted: list) -> dict:
+        '''Calculate the Mean Absolute Error, Root Mean Squared Error and Mean Absolute Percentage Error of predictions.'''
+        actual, predicted = np.array(actual), np.array(predicted)
+        error: np.ndarray = actual - predicted
+
+        return {
+            'mae': float(np.mean(np.abs(error))),
+            'rmse': float(np.sqrt(np.mean(error ** 2))),
+            'mape': float(np.mean(np.abs(error / actual)) * 100)
+        }
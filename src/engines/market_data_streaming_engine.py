@@ -0,0 +1,113 @@
+from data.binance_data_access import BinanceDataAccess
+from data.kline_stream_data_access import KlineStreamDataAccess, KLINE_STREAM_RECONNECTED_EVENT, get_kline_from_event
+from data.metrics_data_access import metrics_data_access
+import logging
+import threading
+import time
+
+
+class MarketDataStreamingEngine():
+    '''Consumes live kline updates of actively queried pair/period combinations in the background, keeping their market data window in memory and persisting closed candles to cache, so that requests never wait on the exchange.'''
+    def __init__(self,
+                 stream_data_access: KlineStreamDataAccess,
+                 binance_data_access: BinanceDataAccess,
+                 idle_expiry_in_seconds: float = 24 * 60 * 60,
+                 is_enabled: bool = True):
+        if is_enabled and stream_data_access is None:
+            raise Exception('Valid stream_data_access is required.')
+
+        if binance_data_access is None:
+            raise Exception('Valid binance_data_access is required.')
+
+        self.stream_data_access = stream_data_access
+        self.binance_data_access = binance_data_access
+        self.idle_expiry_in_seconds = idle_expiry_in_seconds
+        self.is_enabled = is_enabled
+        self.__subscriptions__ = {}
+        self.__lock__ = threading.Lock()
+        self.__stop_event__ = threading.Event()
+        self.__thread__ = None
+
+    def get_active_keys(self) -> list:
+        '''Get all (pair_name, period) combinations that are currently streamed.'''
+        with self.__lock__:
+            return list(self.__subscriptions__.keys())
+
+    def register(self, pair_name: str, period: str):
+        '''Mark a pair/period combination as actively queried so that it is streamed into memory from its next fetch onwards.'''
+        if not self.is_enabled:
+            return
+
+        key: tuple = (pair_name, period)
+
+        with self.__lock__:
+            if key in self.__subscriptions__:
+                self.__subscriptions__[key] = time.time()
+
+                return
+
+        if not self.binance_data_access.track_live_klines(pair_name, period):
+            return
+
+        with self.__lock__:
+            self.__subscriptions__[key] = time.time()
+
+        logging.info('Streaming live klines for "%s" (%s).', pair_name, period)
+        self.stream_data_access.subscribe(pair_name, period)
+        self.start()
+
+    def start(self):
+        '''Start the background consuming thread, should it not already be running.'''
+        with self.__lock__:
+            if self.__thread__ is not None and self.__thread__.is_alive():
+                return
+
+            self.__stop_event__.clear()
+            self.__thread__ = threading.Thread(target=self.__run__, name='market-data-streaming', daemon=True)
+            self.__thread__.start()
+
+    def stop(self):
+        '''Stop the background consuming thread and release the stream.'''
+        self.__stop_event__.set()
+
+        if self.stream_data_access is not None:
+            self.stream_data_access.close()
+
+    def handle_events(self, events: list):
+        '''Apply stream events to the in-memory windows and cache.'''
+        for event in events:
+            if event.get('e') == KLINE_STREAM_RECONNECTED_EVENT['e']:
+                # Updates may have been missed while disconnected, so every window is seeded afresh by its next fetch.
+                self.binance_data_access.reset_live_klines()
+
+                continue
+
+            if event.get('e') != 'kline':
+                continue
+
+            pair_name, period, kline, is_closed = get_kline_from_event(event)
+
+            try:
+                self.binance_data_access.ingest_live_klines(pair_name, period, [kline], is_closed)
+                metrics_data_access.increment('bifrost_stream_events_total', {'closed': str(is_closed).lower()})
+            except Exception:
+                logging.exception('Failed to ingest a live kline for "%s" (%s).', pair_name, period)
+
+    def __expire_idle_keys__(self, now: float):
+        '''Stop streaming combinations that were not queried within the idle expiry.'''
+        with self.__lock__:
+            idle_keys: list = [k for k, last_queried_at in self.__subscriptions__.items() if now - last_queried_at > self.idle_expiry_in_seconds]
+
+            for key in idle_keys:
+                del self.__subscriptions__[key]
+
+        for pair_name, period in idle_keys:
+            logging.info('Stopped streaming idle "%s" (%s).', pair_name, period)
+            self.stream_data_access.unsubscribe(pair_name, period)
+            self.binance_data_access.untrack_live_klines(pair_name, period)
+
+    def __run__(self):
+        '''Consume stream events until stopped.'''
+        while not self.__stop_event__.is_set():
+            self.handle_events(self.stream_data_access.get_events(timeout_in_seconds=1))
+            self.__expire_idle_keys__(time.time())
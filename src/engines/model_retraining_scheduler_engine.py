@@ -0,0 +1,116 @@
+from enums.intervals import KLINE_INTERVAL_ALIGNMENT_OFFSETS_IN_MS, KLINE_INTERVAL_DURATIONS_IN_MS
+import logging
+import threading
+import time
+
+
+class ModelRetrainingSchedulerEngine():
+    '''Retrains the models of actively queried pair/period combinations in the background shortly after each of their candles close.'''
+    def __init__(self,
+                 retrain_model,
+                 delay_after_candle_close_in_seconds: float = 30,
+                 idle_expiry_in_seconds: float = 24 * 60 * 60,
+                 max_model_age_in_seconds: float = 6 * 60 * 60,
+                 is_enabled: bool = True):
+        '''Initialize the scheduler with a retrain_model(pair_name, period) callable that fetches fresh market data and swaps in a newly trained model.'''
+        if retrain_model is None:
+            raise Exception('Valid retrain_model is required.')
+
+        self.retrain_model = retrain_model
+        self.delay_after_candle_close_in_seconds = delay_after_candle_close_in_seconds
+        self.idle_expiry_in_seconds = idle_expiry_in_seconds
+        self.max_model_age_in_seconds = max_model_age_in_seconds
+        self.is_enabled = is_enabled
+        self.__schedule__ = {}
+        self.__lock__ = threading.Lock()
+        self.__wake_event__ = threading.Event()
+        self.__stop_event__ = threading.Event()
+        self.__thread__ = None
+
+    def get_next_due_time(self, period: str, now: float) -> float:
+        '''Get the time, in seconds since the epoch, at which the model for a period should next be retrained.'''
+        interval_in_ms: int = KLINE_INTERVAL_DURATIONS_IN_MS.get(period)
+        max_age_due_time: float = now + self.max_model_age_in_seconds
+
+        if interval_in_ms is None:
+            return max_age_due_time
+
+        offset_in_ms: int = KLINE_INTERVAL_ALIGNMENT_OFFSETS_IN_MS.get(period, 0)
+        next_candle_close_in_ms: int = ((int(now * 1000) - offset_in_ms) // interval_in_ms + 1) * interval_in_ms + offset_in_ms
+
+        return min(next_candle_close_in_ms / 1000 + self.delay_after_candle_close_in_seconds, max_age_due_time)
+
+    def get_active_keys(self) -> list:
+        '''Get all (pair_name, period) combinations that are currently scheduled.'''
+        with self.__lock__:
+            return list(self.__schedule__.keys())
+
+    def register(self, pair_name: str, period: str):
+        '''Mark a pair/period combination as actively queried so that its model is kept warm.'''
+        if not self.is_enabled:
+            return
+
+        key: tuple = (pair_name, period)
+        now: float = time.time()
+
+        with self.__lock__:
+            entry: dict = self.__schedule__.get(key)
+
+            if entry is not None:
+                entry['last_queried_at'] = now
+
+                return
+
+            self.__schedule__[key] = {'last_queried_at': now, 'due_at': self.get_next_due_time(period, now)}
+
+        logging.info('Scheduled background retraining for "%s" (%s).', pair_name, period)
+        self.start()
+        self.__wake_event__.set()
+
+    def start(self):
+        '''Start the background scheduling thread, should it not already be running.'''
+        with self.__lock__:
+            if self.__thread__ is not None and self.__thread__.is_alive():
+                return
+
+            self.__stop_event__.clear()
+            self.__thread__ = threading.Thread(target=self.__run__, name='model-retraining-scheduler', daemon=True)
+            self.__thread__.start()
+
+    def stop(self):
+        '''Stop the background scheduling thread after any retraining in progress.'''
+        self.__stop_event__.set()
+        self.__wake_event__.set()
+
+    def __pop_due_keys__(self, now: float) -> tuple:
+        '''Drop idle combinations and get the ones that are due along with the next due time of the remainder.'''
+        with self.__lock__:
+            for key in [k for k, v in self.__schedule__.items() if now - v['last_queried_at'] > self.idle_expiry_in_seconds]:
+                logging.info('Stopped background retraining for idle "%s" (%s).', *key)
+                del self.__schedule__[key]
+
+            due_keys: list = [k for k, v in self.__schedule__.items() if v['due_at'] <= now]
+            next_due_at: float = min([v['due_at'] for k, v in self.__schedule__.items() if k not in due_keys], default=None)
+
+        return due_keys, next_due_at
+
+    def __run__(self):
+        '''Retrain due models until stopped, sleeping until the next candle close in between.'''
+        while not self.__stop_event__.is_set():
+            self.__wake_event__.clear()
+            due_keys, next_due_at = self.__pop_due_keys__(time.time())
+
+            for pair_name, period in due_keys:
+                try:
+                    self.retrain_model(pair_name, period)
+                except Exception:
+                    logging.exception('Background retraining failed for "%s" (%s).', pair_name, period)
+
+                with self.__lock__:
+                    if (pair_name, period) in self.__schedule__:
+                        self.__schedule__[(pair_name, period)]['due_at'] = self.get_next_due_time(period, time.time())
+
+            if len(due_keys) > 0:
+                continue
+
+            self.__wake_event__.wait(timeout=None if next_due_at is None else max(0, next_due_at - time.time()))
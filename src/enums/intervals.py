@@ -13,3 +13,26 @@ KLINE_INTERVAL_1DAY = '1d'
 KLINE_INTERVAL_3DAY = '3d'
 KLINE_INTERVAL_1WEEK = '1w'
 KLINE_INTERVAL_1MONTH = '1M'
+
+# Fixed kline interval lengths. Months vary in length and are therefore excluded.
+KLINE_INTERVAL_DURATIONS_IN_MS = {
+    KLINE_INTERVAL_1MINUTE: 60 * 1000,
+    KLINE_INTERVAL_3MINUTE: 3 * 60 * 1000,
+    KLINE_INTERVAL_5MINUTE: 5 * 60 * 1000,
+    KLINE_INTERVAL_15MINUTE: 15 * 60 * 1000,
+    KLINE_INTERVAL_30MINUTE: 30 * 60 * 1000,
+    KLINE_INTERVAL_1HOUR: 60 * 60 * 1000,
+    KLINE_INTERVAL_2HOUR: 2 * 60 * 60 * 1000,
+    KLINE_INTERVAL_4HOUR: 4 * 60 * 60 * 1000,
+    KLINE_INTERVAL_6HOUR: 6 * 60 * 60 * 1000,
+    KLINE_INTERVAL_8HOUR: 8 * 60 * 60 * 1000,
+    KLINE_INTERVAL_12HOUR: 12 * 60 * 60 * 1000,
+    KLINE_INTERVAL_1DAY: 24 * 60 * 60 * 1000,
+    KLINE_INTERVAL_3DAY: 3 * 24 * 60 * 60 * 1000,
+    KLINE_INTERVAL_1WEEK: 7 * 24 * 60 * 60 * 1000
+}
+
+# Offsets of the kline interval starts from the epoch. Weekly klines start on Mondays, while the epoch fell on a Thursday.
+KLINE_INTERVAL_ALIGNMENT_OFFSETS_IN_MS = {
+    KLINE_INTERVAL_1WEEK: 4 * 24 * 60 * 60 * 1000
+}
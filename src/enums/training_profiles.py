@@ -0,0 +1,29 @@
+TRAINING_PROFILE_FAST = 'fast'
+TRAINING_PROFILE_BALANCED = 'balanced'
+TRAINING_PROFILE_ACCURATE = 'accurate'
+
+# Boosting stops once the testing split has not improved for early_stopping_rounds rounds, or at max_boost_rounds.
+# thread_count is the explicit share of the CPU cores a single training may use, so that concurrent trainings do not oversubscribe them.
+TRAINING_PROFILES = {
+    TRAINING_PROFILE_FAST: {
+        'max_boost_rounds': 300,
+        'early_stopping_rounds': 10,
+        'tree_method': 'hist',
+        'max_bin': 64,
+        'thread_count': 1
+    },
+    TRAINING_PROFILE_BALANCED: {
+        'max_boost_rounds': 1000,
+        'early_stopping_rounds': 25,
+        'tree_method': 'hist',
+        'max_bin': 256,
+        'thread_count': 2
+    },
+    TRAINING_PROFILE_ACCURATE: {
+        'max_boost_rounds': 3000,
+        'early_stopping_rounds': 100,
+        'tree_method': 'hist',
+        'max_bin': 512,
+        'thread_count': 4
+    }
+}
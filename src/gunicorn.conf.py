@@ -0,0 +1,19 @@
+# Production serving configuration. Run with `gunicorn --config gunicorn.conf.py main:app` from the src directory.
+from configuration import HOST_IP_RANGE, HOST_PORT, HOST_WORKER_COUNT, HOST_THREADS_PER_WORKER
+
+bind = f'{HOST_IP_RANGE}:{HOST_PORT}'
+workers = HOST_WORKER_COUNT
+worker_class = 'gthread'
+threads = HOST_THREADS_PER_WORKER
+# Load the application once before forking so that workers share its memory pages copy-on-write. Background threads
+# and connection pools are only started lazily, within each worker.
+preload_app = True
+# Training a model on a cold pair can take well over the default 30 seconds.
+timeout = 600
+
+
+def post_worker_init(worker):
+    '''Prewarm the configured pairs in the background of every worker, as each keeps its own in-memory caches.'''
+    from managers.binance import cache_prewarming_engine
+
+    cache_prewarming_engine.start()
@@ -1,7 +1,11 @@
 from configuration import HOST_IP_RANGE, HOST_PORT, APP_NAME, APP_DESCRIPTION, APP_VERSION
 import flask
+import time
 from flask_restx import Api
-from managers.binance import api as binance_namespace
+from data.metrics_data_access import metrics_data_access
+from managers.binance import api as binance_namespace, cache_prewarming_engine
+from managers.health import api as health_namespace
+from managers.metrics import api as metrics_namespace
 
 # Bootstrap the application skeleton.
 app = flask.Flask(__name__)
@@ -16,6 +20,28 @@ api = Api(
 
 # Register modules.
 api.add_namespace(binance_namespace)
+api.add_namespace(metrics_namespace)
+api.add_namespace(health_namespace)
 
-# Run the web host.
-app.run(host=HOST_IP_RANGE, port=HOST_PORT)
+
+# Record request throughput and latency per route template, which keeps the label set bounded.
+@app.before_request
+def start_request_timer():
+    flask.g.request_started_at = time.perf_counter()
+
+
+@app.after_request
+def record_request_metrics(response: flask.Response) -> flask.Response:
+    route: str = flask.request.url_rule.rule if flask.request.url_rule is not None else 'unmatched'
+    metrics_data_access.increment('bifrost_http_requests_total', {'route': route, 'status': response.status_code})
+
+    if 'request_started_at' in flask.g:
+        metrics_data_access.observe('bifrost_http_request_duration_seconds', time.perf_counter() - flask.g.request_started_at, {'route': route})
+
+    return response
+
+
+# Run the web host. Guarded so that spawned worker processes importing this module do not start their own host.
+if __name__ == '__main__':
+    cache_prewarming_engine.start()
+    app.run(host=HOST_IP_RANGE, port=HOST_PORT)
@@ -1,27 +1,128 @@
-from configuration import APP_ROUTE_PREFIX, MODEL_BULK_INFERENCE_CACHE_IN_SECONDS
+from configuration import APP_ROUTE_PREFIX, MODEL_BULK_INFERENCE_CACHE_IN_SECONDS, MODEL_BULK_INFERENCE_CACHE_MAX_SIZE_IN_BYTES, MODEL_CACHE_IN_SECONDS
+from configuration import BATCH_MODEL_WORKER_COUNT
+from configuration import MODEL_RETRAINING_ENABLED, MODEL_RETRAINING_DELAY_AFTER_CANDLE_CLOSE_IN_SECONDS, MODEL_RETRAINING_IDLE_EXPIRY_IN_SECONDS
+from configuration import MARKET_DATA_STREAMING_ENABLED, MARKET_DATA_STREAMING_IDLE_EXPIRY_IN_SECONDS
+from configuration import PREWARM_PAIRS
 from data.binance_data_access import BinanceDataAccess
 from data.fs_cache_data_access import FsCacheDataAccess
+from data.kline_ring_buffer_data_access import KlineRingBufferDataAccess
+from data.kline_stream_data_access import KlineStreamDataAccess, BinanceKlineStreamDataAccess
 from data.memory_cache_data_access import MemoryCacheDataAccess
-from engines.bifrost_gradient_booster_engine import BifrostGradientBoosterEngine
+from data.metrics_data_access import MetricsDataAccess, metrics_data_access
+from data.model_registry_data_access import ModelRegistryDataAccess
 from engines.market_data_forecasting_engine import MarketDataForecastingEngine
+from engines.model_retraining_scheduler_engine import ModelRetrainingSchedulerEngine
+from engines.market_data_streaming_engine import MarketDataStreamingEngine
+from engines.cache_prewarming_engine import CachePrewarmingEngine
+from enums.training_profiles import TRAINING_PROFILES
 from models.binance import NextReponse, BulkRequest, BulkReponse, get_next_response, get_bulk_response, ForecastRequest
+from models.binance import BatchRequest, BatchReponse, get_batch_request, get_batch_response
 from flask_restx import Namespace, Resource
-from datetime import datetime
+from flask import Response, stream_with_context
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
 from dateutil import parser as date_parser
 from flask_restx import reqparse
 from data.config_data_access import ConfigDataAccess
 import pandas as pd
 import numpy as np
+import json
 
-bulk_inference_cache = MemoryCacheDataAccess(cache_max_age_in_seconds=MODEL_BULK_INFERENCE_CACHE_IN_SECONDS)
+bulk_inference_cache = MemoryCacheDataAccess(cache_max_age_in_seconds=MODEL_BULK_INFERENCE_CACHE_IN_SECONDS, max_allowed_bytes=MODEL_BULK_INFERENCE_CACHE_MAX_SIZE_IN_BYTES)
 config_data_access = ConfigDataAccess()
 cache_data_access = FsCacheDataAccess(config_data_access)
-data_access = BinanceDataAccess(config_data_access, cache_data_access=cache_data_access)
-market_data_forecasting_engine = MarketDataForecastingEngine()
-now = f'{datetime.utcnow()}'.replace(' ', 'T')
+data_access = BinanceDataAccess(config_data_access, cache_data_access=cache_data_access, kline_buffer_data_access=KlineRingBufferDataAccess() if MARKET_DATA_STREAMING_ENABLED else None)
+model_registry_data_access = ModelRegistryDataAccess(config_data_access)
+market_data_forecasting_engine = MarketDataForecastingEngine(model_registry_data_access=model_registry_data_access)
+batch_fetch_executor = ThreadPoolExecutor(max_workers=config_data_access.binance_max_concurrent_requests, thread_name_prefix='batch-fetch')
+batch_model_executor = ThreadPoolExecutor(max_workers=BATCH_MODEL_WORKER_COUNT, thread_name_prefix='batch-model')
+
+
+def collect_cache_metrics(metrics: MetricsDataAccess):
+    '''Refresh the cache gauges from the in-memory model, featurized matrix, bulk inference and market data window caches.'''
+    for cache_name, statistics in (('model', market_data_forecasting_engine.get_model_cache_statistics()),
+                                   ('feature_matrix', market_data_forecasting_engine.get_feature_matrix_cache_statistics()),
+                                   ('bulk_inference', bulk_inference_cache.get_statistics()),
+                                   ('market_data', data_access.get_hot_window_statistics())):
+        lookups: int = statistics['hits'] + statistics['misses']
+
+        for statistic_name, value in statistics.items():
+            metrics.set_gauge(f'bifrost_cache_{statistic_name}', value, {'cache': cache_name})
+
+        metrics.set_gauge('bifrost_cache_hit_ratio', statistics['hits'] / lookups if lookups > 0 else 0.0, {'cache': cache_name})
+
+
+metrics_data_access.register_collector(collect_cache_metrics)
+
+
+def create_kline_stream_data_access() -> KlineStreamDataAccess:
+    '''Create the configured live kline feed, should streaming be enabled.'''
+    if not MARKET_DATA_STREAMING_ENABLED:
+        return None
+
+    return BinanceKlineStreamDataAccess(config_data_access.binance_stream_url)
+
+
+market_data_streaming_engine = MarketDataStreamingEngine(stream_data_access=create_kline_stream_data_access(),
+                                                         binance_data_access=data_access,
+                                                         idle_expiry_in_seconds=MARKET_DATA_STREAMING_IDLE_EXPIRY_IN_SECONDS,
+                                                         is_enabled=MARKET_DATA_STREAMING_ENABLED)
+
+
+def retrain_model(pair_name: str, period: str):
+    '''Fetch the latest market data for a pair and swap in a freshly trained model.'''
+    market_data: pd.DataFrame = data_access.get_market_data(ForecastRequest(pair_name, period, datetime.utcnow()))
+
+    if market_data is not None:
+        market_data_forecasting_engine.train_model(market_data, period, pair_name)
+
+
+model_retraining_scheduler_engine = ModelRetrainingSchedulerEngine(retrain_model=retrain_model,
+                                                                   delay_after_candle_close_in_seconds=MODEL_RETRAINING_DELAY_AFTER_CANDLE_CLOSE_IN_SECONDS,
+                                                                   idle_expiry_in_seconds=MODEL_RETRAINING_IDLE_EXPIRY_IN_SECONDS,
+                                                                   max_model_age_in_seconds=MODEL_CACHE_IN_SECONDS / 2,
+                                                                   is_enabled=MODEL_RETRAINING_ENABLED)
+
+
+def prewarm(pair_name: str, period: str):
+    '''Load the market data window of a pair from cache, catching up with the exchange where needed, and restore its persisted model should there be one.'''
+    market_data: pd.DataFrame = data_access.get_market_data(ForecastRequest(pair_name, period, datetime.utcnow()))
+
+    if market_data is not None:
+        market_data_forecasting_engine.restore_model(market_data, period, pair_name)
+
+
+# Started by each serving process once it is up, see gunicorn.conf.py and main.py.
+cache_prewarming_engine = CachePrewarmingEngine(prewarm=prewarm, keys=PREWARM_PAIRS)
 api = Namespace(f'{APP_ROUTE_PREFIX}/binance', description='A collection of use-cases for Binance market data.')
 next_response_model = get_next_response(api)
 bulk_response_model = get_bulk_response(api)
+batch_request_model = get_batch_request(api)
+batch_response_model = get_batch_response(api)
+
+
+def predict_next_candle(request: ForecastRequest, pair_name: str, period: str, market_data: pd.DataFrame, training_profile: str = None) -> NextReponse:
+    '''Predict the candle following the cutoff time of a request from its already fetched market data.'''
+    cutoff_date: str = f'{request.cutoff_time_utc.year}-{request.cutoff_time_utc.month}-{request.cutoff_time_utc.day}'
+    market_data.index = market_data.time
+    market_data = market_data.loc[:cutoff_date]
+    prior_candle_close, prior_candle_time, predicted_close, predicted_candle_time = market_data_forecasting_engine.get_next_candle_close_prediction(market_data, period, pair_name, training_profile=training_profile)
+    delta_percentage: float = (predicted_close - prior_candle_close) / ((predicted_close + prior_candle_close) / 2)
+
+    return NextReponse(pair_name=pair_name,
+                       prior_candle_close=prior_candle_close,
+                       prior_candle_time=prior_candle_time,
+                       predicted_close=predicted_close,
+                       predicted_candle_time=predicted_candle_time,
+                       delta_percentage=delta_percentage)
+
+
+def get_training_profile_argument() -> str:
+    '''Get the training profile selected by the query string of the current request, should one be.'''
+    parser = reqparse.RequestParser()
+    parser.add_argument('training_profile', type=str, default=None, choices=list(TRAINING_PROFILES.keys()))
+
+    return parser.parse_args()['training_profile']
 
 
 @api.route('/pair/<string:pair_name>/period/<string:period>/next')
@@ -29,38 +130,30 @@ class BinanceNextPredictionManager(Resource):
     @api.doc('Spot Pair Forecast', params={
         'pair_name': {'description': 'The pair name that matches that of the Binance exchange for which to forecast. This value is case-insensitive and the underscore is optional.', 'default': 'DOGEBTC'},
         'period': {'description': 'The window period for the candlestick lengths. Currently only 1h is supported.', 'default': '1h'},
-        'cutoff_time_utc': {'in': 'query', 'description': 'The max cutoff time for market data to use. This allows for excluding future data when performing tasks like back-testing.', 'default': f'{now}'}
+        'cutoff_time_utc': {'in': 'query', 'description': 'The max cutoff time for market data to use. This allows for excluding future data when performing tasks like back-testing. Defaults to now.'},
+        'training_profile': {'in': 'query', 'description': 'The fast, balanced or accurate training profile to train the model of the pair with from now on. Defaults to the profile configured for the pair.', 'enum': list(TRAINING_PROFILES.keys())}
     })
     @api.marshal_with(next_response_model)
     def get(self, pair_name: str, period: str) -> NextReponse:
         '''Gets the next candle price on a specific pair for the Binance exchange, given a specific cut-off time.'''
         request: ForecastRequest = self.__get_parsed_request(pair_name, period)
+        market_data_streaming_engine.register(request.pair_name, period)
         market_data: pd.DataFrame = data_access.get_market_data(request)
-        cutoff_date: str = f'{request.cutoff_time_utc.year}-{request.cutoff_time_utc.month}-{request.cutoff_time_utc.day}'
-        market_data.index = market_data.time
-        market_data = market_data.loc[:cutoff_date]
-        prior_candle_close, prior_candle_time, predicted_close, predicted_candle_time = market_data_forecasting_engine.get_next_candle_close_prediction(market_data, period, pair_name)
-        delta_percentage: float = self.__calculate_percentage_difference__(predicted_close, prior_candle_close)
-        response = NextReponse(pair_name=pair_name,
-                               prior_candle_close=prior_candle_close,
-                               prior_candle_time=prior_candle_time,
-                               predicted_close=predicted_close,
-                               predicted_candle_time=predicted_candle_time,
-                               delta_percentage=delta_percentage)
+        response: NextReponse = predict_next_candle(request, pair_name, period, market_data, training_profile=get_training_profile_argument())
+        # Only pairs that could be predicted are kept warm, so that unknown pairs are not retrained in the background.
+        model_retraining_scheduler_engine.register(pair_name, period)
 
         return response, 200
 
-    def __calculate_percentage_difference__(self, x: float, y: float) -> float:
-        return (x - y) / ((x + y) / 2)
-
     def __get_parsed_request(self, pair_name: str, period: str) -> ForecastRequest:
         parser = reqparse.RequestParser()
-        parser.add_argument('cutoff_time_utc', type=str, default=now)
+        parser.add_argument('cutoff_time_utc', type=str, default=None)
         args = parser.parse_args()
 
         cutoff_time_utc = args['cutoff_time_utc']
 
-        return ForecastRequest(pair_name, period, date_parser.parse(cutoff_time_utc))
+        # Resolved per request, as a serving process outlives many candles.
+        return ForecastRequest(pair_name, period, datetime.utcnow() if cutoff_time_utc is None else date_parser.parse(cutoff_time_utc))
 
 
 @api.route('/pair/<string:pair_name>/period/<string:period>/bulk/<int:count_including_latest>')
@@ -68,42 +161,37 @@ class BinanceBulkPredictionManager(Resource):
     @api.doc('Spot Pair Bulk Forecast', params={
         'pair_name': {'description': 'The pair name that matches that of the Binance exchange for which to forecast. This value is case-insensitive and the underscore is optional.', 'default': 'DOGEBTC'},
         'period': {'description': 'The window period for the candlestick lengths. Currently only 1h is supported.', 'default': '1h'},
-        'count_including_latest': {'description': 'The count of days to make predictions from and up to the latest candle inclusively.', 'default': '45'}
+        'count_including_latest': {'description': 'The count of days to make predictions from and up to the latest candle inclusively.', 'default': '45'},
+        'training_profile': {'in': 'query', 'description': 'The fast, balanced or accurate training profile to train the model of the pair with from now on. Defaults to the profile configured for the pair.', 'enum': list(TRAINING_PROFILES.keys())}
     })
     @api.marshal_with(bulk_response_model)
     def get(self, pair_name: str, period: str, count_including_latest: int) -> BulkReponse:
         '''Gets the next candle prices for the last X records from the latest candle inclusively.'''
         request = self.__get_parsed_request(pair_name, period, count_including_latest)
-        model_key: str = f'{pair_name}-{period}-{count_including_latest}'
+        market_data_streaming_engine.register(request.pair_name, period)
+        training_profile: str = market_data_forecasting_engine.get_training_profile(period, pair_name, get_training_profile_argument())
+        model_key: str = f'{pair_name}-{period}-{count_including_latest}-{training_profile}'
         response: BulkReponse = bulk_inference_cache.get_from_cache(model_key)
 
         if response is not None:
+            model_retraining_scheduler_engine.register(pair_name, period)
+
             return response
 
         market_data: pd.DataFrame = data_access.get_market_data(request)
         prior_candle_time_delta: np.timedelta64 = np.timedelta64(count_including_latest, 'D')
         date_filter_criteria: str = str(market_data.time.values[-1] - prior_candle_time_delta)
         filtered_market_data: pd.DataFrame = market_data.loc[date_filter_criteria:]
-        times: list = []
-        actual_closing_prices: list() = []
-        predicted_closing_prices: list = []
-        detla_percentages: list = []
-        trained_model: BifrostGradientBoosterEngine = market_data_forecasting_engine.get_trained_model(market_data, period, pair_name)
-
-        for index, row in filtered_market_data.iterrows():
-            time = row['time']
-            actual_close = row['close']
-            cutoff_date = str(time)
-            market_data = market_data.loc[:cutoff_date]
-            predicted_close = trained_model.predict(future_data=filtered_market_data.loc[str(index):].head(1)).values[0]
-            times.append(cutoff_date)
-            actual_closing_prices.append(actual_close)
-            predicted_closing_prices.append(predicted_close)
-            detla_percentages.append(self.__calculate_percentage_difference__(actual_close, predicted_close))
-
-        response: BulkReponse = BulkReponse(pair_name, times, actual_closing_prices, predicted_closing_prices, detla_percentages)
+        # Predict the whole window in a single batch, featurizing only the candles that closed since the previous request.
+        predicted_closing_prices: np.ndarray = market_data_forecasting_engine.get_close_predictions(market_data, period, pair_name, start_time=filtered_market_data.time.values[0], training_profile=training_profile).values
+        actual_closing_prices: np.ndarray = filtered_market_data.close.values
+        detla_percentages: np.ndarray = self.__calculate_percentage_difference__(actual_closing_prices, predicted_closing_prices)
+        times: list = [str(time) for time in filtered_market_data.time]
+
+        response: BulkReponse = BulkReponse(pair_name, times, actual_closing_prices.tolist(), predicted_closing_prices.tolist(), detla_percentages.tolist())
 
         bulk_inference_cache.write_to_cache(model_key, response)
+        model_retraining_scheduler_engine.register(pair_name, period)
 
         return response, 200
 
@@ -112,3 +200,78 @@ class BinanceBulkPredictionManager(Resource):
 
     def __get_parsed_request(self, pair_name: str, period: str, count_including_latest: int) -> BulkReponse:
         return BulkRequest(pair_name, period, count_including_latest)
+
+
+@api.route('/pair/<string:pair_name>/period/<string:period>/backtest')
+class BinanceBacktestManager(Resource):
+    @api.doc('Spot Pair Walk-Forward Backtest', params={
+        'pair_name': {'description': 'The pair name that matches that of the Binance exchange for which to backtest. This value is case-insensitive and the underscore is optional.', 'default': 'DOGEBTC'},
+        'period': {'description': 'The window period for the candlestick lengths.', 'default': '1h'},
+        'start_time_utc': {'in': 'query', 'description': 'The time of the first candle to predict. Defaults to 7 days ago.'},
+        'end_time_utc': {'in': 'query', 'description': 'The time of the last candle to predict. Defaults to now.'},
+        'retrain_stride': {'in': 'query', 'description': 'The count of candles to predict with each model before retraining on all data up to that point.', 'default': '24'},
+        'training_profile': {'in': 'query', 'description': 'The fast, balanced or accurate training profile to train each fold with. Defaults to the configured profile.', 'enum': list(TRAINING_PROFILES.keys())}
+    })
+    def get(self, pair_name: str, period: str) -> Response:
+        '''Streams walk-forward backtest predictions as newline-delimited JSON, one line per completed fold followed by a line of aggregate error metrics.'''
+        parser = reqparse.RequestParser()
+        parser.add_argument('start_time_utc', type=str, default=None)
+        parser.add_argument('end_time_utc', type=str, default=None)
+        parser.add_argument('retrain_stride', type=int, default=24)
+        parser.add_argument('training_profile', type=str, default=None, choices=list(TRAINING_PROFILES.keys()))
+        args = parser.parse_args()
+        end_time_utc: datetime = datetime.utcnow() if args['end_time_utc'] is None else date_parser.parse(args['end_time_utc'])
+        start_time_utc: datetime = end_time_utc - timedelta(days=7) if args['start_time_utc'] is None else date_parser.parse(args['start_time_utc'])
+        market_data: pd.DataFrame = data_access.get_market_data(ForecastRequest(pair_name, period, end_time_utc))
+
+        if market_data is None:
+            raise Exception(f'No market data is available for "{pair_name}" ({period}).')
+
+        # Validated before the response starts, so that invalid requests fail with an error status rather than a broken stream.
+        results = market_data_forecasting_engine.backtest(market_data, start_time_utc, end_time_utc, args['retrain_stride'], training_profile=args['training_profile'])
+
+        return Response(stream_with_context(f'{json.dumps(result)}\n' for result in results), mimetype='application/x-ndjson')
+
+
+@api.route('/batch')
+class BinanceBatchPredictionManager(Resource):
+    @api.doc('Spot Pair Batch Forecast')
+    @api.expect(batch_request_model, validate=True)
+    @api.marshal_with(batch_response_model)
+    def post(self) -> BatchReponse:
+        '''Gets the next candle prices for many pair and period combinations at once. Market data is fetched concurrently and models are reused or trained in a worker pool, with failures reported per forecast.'''
+        request: BatchRequest = self.__get_parsed_request()
+        fetches: list = []
+
+        for pair_name, period, training_profile in request.forecasts:
+            forecast_request: ForecastRequest = ForecastRequest(pair_name, period, request.cutoff_time_utc)
+            market_data_streaming_engine.register(forecast_request.pair_name, period)
+            fetches.append((pair_name, period, training_profile, forecast_request, batch_fetch_executor.submit(data_access.get_market_data, forecast_request)))
+
+        predictions: list = [(pair_name, period, batch_model_executor.submit(self.__predict__, forecast_request, pair_name, period, fetch, training_profile)) for pair_name, period, training_profile, forecast_request, fetch in fetches]
+        forecasts: list = []
+
+        for pair_name, period, prediction in predictions:
+            try:
+                forecasts.append({**vars(prediction.result()), 'period': period})
+            except Exception as e:
+                forecasts.append({'pair_name': pair_name, 'period': period, 'error': str(e)})
+
+        return BatchReponse(forecasts), 200
+
+    def __predict__(self, request: ForecastRequest, pair_name: str, period: str, fetch, training_profile: str = None) -> NextReponse:
+        market_data: pd.DataFrame = fetch.result()
+
+        if market_data is None:
+            raise Exception(f'No market data is available for "{pair_name}" ({period}).')
+
+        response: NextReponse = predict_next_candle(request, pair_name, period, market_data, training_profile=training_profile)
+        model_retraining_scheduler_engine.register(pair_name, period)
+
+        return response
+
+    def __get_parsed_request(self) -> BatchRequest:
+        cutoff_time_utc: str = api.payload.get('cutoff_time_utc')
+
+        # Resolved per request, as a serving process outlives many candles.
+        return BatchRequest(api.payload['forecasts'], datetime.utcnow() if not cutoff_time_utc else date_parser.parse(cutoff_time_utc))
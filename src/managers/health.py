@@ -0,0 +1,22 @@
+from managers.binance import cache_prewarming_engine
+from flask_restx import Namespace, Resource
+
+api = Namespace('health', path='/health', description='Liveness and readiness probes for orchestrators and load balancers.')
+
+
+@api.route('')
+class HealthManager(Resource):
+    @api.doc('Liveness')
+    def get(self) -> tuple:
+        '''Gets whether the process is serving requests, along with the progress of prewarming its configured pairs.'''
+        return {'status': 'ok', 'prewarming': cache_prewarming_engine.get_status()}, 200
+
+
+@api.route('/ready')
+class ReadinessManager(Resource):
+    @api.doc('Readiness')
+    def get(self) -> tuple:
+        '''Gets whether all configured pairs have been prewarmed, responding with 503 until they are.'''
+        status: dict = cache_prewarming_engine.get_status()
+
+        return {'status': 'ready' if status['is_complete'] else 'warming', 'prewarming': status}, 200 if status['is_complete'] else 503
@@ -0,0 +1,13 @@
+from data.metrics_data_access import metrics_data_access
+from flask_restx import Namespace, Resource
+from flask import Response
+
+api = Namespace('metrics', path='/metrics', description='Operational metrics in the Prometheus text exposition format.')
+
+
+@api.route('')
+class MetricsManager(Resource):
+    @api.doc('Prometheus Metrics')
+    def get(self) -> Response:
+        '''Gets the per-stage latency histograms, request and training throughput counters and cache statistics of this process.'''
+        return Response(metrics_data_access.render(), mimetype='text/plain; version=0.0.4')
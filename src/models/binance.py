@@ -1,6 +1,7 @@
 # For different field types, see https://flask-restx.readthedocs.io/en/latest/_modules/flask_restx/fields.html. Float is everything we need for now.
 from datetime import datetime
 from flask_restx import fields
+from enums.training_profiles import TRAINING_PROFILES
 
 
 def get_next_response(api):
@@ -31,6 +32,38 @@ def get_bulk_response(api):
     return bulk_model
 
 
+def get_batch_request(api):
+    forecast_model = api.model('BatchForecast', {
+        'pair_name': fields.String(required=True, description='The pair name that matches that of the Binance exchange for which to forecast.', example='DOGEBTC'),
+        'period': fields.String(required=True, description='The window period for the candlestick lengths.', example='1h'),
+        'training_profile': fields.String(description='The fast, balanced or accurate training profile to train the model of the pair with from now on. Defaults to the profile configured for the pair.', enum=list(TRAINING_PROFILES.keys()))
+    })
+    batch_model = api.model('BatchRequest', {
+        'forecasts': fields.List(fields.Nested(forecast_model), required=True, description='The pair and period combinations to forecast.'),
+        'cutoff_time_utc': fields.String(description='The max cutoff time for market data to use. Defaults to now.')
+    })
+
+    return batch_model
+
+
+def get_batch_response(api):
+    result_model = api.model('BatchResult', {
+        'pair_name': fields.String(description='The pair name of next value.'),
+        'period': fields.String(description='The window period for the candlestick lengths.'),
+        'prior_candle_close': fields.Float(description='The closing price of the prior/last candle to the prediction.'),
+        'prior_candle_time': fields.String(description='The opening time of the prior/last candle to the prediction.'),
+        'predicted_close': fields.Float(description='The predicted closing price of the asset for the next candle.'),
+        'predicted_candle_time': fields.String(description='The opening time for the candle that the predicted value is for.'),
+        'delta_percentage': fields.String(description='The percentage difference between each current closing price and the predicted next one.'),
+        'error': fields.String(description='The reason the forecast for this pair failed, should it have.')
+    })
+    batch_model = api.model('Batch', {
+        'forecasts': fields.List(fields.Nested(result_model))
+    })
+
+    return batch_model
+
+
 class ForecastRequest:
     def __init__(self, pair_name: str, period: str, cutoff_time_utc: datetime):
         self.pair_name = pair_name.replace('_', '').replace('-', '').replace('/', '').upper()
@@ -76,3 +109,14 @@ class BulkReponse:
             'predicted_closing_prices': predicted_closing_prices,
             'delta_percentages': delta_percentage
         }
+
+
+class BatchRequest:
+    def __init__(self, forecasts: list, cutoff_time_utc: datetime):
+        self.forecasts = [(forecast['pair_name'], forecast['period'], forecast.get('training_profile')) for forecast in forecasts]
+        self.cutoff_time_utc = cutoff_time_utc
+
+
+class BatchReponse:
+    def __init__(self, forecasts: list):
+        self.forecasts = forecasts
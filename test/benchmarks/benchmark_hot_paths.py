@@ -0,0 +1,250 @@
+'''This module benchmarks the data and model hot paths against synthetic kline histories and records the timings in a machine-readable file.
+
+Usage, from the repository root:
+    python test/benchmarks/benchmark_hot_paths.py --interval 1h --days 60 --pairs 5 --repeat 5 --output benchmark_results.json
+    python test/benchmarks/benchmark_hot_paths.py --baseline benchmark_results.json --output benchmark_results_new.json
+'''
+
+# Setup root directory to allow for importing modules from a different adjacent directory.
+import sys
+import os
+
+root_repo_path = os.getcwd()
+sys.path.append(f'{root_repo_path}/src')
+sys.path.append(f'{root_repo_path}/test/stubs')
+
+# Benchmarking
+import argparse # noqa
+import contextlib # noqa
+import io # noqa
+import json # noqa
+import logging # noqa
+import platform # noqa
+import shutil # noqa
+import statistics # noqa
+import subprocess # noqa
+import tempfile # noqa
+import time # noqa
+from datetime import datetime # noqa
+
+SUPPORTED_INTERVALS = ('1h', '1m')
+MIN_DAYS, MAX_DAYS = 7, 365
+MIN_PAIRS, MAX_PAIRS = 1, 100
+
+
+def get_arguments() -> argparse.Namespace:
+    '''Parse and validate the command line arguments.'''
+    parser = argparse.ArgumentParser(description='Benchmark the Bifröst data and model hot paths.')
+    parser.add_argument('--interval', choices=SUPPORTED_INTERVALS, default='1h', help='The kline interval of the synthetic histories.')
+    parser.add_argument('--days', type=int, default=60, help=f'The length of each synthetic history in days ({MIN_DAYS}-{MAX_DAYS}).')
+    parser.add_argument('--pairs', type=int, default=3, help=f'The count of synthetic pairs ({MIN_PAIRS}-{MAX_PAIRS}).')
+    parser.add_argument('--repeat', type=int, default=5, help='The count of timed repetitions of each benchmark.')
+    parser.add_argument('--bulk-days', type=int, default=7, help='The count of days requested from the bulk endpoint.')
+    parser.add_argument('--seed', type=int, default=0, help='The seed of the synthetic market data.')
+    parser.add_argument('--training-profile', choices=('fast', 'balanced', 'accurate'), default='balanced', help='The training profile of the engine benchmarks.')
+    parser.add_argument('--exchange-url', default=None, help='Fetch through this kline API, e.g. the stub server at http://127.0.0.1:9998/api/v3, instead of generating candles in-process.')
+    parser.add_argument('--output', default='benchmark_results.json', help='The file to write the results to.')
+    parser.add_argument('--baseline', default=None, help='A results file of a previous run to compare against.')
+    parser.add_argument('--verbose', action='store_true', help='Show the output of the benchmarked code.')
+    args = parser.parse_args()
+
+    if not MIN_DAYS <= args.days <= MAX_DAYS:
+        parser.error(f'--days must be between {MIN_DAYS} and {MAX_DAYS}.')
+
+    if not MIN_PAIRS <= args.pairs <= MAX_PAIRS:
+        parser.error(f'--pairs must be between {MIN_PAIRS} and {MAX_PAIRS}.')
+
+    if args.repeat < 1:
+        parser.error('--repeat must be at least 1.')
+
+    return args
+
+
+def get_git_commit() -> str:
+    '''Get the commit being benchmarked, should the repository be available.'''
+    try:
+        return subprocess.check_output(['git', 'rev-parse', 'HEAD'], cwd=root_repo_path, stderr=subprocess.DEVNULL).decode('utf-8').strip()
+    except Exception:
+        return None
+
+
+class BenchmarkRunner():
+    '''Times callables over a number of repetitions and collects their summary statistics.'''
+    def __init__(self, repeat: int, verbose: bool = False):
+        self.repeat = repeat
+        self.verbose = verbose
+        self.results = []
+
+    def run(self, name: str, benchmark, items: int = 1, setup=None, repeat: int = None) -> dict:
+        '''Time benchmark() for each repetition, calling setup() untimed before each, and record the durations.'''
+        durations: list = []
+
+        for _ in range(repeat or self.repeat):
+            with contextlib.redirect_stdout(sys.stdout if self.verbose else io.StringIO()):
+                if setup is not None:
+                    setup()
+
+                start: float = time.perf_counter()
+                benchmark()
+                durations.append(time.perf_counter() - start)
+
+        result: dict = {
+            'name': name,
+            'repeat': len(durations),
+            'items': items,
+            'min_in_seconds': min(durations),
+            'median_in_seconds': statistics.median(durations),
+            'mean_in_seconds': statistics.mean(durations),
+            'max_in_seconds': max(durations),
+            'items_per_second': items / statistics.median(durations) if statistics.median(durations) > 0 else None
+        }
+        self.results.append(result)
+        print(f'{name:<48} median {result["median_in_seconds"] * 1000:>10.2f} ms   min {result["min_in_seconds"] * 1000:>10.2f} ms   ({items} items)')
+
+        return result
+
+
+def run_benchmarks(args: argparse.Namespace, runner: BenchmarkRunner):
+    '''Generate the synthetic histories and time every hot path.'''
+    from synthetic_market_data_access import SyntheticMarketDataAccess
+    from data.config_data_access import ConfigDataAccess
+    from data.fs_cache_data_access import FsCacheDataAccess
+    from data.memory_cache_data_access import MemoryCacheDataAccess
+    from data.binance_data_access import BinanceDataAccess
+    from engines.bifrost_gradient_booster_engine import BifrostGradientBoosterEngine
+    from enums.intervals import KLINE_INTERVAL_DURATIONS_IN_MS
+
+    synthetic_data_access = SyntheticMarketDataAccess(seed=args.seed)
+    interval_in_ms: int = KLINE_INTERVAL_DURATIONS_IN_MS[args.interval]
+    candle_count: int = args.days * 24 * 60 * 60 * 1000 // interval_in_ms
+    end_time_ms: int = int(time.time() * 1000) // interval_in_ms * interval_in_ms
+    start_time_ms: int = end_time_ms - (candle_count - 1) * interval_in_ms
+    pairs: list = [f'BENCH{i:03d}USDT' for i in range(args.pairs)]
+
+    def get_klines(pair: str) -> list:
+        klines: list = []
+
+        for window_start in range(start_time_ms, end_time_ms + 1, 1000 * interval_in_ms):
+            klines += synthetic_data_access.get_klines(pair, args.interval, window_start, end_time_ms, 1000)
+
+        return klines
+
+    print(f'Generating {args.pairs} synthetic {args.interval} histories of {candle_count} candles ({args.days} days).')
+    histories: dict = {pair: get_klines(pair) for pair in pairs}
+    config_data_access = ConfigDataAccess()
+    config_data_access.window_length_in_days = args.days
+    cache_data_access = FsCacheDataAccess(config_data_access)
+    binance_data_access = BinanceDataAccess(config_data_access, cache_data_access=cache_data_access)
+    total_candles: int = candle_count * args.pairs
+
+    # File system cache.
+    runner.run('fs_cache.write_json', lambda: [cache_data_access.write_to_cache(f'{pair}.json', histories[pair]) for pair in pairs], items=total_candles)
+    runner.run('fs_cache.read_json', lambda: [cache_data_access.get_from_cache(f'{pair}.json') for pair in pairs], items=total_candles)
+    runner.run('fs_cache.write_klines', lambda: [cache_data_access.write_klines_to_cache(f'{pair}.{args.interval}', histories[pair]) for pair in pairs], items=total_candles)
+    runner.run('fs_cache.read_klines', lambda: [cache_data_access.get_klines_from_cache(f'{pair}.{args.interval}') for pair in pairs], items=total_candles)
+    runner.run('binance_data_access.json_to_market_data_frame', lambda: [binance_data_access.__json_to_market_data_frame__(histories[pair]) for pair in pairs], items=total_candles)
+    # Kline payloads as the exchange sends them, decoded into columns as every fetch does.
+    payloads: dict = {pair: json.dumps(histories[pair], separators=(',', ':')).encode() for pair in pairs}
+    runner.run('fs_cache.decode_klines', lambda: [cache_data_access.decode_klines(payloads[pair]) for pair in pairs], items=total_candles)
+
+    # Model engine, on a single pair as training dominates everything else.
+    market_data = binance_data_access.__json_to_market_data_frame__(histories[pairs[0]])
+    engine_state: dict = {}
+
+    def create_engine():
+        engine_state['engine'] = BifrostGradientBoosterEngine(data=market_data.copy(), column_name_to_predict='close', data_time_column_name='time', enable_global_scaling=True)
+
+    def fit_engine():
+        engine_state['model'] = engine_state['engine'].fit(enable_hyperparameter_optimization=False, training_profile=args.training_profile)
+
+    runner.run('engine.init', create_engine, items=candle_count)
+    runner.run('engine.fit', fit_engine, items=candle_count, setup=create_engine)
+    runner.run('engine.predict_latest', lambda: engine_state['model'].predict(future_data=market_data.iloc[-1:]), items=1)
+    runner.run('engine.predict_window', lambda: engine_state['model'].predict(future_data=market_data), items=candle_count)
+
+    # Endpoints through the Flask test client, fed by the synthetic source instead of the exchange.
+    with contextlib.redirect_stdout(sys.stdout if args.verbose else io.StringIO()):
+        import main
+        import managers.binance as binance_manager
+
+    binance_manager.data_access.window_length_in_days = args.days
+
+    if args.exchange_url is None:
+        binance_manager.data_access.__get_market_data_from_binance__ = lambda pair, start, end, period, *a, **k: synthetic_data_access.get_klines(pair, period, int(start), int(end), 1000)
+    else:
+        binance_manager.data_access.base_url = args.exchange_url
+
+    binance_manager.model_retraining_scheduler_engine.is_enabled = False
+    client = main.app.test_client()
+    bulk_cache_max_age_in_seconds: int = binance_manager.bulk_inference_cache.cache_max_age_in_seconds
+    bulk_cache_max_size_in_bytes: int = binance_manager.bulk_inference_cache.max_allowed_bytes
+
+    def get(url: str):
+        response = client.get(url)
+
+        if response.status_code != 200:
+            raise Exception(f'Benchmark request "{url}" failed with status {response.status_code}: {response.get_data(as_text=True)}')
+
+    def clear_bulk_inference_cache():
+        binance_manager.bulk_inference_cache = MemoryCacheDataAccess(cache_max_age_in_seconds=bulk_cache_max_age_in_seconds, max_allowed_bytes=bulk_cache_max_size_in_bytes)
+
+    next_urls: list = [f'/api/v1/binance/pair/{pair}/period/{args.interval}/next' for pair in pairs]
+    bulk_urls: list = [f'/api/v1/binance/pair/{pair}/period/{args.interval}/bulk/{args.bulk_days}' for pair in pairs]
+
+    runner.run('endpoint.next_cold', lambda: [get(url) for url in next_urls], items=args.pairs, repeat=1)
+    runner.run('endpoint.next_warm', lambda: [get(url) for url in next_urls], items=args.pairs)
+    runner.run('endpoint.bulk_uncached', lambda: [get(url) for url in bulk_urls], items=args.pairs, setup=clear_bulk_inference_cache)
+    runner.run('endpoint.bulk_cached', lambda: [get(url) for url in bulk_urls], items=args.pairs)
+
+
+def print_comparison(results: list, baseline_file_name: str):
+    '''Print the median ratio of each benchmark against a previous run.'''
+    with open(baseline_file_name, 'r') as f:
+        baseline: dict = {result['name']: result for result in json.loads(f.read())['results']}
+
+    print(f'\nCompared to "{baseline_file_name}" (ratio < 1 is faster):')
+
+    for result in results:
+        baseline_result: dict = baseline.get(result['name'])
+
+        if baseline_result is None or baseline_result['median_in_seconds'] == 0:
+            continue
+
+        print(f'{result["name"]:<48} {result["median_in_seconds"] / baseline_result["median_in_seconds"]:>6.2f}x')
+
+
+def main():
+    args = get_arguments()
+    output_file_name: str = os.path.abspath(args.output)
+    baseline_file_name: str = None if args.baseline is None else os.path.abspath(args.baseline)
+    runner = BenchmarkRunner(repeat=args.repeat, verbose=args.verbose)
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.ERROR)
+    working_dir_path: str = tempfile.mkdtemp(prefix='bifrost-benchmark-')
+    started_at: str = datetime.utcnow().isoformat()
+
+    # Run in a scratch directory so that the pair cache and model registry start empty and are discarded afterwards.
+    os.chdir(working_dir_path)
+
+    try:
+        run_benchmarks(args, runner)
+    finally:
+        os.chdir(root_repo_path)
+        shutil.rmtree(working_dir_path, ignore_errors=True)
+
+    with open(output_file_name, 'w') as f:
+        f.write(json.dumps({
+            'started_at': started_at,
+            'git_commit': get_git_commit(),
+            'environment': {'python': platform.python_version(), 'platform': platform.platform(), 'cpu_count': os.cpu_count()},
+            'parameters': {'interval': args.interval, 'days': args.days, 'pairs': args.pairs, 'repeat': args.repeat, 'bulk_days': args.bulk_days, 'seed': args.seed, 'training_profile': args.training_profile, 'exchange_url': args.exchange_url},
+            'results': runner.results
+        }, indent=2))
+
+    print(f'\nResults written to "{output_file_name}".')
+
+    if baseline_file_name is not None:
+        print_comparison(runner.results, baseline_file_name)
+
+
+if __name__ == '__main__':
+    main()
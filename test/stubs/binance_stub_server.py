@@ -0,0 +1,228 @@
+'''This module contains a local stand-in for the Binance /klines endpoint that serves synthetic or recorded candles, optionally recording real sessions, with latency and error injection.
+
+Usage, from the repository root:
+    python test/stubs/binance_stub_server.py --port 9998 --latency-in-ms 50 --error-rate 0.01
+    python test/stubs/binance_stub_server.py --mode record --recordings-dir recordings
+    python test/stubs/binance_stub_server.py --mode replay --recordings-dir recordings
+
+Then start the service with BIFROST_BINANCE_BASE_API_URL=http://localhost:9998/api/v3.
+'''
+
+# Setup root directory to allow for importing modules from a different adjacent directory.
+import sys
+import os
+
+root_repo_path = os.getcwd()
+sys.path.append(f'{root_repo_path}/src')
+
+# Stubbing
+import argparse # noqa
+import json # noqa
+import random # noqa
+import threading # noqa
+import time # noqa
+from collections import deque # noqa
+from pathlib import Path # noqa
+import flask # noqa
+import requests # noqa
+from synthetic_market_data_access import SyntheticMarketDataAccess, BINANCE_DEFAULT_KLINE_LIMIT, BINANCE_MAX_KLINE_LIMIT # noqa
+from enums.intervals import KLINE_INTERVAL_DURATIONS_IN_MS, KLINE_INTERVAL_1MONTH # noqa
+
+STUB_MODES = ('synthetic', 'replay', 'record')
+BINANCE_UPSTREAM_API_URL = 'https://api.binance.com/api/v3'
+WEIGHT_WINDOW_IN_SECONDS = 60
+SUPPORTED_INTERVALS = set(KLINE_INTERVAL_DURATIONS_IN_MS.keys()) | {KLINE_INTERVAL_1MONTH}
+
+
+def get_kline_request_weight(limit: int) -> int:
+    '''Get the request weight Binance charges for a /klines call of a given limit.'''
+    if limit < 100:
+        return 1
+
+    if limit < 500:
+        return 2
+
+    return 5 if limit <= 1000 else 10
+
+
+class KlineRecordingStore():
+    '''Recorded klines per symbol and interval, persisted as one JSON file each and merged by open time.'''
+    def __init__(self, recordings_dir_path: str):
+        self.recordings_dir_path = recordings_dir_path
+        self.__lock__ = threading.Lock()
+
+    def __get_file_name__(self, symbol: str, interval: str) -> str:
+        return f'{self.recordings_dir_path}/{symbol}.{interval}.json'
+
+    def get_klines(self, symbol: str, interval: str) -> list:
+        '''Get all recorded klines, oldest first.'''
+        file_name: str = self.__get_file_name__(symbol, interval)
+
+        if not os.path.isfile(file_name):
+            return []
+
+        with open(file_name, 'r') as f:
+            return json.loads(f.read())
+
+    def record(self, symbol: str, interval: str, klines: list):
+        '''Merge newly observed klines into the recording, the latest copy of a candle winning.'''
+        with self.__lock__:
+            merged: dict = {kline[0]: kline for kline in self.get_klines(symbol, interval)}
+            merged.update({kline[0]: kline for kline in klines})
+            Path(self.recordings_dir_path).mkdir(parents=True, exist_ok=True)
+            file_name: str = self.__get_file_name__(symbol, interval)
+
+            with open(f'{file_name}.tmp', 'w') as f:
+                f.write(json.dumps([merged[open_time] for open_time in sorted(merged.keys())]))
+
+            os.replace(f'{file_name}.tmp', file_name)
+
+
+def select_klines(klines: list, start_time_ms: int, end_time_ms: int, limit: int) -> list:
+    '''Select recorded klines the way Binance does: open times within [start, end], earliest first, capped at the limit, or the latest ones when no start is given.'''
+    selected: list = [k for k in klines if (start_time_ms is None or k[0] >= start_time_ms) and (end_time_ms is None or k[0] <= end_time_ms)]
+
+    return selected[:limit] if start_time_ms is not None else selected[-limit:]
+
+
+def get_binance_error(status: int, code: int, message: str) -> flask.Response:
+    return flask.Response(json.dumps({'code': code, 'msg': message}), status=status, mimetype='application/json')
+
+
+def create_app(mode: str = 'synthetic',
+               recordings_dir_path: str = 'recordings',
+               upstream_url: str = BINANCE_UPSTREAM_API_URL,
+               latency_in_ms: float = 0,
+               latency_jitter_in_ms: float = 0,
+               error_rate: float = 0,
+               error_status: int = 500,
+               retry_after_in_seconds: int = 1,
+               weight_limit_per_minute: int = None,
+               seed: int = 0) -> flask.Flask:
+    '''Create the stub server application.'''
+    if mode not in STUB_MODES:
+        raise Exception('Valid mode is required.')
+
+    app = flask.Flask('binance_stub_server')
+    synthetic_data_access = SyntheticMarketDataAccess(seed=seed)
+    recording_store = KlineRecordingStore(recordings_dir_path)
+    upstream_session = requests.Session()
+    fault_random = random.Random(seed)
+    used_weights: deque = deque()
+    state_lock = threading.Lock()
+    app.config['STUB_STATISTICS'] = {'requests': 0, 'injected_errors': 0, 'rate_limited': 0}
+
+    def use_weight(weight: int) -> int:
+        '''Charge a request against the rolling one minute window and get the total used weight.'''
+        now: float = time.monotonic()
+
+        with state_lock:
+            while len(used_weights) > 0 and now - used_weights[0][0] >= WEIGHT_WINDOW_IN_SECONDS:
+                used_weights.popleft()
+
+            used_weights.append((now, weight))
+
+            return sum(w for _, w in used_weights)
+
+    @app.route('/api/v3/klines', methods=['GET'])
+    def get_klines():
+        args = flask.request.args
+        symbol: str = args.get('symbol')
+        interval: str = args.get('interval')
+        limit: int = min(BINANCE_MAX_KLINE_LIMIT, max(1, int(args.get('limit', BINANCE_DEFAULT_KLINE_LIMIT))))
+        start_time_ms: int = int(args['startTime']) if 'startTime' in args else None
+        end_time_ms: int = int(args['endTime']) if 'endTime' in args else None
+        used_weight: int = use_weight(get_kline_request_weight(limit))
+        weight_headers: dict = {'X-MBX-USED-WEIGHT-1M': str(used_weight)}
+        sleep_in_ms: float = latency_in_ms + (fault_random.uniform(0, latency_jitter_in_ms) if latency_jitter_in_ms > 0 else 0)
+
+        with state_lock:
+            app.config['STUB_STATISTICS']['requests'] += 1
+            is_error_injected: bool = error_rate > 0 and fault_random.random() < error_rate
+
+        if sleep_in_ms > 0:
+            time.sleep(sleep_in_ms / 1000)
+
+        if weight_limit_per_minute is not None and used_weight > weight_limit_per_minute:
+            with state_lock:
+                app.config['STUB_STATISTICS']['rate_limited'] += 1
+
+            response: flask.Response = get_binance_error(429, -1003, f'Too much request weight used; current limit is {weight_limit_per_minute} request weight per 1 MINUTE.')
+            response.headers.update({**weight_headers, 'Retry-After': str(retry_after_in_seconds)})
+
+            return response
+
+        if is_error_injected:
+            with state_lock:
+                app.config['STUB_STATISTICS']['injected_errors'] += 1
+
+            response = get_binance_error(error_status, -1003 if error_status == 429 else -1000, 'Injected stub failure.')
+            response.headers.update(weight_headers)
+
+            if error_status in (418, 429, 503):
+                response.headers['Retry-After'] = str(retry_after_in_seconds)
+
+            return response
+
+        if not symbol:
+            return get_binance_error(400, -1102, "Mandatory parameter 'symbol' was not sent, was empty/null, or malformed.")
+
+        if interval not in SUPPORTED_INTERVALS:
+            return get_binance_error(400, -1120, 'Invalid interval.')
+
+        symbol = symbol.upper()
+
+        if mode == 'record':
+            upstream_response: requests.Response = upstream_session.get(f'{upstream_url}/klines', params=args)
+
+            if upstream_response.status_code == 200:
+                recording_store.record(symbol, interval, json.loads(upstream_response.text))
+
+            return flask.Response(upstream_response.text,
+                                  status=upstream_response.status_code,
+                                  mimetype='application/json',
+                                  headers={k: v for k, v in upstream_response.headers.items() if k.upper().startswith('X-MBX-') or k == 'Retry-After'})
+
+        if mode == 'replay':
+            klines: list = select_klines(recording_store.get_klines(symbol, interval), start_time_ms, end_time_ms, limit)
+        elif interval == KLINE_INTERVAL_1MONTH:
+            return get_binance_error(400, -1120, 'Invalid interval.')
+        else:
+            klines = synthetic_data_access.get_klines(symbol, interval, start_time_ms, end_time_ms, limit)
+
+        return flask.Response(json.dumps(klines), status=200, mimetype='application/json', headers=weight_headers)
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description='A local stand-in for the Binance /klines endpoint.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=9998)
+    parser.add_argument('--mode', choices=STUB_MODES, default='synthetic', help='Serve synthetic candles, replay recorded ones or record a real session while proxying it.')
+    parser.add_argument('--recordings-dir', default='recordings', help='The directory recordings are read from and written to.')
+    parser.add_argument('--upstream-url', default=BINANCE_UPSTREAM_API_URL, help='The API proxied in record mode.')
+    parser.add_argument('--latency-in-ms', type=float, default=0, help='A fixed delay added to every response.')
+    parser.add_argument('--latency-jitter-in-ms', type=float, default=0, help='A random delay of up to this much added to every response.')
+    parser.add_argument('--error-rate', type=float, default=0, help='The probability of answering a request with an injected error.')
+    parser.add_argument('--error-status', type=int, default=500, help='The HTTP status of injected errors, e.g. 429, 500 or 503.')
+    parser.add_argument('--retry-after-in-seconds', type=int, default=1, help='The Retry-After value of rate limit responses.')
+    parser.add_argument('--weight-limit-per-minute', type=int, default=None, help='Answer 429 once the request weight of the last minute exceeds this.')
+    parser.add_argument('--seed', type=int, default=0, help='The seed of synthetic candles and injected faults.')
+    args = parser.parse_args()
+    app: flask.Flask = create_app(mode=args.mode,
+                                  recordings_dir_path=os.path.abspath(args.recordings_dir),
+                                  upstream_url=args.upstream_url,
+                                  latency_in_ms=args.latency_in_ms,
+                                  latency_jitter_in_ms=args.latency_jitter_in_ms,
+                                  error_rate=args.error_rate,
+                                  error_status=args.error_status,
+                                  retry_after_in_seconds=args.retry_after_in_seconds,
+                                  weight_limit_per_minute=args.weight_limit_per_minute,
+                                  seed=args.seed)
+
+    app.run(host=args.host, port=args.port, threaded=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,154 @@
+'''This module contains deterministic generators of Binance shaped klines and market data frames for benchmarks, the offline exchange stub and tests, and a stand-in kline stream fed by them. Import it with the src directory on the path.'''
+
+from data.kline_stream_data_access import LocalKlineStreamDataAccess, get_kline_event
+from enums.intervals import KLINE_INTERVAL_DURATIONS_IN_MS
+import numpy as np
+import pandas as pd
+import time
+import zlib
+
+BINANCE_DEFAULT_KLINE_LIMIT = 500
+BINANCE_MAX_KLINE_LIMIT = 1000
+
+
+def get_market_data_frame(count: int, start: str = '2022-01-01', seed: int = 1502) -> pd.DataFrame:
+    '''Get a reproducible random walk of hourly candles as the time indexed market data frame the engines expect.'''
+    random = np.random.default_rng(seed)
+    close: np.ndarray = 100 + np.cumsum(random.normal(0, 1, count))
+    data: pd.DataFrame = pd.DataFrame({
+        'time': pd.date_range(start, periods=count, freq='h'),
+        'open': close + random.normal(0, 0.1, count),
+        'high': close + 1,
+        'low': close - 1,
+        'close': close,
+        'volume': random.integers(1, 100, count)
+    })
+    data.index = data['time']
+
+    return data
+
+
+class SyntheticMarketDataAccess():
+    '''A deterministic source of Binance shaped klines for offline benchmarks, load tests and stand-in feeds. A candle only depends on its pair and open time, so overlapping requests always agree.'''
+    def __init__(self, seed: int = 0):
+        self.seed = seed
+
+    def __get_pair_seed__(self, pair: str) -> np.uint64:
+        '''Derive a stable per-pair seed.'''
+        return np.uint64((zlib.crc32(pair.upper().encode('utf-8')) + self.seed) & 0xFFFFFFFF)
+
+    def __get_uniform_noise__(self, indices: np.ndarray, pair_seed: np.uint64, stream: int) -> np.ndarray:
+        '''Hash candle indices into uniform [0, 1) noise without any sequential random state.'''
+        with np.errstate(over='ignore'):
+            x: np.ndarray = indices.astype(np.uint64) * np.uint64(0x9E3779B97F4A7C15) + pair_seed * np.uint64(2 * stream + 1)
+            x ^= x >> np.uint64(31)
+            x *= np.uint64(0xBF58476D1CE4E5B9)
+            x ^= x >> np.uint64(29)
+
+        return (x >> np.uint64(11)).astype(np.float64) / float(1 << 53)
+
+    def __get_closes__(self, indices: np.ndarray, pair_seed: np.uint64) -> np.ndarray:
+        '''Get the close prices of a set of candle indices as a slow trend cycle and a daily cycle plus noise.'''
+        base_price: float = 0.0001 * (1 + int(pair_seed) % 500000)
+        hours: np.ndarray = indices.astype(np.float64)
+        noise: np.ndarray = self.__get_uniform_noise__(indices, pair_seed, 0) - 0.5
+
+        return base_price * np.exp(0.08 * np.sin(2 * np.pi * hours / 1000) + 0.02 * np.sin(2 * np.pi * hours / 24) + 0.01 * noise)
+
+    def get_kline_columns(self, pair: str, period: str, start_time_ms: int, count: int) -> dict:
+        '''Generate <count> consecutive candles from an aligned open time as numeric time/open/high/low/close/volume columns.'''
+        if pair is None:
+            raise Exception('Valid pair is required.')
+
+        interval_in_ms: int = KLINE_INTERVAL_DURATIONS_IN_MS.get(period)
+
+        if interval_in_ms is None:
+            raise Exception('Valid period is required.')
+
+        pair_seed: np.uint64 = self.__get_pair_seed__(pair)
+        first_index: int = int(start_time_ms) // interval_in_ms
+        # Generate one extra leading candle so that every open equals the close of the candle before it.
+        indices: np.ndarray = np.arange(first_index - 1, first_index + count, dtype=np.int64)
+        # Scale the index to hours so that cycle lengths are comparable across intervals.
+        cycle_indices: np.ndarray = indices * interval_in_ms // (60 * 60 * 1000)
+        closes: np.ndarray = self.__get_closes__(np.maximum(cycle_indices, 0), pair_seed) * (1 + 0.001 * (self.__get_uniform_noise__(indices, pair_seed, 1) - 0.5))
+        opens: np.ndarray = closes[:-1]
+        closes = closes[1:]
+        indices = indices[1:]
+        wicks: np.ndarray = 1 + 0.005 * self.__get_uniform_noise__(indices, pair_seed, 2)
+
+        return {
+            'time': indices * interval_in_ms,
+            'open': opens,
+            'high': np.maximum(opens, closes) * wicks,
+            'low': np.minimum(opens, closes) / wicks,
+            'close': closes,
+            'volume': np.round(1000 + 9000 * self.__get_uniform_noise__(indices, pair_seed, 3), 2)
+        }
+
+    def get_klines(self, pair: str, period: str, start_time_ms: int = None, end_time_ms: int = None, limit: int = None) -> list:
+        '''Get candles exactly as the Binance /klines endpoint would: open times within [start, end], earliest first, capped at the limit and never past the current candle.'''
+        interval_in_ms: int = KLINE_INTERVAL_DURATIONS_IN_MS.get(period)
+
+        if interval_in_ms is None:
+            raise Exception('Valid period is required.')
+
+        limit = min(BINANCE_MAX_KLINE_LIMIT, max(1, int(limit or BINANCE_DEFAULT_KLINE_LIMIT)))
+        now_ms: int = int(time.time() * 1000)
+        end_time_ms = now_ms if end_time_ms is None else min(int(end_time_ms), now_ms)
+        last_open_time: int = end_time_ms // interval_in_ms * interval_in_ms
+
+        if start_time_ms is None:
+            first_open_time: int = last_open_time - (limit - 1) * interval_in_ms
+        else:
+            first_open_time = -(-int(start_time_ms) // interval_in_ms) * interval_in_ms
+
+        count: int = min(limit, (last_open_time - first_open_time) // interval_in_ms + 1)
+
+        if count <= 0:
+            return []
+
+        columns: dict = self.get_kline_columns(pair, period, first_open_time, count)
+
+        return [[int(open_time), f'{o:.8f}', f'{h:.8f}', f'{lo:.8f}', f'{c:.8f}', f'{v:.8f}', int(open_time) + interval_in_ms - 1, f'{c * v:.8f}', 100, f'{v / 2:.8f}', f'{c * v / 2:.8f}', '0']
+                for open_time, o, h, lo, c, v in zip(columns['time'], columns['open'], columns['high'], columns['low'], columns['close'], columns['volume'])]
+
+
+class SyntheticKlineStreamDataAccess(LocalKlineStreamDataAccess):
+    '''A stand-in kline stream that ticks the live synthetic candle of every subscription and closes it once its interval passed, matching the candles served by the offline exchange stub.'''
+    def __init__(self, synthetic_market_data_access: SyntheticMarketDataAccess = None, tick_in_seconds: float = 1):
+        super().__init__()
+        self.synthetic_market_data_access = synthetic_market_data_access or SyntheticMarketDataAccess()
+        self.tick_in_seconds = tick_in_seconds
+        self.__live_open_times__ = {}
+        self.__next_tick_at__ = 0
+
+    def get_events(self, timeout_in_seconds: float = 1) -> list:
+        events: list = super().get_events(max(0, min(timeout_in_seconds, self.__next_tick_at__ - time.monotonic())))
+
+        if time.monotonic() >= self.__next_tick_at__:
+            self.__next_tick_at__ = time.monotonic() + self.tick_in_seconds
+            events += self.__get_synthetic_events__(int(time.time() * 1000))
+
+        return events
+
+    def __get_synthetic_events__(self, now_in_ms: int) -> list:
+        '''Get the closing update of every live synthetic candle whose interval passed and an update of every current one.'''
+        events: list = []
+
+        for pair, period in self.get_subscriptions():
+            interval_in_ms: int = KLINE_INTERVAL_DURATIONS_IN_MS.get(period)
+
+            if interval_in_ms is None:
+                continue
+
+            open_time: int = now_in_ms // interval_in_ms * interval_in_ms
+            live_open_time: int = self.__live_open_times__.get((pair, period))
+
+            if live_open_time is not None and live_open_time < open_time:
+                events += [get_kline_event(pair, period, kline, True) for kline in self.synthetic_market_data_access.get_klines(pair, period, live_open_time, open_time - 1)]
+
+            self.__live_open_times__[(pair, period)] = open_time
+            events += [get_kline_event(pair, period, kline, False) for kline in self.synthetic_market_data_access.get_klines(pair, period, open_time, open_time, 1)]
+
+        return events
@@ -0,0 +1,96 @@
+'''This module contains T1 tests for the bifrost_gradient_booster_engine module.'''
+
+# Setup root directory to allow for importing modules from a different adjacent directory.
+import sys
+import os
+
+root_repo_path = os.getcwd()
+sys.path.append(f'{root_repo_path}/src')
+sys.path.append(f'{root_repo_path}/test/stubs')
+
+# Testing
+import pytest # noqa
+import numpy as np # noqa
+import pandas as pd # noqa
+from synthetic_market_data_access import get_market_data_frame # noqa
+from engines.bifrost_gradient_booster_engine import BifrostGradientBoosterEngine # noqa
+
+
+def test_update_without_trained_model_should_raise_error():
+    expected: str = 'A trained time series model is required.'
+    instance: BifrostGradientBoosterEngine = BifrostGradientBoosterEngine(data=get_market_data_frame(100), column_name_to_predict='close', data_time_column_name='time')
+
+    with pytest.raises(Exception) as e_info:
+        instance.update(data=get_market_data_frame(100))
+
+    assert str(e_info.value) == expected
+
+
+def test_update_with_new_rows_should_continue_boosting_a_copy():
+    data: pd.DataFrame = get_market_data_frame(300)
+    instance: BifrostGradientBoosterEngine = BifrostGradientBoosterEngine(data=data.iloc[:280], column_name_to_predict='close', data_time_column_name='time').fit(enable_hyperparameter_optimization=False)
+
+    actual: BifrostGradientBoosterEngine = instance.update(data=data.iloc[279:], num_boost_round=5)
+
+    assert actual.model.num_boosted_rounds() == instance.model.num_boosted_rounds() + 5
+    assert actual.incremental_update_count == 1
+    assert actual.training_data_range[1] == str(data.time.iloc[-1])
+    assert instance.training_data_range[1] == str(data.time.iloc[279])
+    assert len(actual.predict(future_data=data.iloc[-3:])) == 3
+
+
+def test_update_without_new_rows_should_return_same_model():
+    data: pd.DataFrame = get_market_data_frame(100)
+    instance: BifrostGradientBoosterEngine = BifrostGradientBoosterEngine(data=data, column_name_to_predict='close', data_time_column_name='time').fit(enable_hyperparameter_optimization=False)
+
+    actual: BifrostGradientBoosterEngine = instance.update(data=data.iloc[-1:])
+
+    assert actual is instance
+
+
+def test_fit_with_invalid_training_profile_should_raise_error():
+    expected: str = 'Valid training_profile is required.'
+    instance: BifrostGradientBoosterEngine = BifrostGradientBoosterEngine(data=get_market_data_frame(100), column_name_to_predict='close', data_time_column_name='time')
+
+    with pytest.raises(Exception) as e_info:
+        instance.fit(enable_hyperparameter_optimization=False, training_profile='RandomProfile')
+
+    assert str(e_info.value) == expected
+
+
+def test_fit_with_training_profile_should_stop_boosting_early():
+    data: pd.DataFrame = get_market_data_frame(300)
+    instance: BifrostGradientBoosterEngine = BifrostGradientBoosterEngine(data=data, column_name_to_predict='close', data_time_column_name='time').fit(enable_hyperparameter_optimization=False, training_profile='fast')
+
+    assert instance.model.num_boosted_rounds() < 300
+    assert instance.parameters['tree_method'] == 'hist'
+    assert instance.parameters['nthread'] == 1
+    assert instance.get_metadata()['training_profile'] == 'fast'
+
+
+def test_fit_with_hyperparameter_search_should_train_the_searched_boosting_rounds():
+    data: pd.DataFrame = get_market_data_frame(300)
+    instance: BifrostGradientBoosterEngine = BifrostGradientBoosterEngine(data=data, column_name_to_predict='close', data_time_column_name='time') \
+        .fit(enable_hyperparameter_optimization=True, optimization_budget_in_seconds=10, thread_count=1)
+    tuned_parameters: dict = instance.get_tuned_parameters()
+
+    assert instance.model.num_boosted_rounds() == tuned_parameters['num_boost_round'] < 1000
+    assert 'num_boost_round' not in instance.parameters
+
+    retrained_instance: BifrostGradientBoosterEngine = BifrostGradientBoosterEngine(data=data, column_name_to_predict='close', data_time_column_name='time') \
+        .fit(enable_hyperparameter_optimization=False, parameters=tuned_parameters, thread_count=1)
+
+    assert retrained_instance.model.num_boosted_rounds() == tuned_parameters['num_boost_round']
+    assert retrained_instance.get_tuned_parameters() == tuned_parameters
+
+
+def test_fit_update_and_restore_should_measure_the_booster_size():
+    data: pd.DataFrame = get_market_data_frame(300)
+    instance: BifrostGradientBoosterEngine = BifrostGradientBoosterEngine(data=data.iloc[:280], column_name_to_predict='close', data_time_column_name='time').fit(enable_hyperparameter_optimization=False)
+    updated: BifrostGradientBoosterEngine = instance.update(data=data.iloc[279:], num_boost_round=5)
+    restored: BifrostGradientBoosterEngine = BifrostGradientBoosterEngine.from_trained_model(updated.model, updated.get_metadata())
+
+    assert instance.model_size_in_bytes == len(instance.model.save_raw())
+    assert updated.model_size_in_bytes == len(updated.model.save_raw())
+    assert updated.model_size_in_bytes > instance.model_size_in_bytes
+    assert restored.model_size_in_bytes == updated.model_size_in_bytes
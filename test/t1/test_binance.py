@@ -0,0 +1,114 @@
+'''This module contains T1 tests for the binance manager module.'''
+
+# Setup root directory to allow for importing modules from a different adjacent directory.
+import sys
+import os
+
+root_repo_path = os.getcwd()
+sys.path.append(f'{root_repo_path}/src')
+sys.path.append(f'{root_repo_path}/test/stubs')
+
+# Testing
+import pytest # noqa
+import numpy as np # noqa
+import pandas as pd # noqa
+from synthetic_market_data_access import get_market_data_frame # noqa
+from datetime import datetime, timedelta # noqa
+import main # noqa
+from managers import binance # noqa
+from models.binance import ForecastRequest # noqa
+from data.memory_cache_data_access import MemoryCacheDataAccess # noqa
+
+
+@pytest.fixture
+def registered_pairs(monkeypatch) -> list:
+    '''Record the pairs registered for background retraining instead of retraining them.'''
+    pairs: list = []
+    monkeypatch.setattr(binance.model_retraining_scheduler_engine, 'register', lambda pair_name, period: pairs.append((pair_name, period)))
+
+    return pairs
+
+
+@pytest.fixture
+def client(monkeypatch, registered_pairs):
+    '''Serve the app against in-memory market data only known for DOGEBTC, without persisting models.'''
+    def get_market_data(request: ForecastRequest) -> pd.DataFrame:
+        if request.pair_name != 'DOGEBTC':
+            raise Exception(f'Unknown pair "{request.pair_name}".')
+
+        return get_market_data_frame(300)
+
+    monkeypatch.setattr(binance.data_access, 'get_market_data', get_market_data)
+    monkeypatch.setattr(binance.market_data_forecasting_engine, 'model_registry_data_access', None)
+
+    return main.app.test_client()
+
+
+def test_post_batch_with_failing_forecast_should_still_predict_the_others(client, registered_pairs):
+    response = client.post('/api/v1/binance/batch', json={
+        'forecasts': [{'pair_name': 'DOGEBTC', 'period': '1h', 'training_profile': 'fast'}, {'pair_name': 'RANDOMPAIR', 'period': '1h'}],
+        'cutoff_time_utc': '2022-02-01T00:00:00'
+    })
+    actual: list = response.get_json()['forecasts']
+
+    assert response.status_code == 200
+    assert actual[0]['pair_name'] == 'DOGEBTC'
+    assert actual[0]['error'] is None
+    assert actual[0]['predicted_close'] is not None
+    assert actual[0]['predicted_candle_time'] is not None
+    assert actual[1]['pair_name'] == 'RANDOMPAIR'
+    assert actual[1]['error'] == 'Unknown pair "RANDOMPAIR".'
+    assert actual[1]['predicted_close'] is None
+    assert registered_pairs == [('DOGEBTC', '1h')]
+
+
+def test_post_batch_without_cutoff_time_should_cut_off_at_the_time_of_each_request(client, monkeypatch):
+    cutoff_times: list = []
+    current_time: list = [datetime(2022, 1, 10)]
+
+    class FakeDateTime(datetime):
+        @classmethod
+        def utcnow(cls) -> datetime:
+            return current_time[0]
+
+    def get_market_data(request: ForecastRequest) -> pd.DataFrame:
+        cutoff_times.append(request.cutoff_time_utc)
+
+        return get_market_data_frame(300)
+
+    monkeypatch.setattr(binance, 'datetime', FakeDateTime)
+    monkeypatch.setattr(binance.data_access, 'get_market_data', get_market_data)
+
+    for _ in range(2):
+        response = client.post('/api/v1/binance/batch', json={'forecasts': [{'pair_name': 'DOGEBTC', 'period': '1h', 'training_profile': 'fast'}]})
+        current_time[0] += timedelta(hours=2)
+
+        assert response.status_code == 200
+
+    assert cutoff_times == [datetime(2022, 1, 10), datetime(2022, 1, 10, 2)]
+
+
+def test_get_bulk_should_predict_the_window_and_serve_repeated_requests_from_cache(client, monkeypatch):
+    fetched_pairs: list = []
+
+    def get_market_data(request: ForecastRequest) -> pd.DataFrame:
+        fetched_pairs.append(request.pair_name)
+
+        return get_market_data_frame(300)
+
+    monkeypatch.setattr(binance.data_access, 'get_market_data', get_market_data)
+    monkeypatch.setattr(binance, 'bulk_inference_cache', MemoryCacheDataAccess(cache_max_age_in_seconds=60))
+
+    response = client.get('/api/v1/binance/pair/DOGEBTC/period/1h/bulk/1?training_profile=fast')
+    cached_response = client.get('/api/v1/binance/pair/DOGEBTC/period/1h/bulk/1?training_profile=fast')
+    actual: dict = response.get_json()
+    expected_window: pd.DataFrame = get_market_data_frame(300).iloc[-25:]
+
+    assert response.status_code == 200
+    assert actual['pair_name'] == 'DOGEBTC'
+    assert actual['data']['time'] == [str(time) for time in expected_window.time]
+    assert actual['data']['actual_closing_prices'] == expected_window.close.tolist()
+    assert len(actual['data']['predicted_closing_prices']) == len(expected_window)
+    assert len(actual['data']['delta_percentages']) == len(expected_window)
+    assert cached_response.get_json() == actual
+    assert fetched_pairs == ['DOGEBTC']
@@ -6,12 +6,17 @@ import os
 
 root_repo_path = os.getcwd()
 sys.path.append(f'{root_repo_path}/src')
+sys.path.append(f'{root_repo_path}/test/stubs')
 
 # Testing
 import pytest # noqa
 from data.config_data_access import ConfigDataAccess # noqa
 from data.fs_cache_data_access import FsCacheDataAccess # noqa
 from data.binance_data_access import BinanceDataAccess # noqa
+from synthetic_market_data_access import SyntheticMarketDataAccess # noqa
+from models.binance import ForecastRequest # noqa
+from datetime import datetime # noqa
+import pandas as pd # noqa
 
 
 def test_init_with_invalid_config_should_raise_error():
@@ -43,3 +48,96 @@ def test_init_with_valid_config_should_set_correct_base_url():
     actual: BinanceDataAccess = BinanceDataAccess(config_data_access=config, cache_data_access=cache_data_access)
 
     assert actual.base_url == expected
+
+
+def test_plan_backfill_windows_should_split_range_into_request_sized_windows():
+    config: ConfigDataAccess = ConfigDataAccess()
+    config.binance_max_klines_per_request = 10
+    cache_data_access: FsCacheDataAccess = FsCacheDataAccess(config_data_access=config)
+    instance: BinanceDataAccess = BinanceDataAccess(config_data_access=config, cache_data_access=cache_data_access)
+    hour_in_ms: int = 60 * 60 * 1000
+
+    actual: list = instance.__plan_backfill_windows__(0, 25 * hour_in_ms, '1h')
+
+    assert actual == [(0, 10 * hour_in_ms - 1), (10 * hour_in_ms, 20 * hour_in_ms - 1), (20 * hour_in_ms, 25 * hour_in_ms)]
+
+
+def test_get_market_data_should_serve_loaded_window_from_memory_until_next_candle_is_due():
+    config: ConfigDataAccess = ConfigDataAccess()
+    config.data_dir_relative_path = f'{config.data_dir_relative_path}_tmp'
+    config.window_length_in_days = 7
+    cache_data_access: FsCacheDataAccess = FsCacheDataAccess(config_data_access=config)
+    instance: BinanceDataAccess = BinanceDataAccess(config_data_access=config, cache_data_access=cache_data_access)
+    synthetic_data_access: SyntheticMarketDataAccess = SyntheticMarketDataAccess()
+    instance.__get_market_data_from_binance__ = lambda pair, start, end, period, *a, **k: synthetic_data_access.get_klines(pair, period, int(start), int(end), 1000)
+    request: ForecastRequest = ForecastRequest('HOTWINDOWUSDT', '1h', datetime.utcnow())
+
+    if os.path.isfile(f'{cache_data_access.data_dir_path}/HOTWINDOWUSDT.1h.fak'):
+        os.remove(f'{cache_data_access.data_dir_path}/HOTWINDOWUSDT.1h.fak')
+
+    expected = instance.get_market_data(request)
+    cache_data_access.get_klines_from_cache = None
+    actual = instance.get_market_data(request)
+
+    assert actual is not expected
+    assert actual.equals(expected)
+    assert instance.get_hot_window_statistics()['hits'] == 1
+
+
+def test_get_market_data_with_cached_finer_interval_should_resample_instead_of_fetching():
+    config: ConfigDataAccess = ConfigDataAccess()
+    config.data_dir_relative_path = f'{config.data_dir_relative_path}_tmp'
+    config.window_length_in_days = 7
+    cache_data_access: FsCacheDataAccess = FsCacheDataAccess(config_data_access=config)
+    instance: BinanceDataAccess = BinanceDataAccess(config_data_access=config, cache_data_access=cache_data_access)
+    synthetic_data_access: SyntheticMarketDataAccess = SyntheticMarketDataAccess()
+    fetched_periods: list = []
+
+    def get_market_data_from_binance(pair, start, end, period, *args, **kwargs):
+        fetched_periods.append(period)
+
+        return synthetic_data_access.get_klines(pair, period, int(start), int(end), 1000)
+
+    instance.__get_market_data_from_binance__ = get_market_data_from_binance
+
+    for period in ('1h', '4h', '1d'):
+        if os.path.isfile(f'{cache_data_access.data_dir_path}/RESAMPLEUSDT.{period}.fak'):
+            os.remove(f'{cache_data_access.data_dir_path}/RESAMPLEUSDT.{period}.fak')
+
+    hourly = instance.get_market_data(ForecastRequest('RESAMPLEUSDT', '1h', datetime.utcnow()))
+    actual = instance.get_market_data(ForecastRequest('RESAMPLEUSDT', '4h', datetime.utcnow()))
+
+    assert fetched_periods == ['1h']
+    assert actual.time.diff().dropna().max() == pd.Timedelta(hours=4)
+    assert cache_data_access.get_klines_from_cache('RESAMPLEUSDT.4h', start_time_ms=int(hourly.time.iloc[0].timestamp() * 1000))['volume'].sum() == pytest.approx(cache_data_access.get_klines_from_cache('RESAMPLEUSDT.1h', start_time_ms=int(hourly.time.iloc[0].timestamp() * 1000))['volume'].sum())
+    assert actual.high.max() == hourly.high.max()
+    assert actual.close.iloc[-1] == hourly.close.iloc[-1]
+
+    instance.get_market_data(ForecastRequest('RESAMPLEUSDT', '1d', datetime.utcnow()))
+
+    assert fetched_periods == ['1h']
+
+
+def test_get_market_data_without_cached_finer_interval_should_fetch_from_exchange():
+    config: ConfigDataAccess = ConfigDataAccess()
+    config.data_dir_relative_path = f'{config.data_dir_relative_path}_tmp'
+    config.window_length_in_days = 7
+    cache_data_access: FsCacheDataAccess = FsCacheDataAccess(config_data_access=config)
+    instance: BinanceDataAccess = BinanceDataAccess(config_data_access=config, cache_data_access=cache_data_access)
+    synthetic_data_access: SyntheticMarketDataAccess = SyntheticMarketDataAccess()
+    fetched_periods: list = []
+
+    def get_market_data_from_binance(pair, start, end, period, *args, **kwargs):
+        fetched_periods.append(period)
+
+        return synthetic_data_access.get_klines(pair, period, int(start), int(end), 1000)
+
+    instance.__get_market_data_from_binance__ = get_market_data_from_binance
+
+    if os.path.isfile(f'{cache_data_access.data_dir_path}/NOFINERUSDT.4h.fak'):
+        os.remove(f'{cache_data_access.data_dir_path}/NOFINERUSDT.4h.fak')
+
+    actual = instance.get_market_data(ForecastRequest('NOFINERUSDT', '4h', datetime.utcnow()))
+
+    assert fetched_periods == ['4h']
+    assert len(actual) >= 7 * 6
@@ -0,0 +1,99 @@
+'''This module contains T1 tests for the binance_stub_server module.'''
+
+# Setup root directory to allow for importing modules from a different adjacent directory.
+import sys
+import os
+
+root_repo_path = os.getcwd()
+sys.path.append(f'{root_repo_path}/src')
+sys.path.append(f'{root_repo_path}/test/stubs')
+
+# Testing
+import pytest # noqa
+import json # noqa
+import threading # noqa
+from datetime import datetime # noqa
+from werkzeug.serving import make_server # noqa
+from binance_stub_server import create_app, KlineRecordingStore # noqa
+from data.config_data_access import ConfigDataAccess # noqa
+from data.fs_cache_data_access import FsCacheDataAccess # noqa
+from data.binance_data_access import BinanceDataAccess # noqa
+from models.binance import ForecastRequest # noqa
+
+HOUR_IN_MS = 60 * 60 * 1000
+START_TIME_MS = 1600000000000 // HOUR_IN_MS * HOUR_IN_MS
+
+
+def get_klines(client, **params) -> tuple:
+    response = client.get('/api/v3/klines', query_string=params)
+
+    return response.status_code, json.loads(response.get_data(as_text=True)), response.headers
+
+
+def test_create_app_with_invalid_mode_should_raise_error():
+    expected: str = 'Valid mode is required.'
+
+    with pytest.raises(Exception) as e_info:
+        create_app(mode='invalid')
+
+    assert str(e_info.value) == expected
+
+
+def test_klines_in_synthetic_mode_should_honour_the_request_contract():
+    client = create_app().test_client()
+
+    status, klines, headers = get_klines(client, symbol='btcusdt', interval='1h', startTime=START_TIME_MS, endTime=START_TIME_MS + 10 * HOUR_IN_MS, limit=4)
+
+    assert status == 200
+    assert [k[0] for k in klines] == [START_TIME_MS + i * HOUR_IN_MS for i in range(4)]
+    assert len(klines[0]) == 12
+    assert headers['X-MBX-USED-WEIGHT-1M'] == '1'
+    assert get_klines(client, symbol='BTCUSDT', interval='2s')[:2] == (400, {'code': -1120, 'msg': 'Invalid interval.'})
+
+
+def test_klines_with_injected_errors_should_fail_with_retry_after():
+    client = create_app(error_rate=1, error_status=429, retry_after_in_seconds=3).test_client()
+
+    status, body, headers = get_klines(client, symbol='BTCUSDT', interval='1h')
+
+    assert status == 429
+    assert body['code'] == -1003
+    assert headers['Retry-After'] == '3'
+
+
+def test_klines_over_the_weight_limit_should_be_rate_limited():
+    client = create_app(weight_limit_per_minute=6).test_client()
+
+    assert get_klines(client, symbol='BTCUSDT', interval='1h', limit=1000)[0] == 200
+    assert get_klines(client, symbol='BTCUSDT', interval='1h', limit=1000)[0] == 429
+
+
+def test_klines_in_replay_mode_should_serve_recorded_klines(tmp_path):
+    recordings_dir_path: str = str(tmp_path)
+    recorded_klines: list = [[START_TIME_MS + i * HOUR_IN_MS, '1', '2', '0.5', '1.5', '10', START_TIME_MS + (i + 1) * HOUR_IN_MS - 1, '15', 1, '5', '7.5', '0'] for i in range(5)]
+    KlineRecordingStore(recordings_dir_path).record('BTCUSDT', '1h', recorded_klines)
+    client = create_app(mode='replay', recordings_dir_path=recordings_dir_path).test_client()
+
+    assert get_klines(client, symbol='BTCUSDT', interval='1h', startTime=START_TIME_MS + 1, limit=2)[1] == recorded_klines[1:3]
+    assert get_klines(client, symbol='BTCUSDT', interval='1h', limit=2)[1] == recorded_klines[3:]
+
+
+def test_get_market_data_against_the_stub_server_should_page_through_the_window(tmp_path):
+    server = make_server('127.0.0.1', 0, create_app(), threaded=True)
+    thread: threading.Thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    config: ConfigDataAccess = ConfigDataAccess()
+    config.data_dir_relative_path = os.path.relpath(tmp_path, os.getcwd())
+    config.window_length_in_days = 7
+    config.binance_max_klines_per_request = 50
+    config.binance_base_api_url = f'http://127.0.0.1:{server.server_port}/api/v3'
+
+    try:
+        instance: BinanceDataAccess = BinanceDataAccess(config_data_access=config, cache_data_access=FsCacheDataAccess(config_data_access=config))
+        actual = instance.get_market_data(ForecastRequest('BTCUSDT', '1h', datetime.utcnow()))
+    finally:
+        server.shutdown()
+
+    assert len(actual) >= 7 * 24
+    assert actual.time.is_unique and actual.time.is_monotonic_increasing
+    assert (actual.time.diff().dropna() == actual.time.diff().dropna().iloc[0]).all()
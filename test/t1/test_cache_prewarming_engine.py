@@ -0,0 +1,80 @@
+'''This module contains T1 tests for the cache_prewarming_engine module.'''
+
+# Setup root directory to allow for importing modules from a different adjacent directory.
+import sys
+import os
+
+root_repo_path = os.getcwd()
+sys.path.append(f'{root_repo_path}/src')
+
+# Testing
+import pytest # noqa
+import threading # noqa
+import time # noqa
+from engines.cache_prewarming_engine import CachePrewarmingEngine # noqa
+
+
+def __wait_until_complete__(instance: CachePrewarmingEngine, timeout_in_seconds: float = 5):
+    deadline: float = time.monotonic() + timeout_in_seconds
+
+    while not instance.is_complete() and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def test_init_with_invalid_prewarm_should_raise_error():
+    expected: str = 'Valid prewarm is required.'
+
+    with pytest.raises(Exception) as e_info:
+        CachePrewarmingEngine(prewarm=None, keys=[])
+
+    assert str(e_info.value) == expected
+
+
+def test_get_status_before_start_should_report_pending_pairs():
+    instance: CachePrewarmingEngine = CachePrewarmingEngine(prewarm=lambda pair_name, period: None, keys=[('BTCUSDT', '1h')])
+
+    actual: dict = instance.get_status()
+
+    assert actual == {'is_complete': False, 'elapsed_in_seconds': None, 'pairs': {'BTCUSDT.1h': 'pending'}}
+
+
+def test_start_with_failing_pair_should_carry_on_with_remaining_pairs():
+    prewarmed: list = []
+
+    def prewarm(pair_name: str, period: str):
+        if pair_name == 'DOGEBTC':
+            raise Exception('Unknown pair.')
+
+        prewarmed.append((pair_name, period))
+
+    instance: CachePrewarmingEngine = CachePrewarmingEngine(prewarm=prewarm, keys=[('DOGEBTC', '1h'), ('BTCUSDT', '4h')])
+
+    instance.start()
+    __wait_until_complete__(instance)
+    actual: dict = instance.get_status()
+
+    assert prewarmed == [('BTCUSDT', '4h')]
+    assert actual['is_complete']
+    assert actual['pairs'] == {'DOGEBTC.1h': 'failed', 'BTCUSDT.4h': 'warm'}
+
+
+def test_start_should_not_block_and_only_prewarm_once():
+    release: threading.Event = threading.Event()
+    calls: list = []
+
+    def prewarm(pair_name: str, period: str):
+        calls.append(pair_name)
+        release.wait(5)
+
+    instance: CachePrewarmingEngine = CachePrewarmingEngine(prewarm=prewarm, keys=[('BTCUSDT', '1h')])
+
+    instance.start()
+    instance.start()
+
+    assert not instance.is_complete()
+
+    release.set()
+    __wait_until_complete__(instance)
+
+    assert instance.is_complete()
+    assert calls == ['BTCUSDT']
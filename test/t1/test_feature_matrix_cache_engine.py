@@ -0,0 +1,70 @@
+'''This module contains T1 tests for the feature_matrix_cache_engine module.'''
+
+# Setup root directory to allow for importing modules from a different adjacent directory.
+import sys
+import os
+
+root_repo_path = os.getcwd()
+sys.path.append(f'{root_repo_path}/src')
+sys.path.append(f'{root_repo_path}/test/stubs')
+
+# Testing
+import pytest # noqa
+import numpy as np # noqa
+import pandas as pd # noqa
+from synthetic_market_data_access import get_market_data_frame # noqa
+from engines.feature_pipeline_engine import FeaturePipelineEngine # noqa
+from engines.feature_matrix_cache_engine import FeatureMatrixCacheEngine # noqa
+
+
+def __get_feature_pipeline__(global_scaling_factor: int = 10) -> FeaturePipelineEngine:
+    return FeaturePipelineEngine(column_name_to_predict='close', data_time_column_name='time', global_scaling_factor=global_scaling_factor, feature_names=['open', 'volume', 't_hour', 't_day_of_week'])
+
+
+def test_get_features_with_invalid_feature_pipeline_should_raise_error():
+    expected: str = 'Valid feature_pipeline is required.'
+
+    with pytest.raises(Exception) as e_info:
+        FeatureMatrixCacheEngine().get_features('key', FeaturePipelineEngine(column_name_to_predict='close'), get_market_data_frame(10))
+
+    assert str(e_info.value) == expected
+
+
+def test_get_features_with_growing_and_sliding_windows_should_match_a_full_transform():
+    data: pd.DataFrame = get_market_data_frame(3000)
+    feature_pipeline: FeaturePipelineEngine = __get_feature_pipeline__()
+    instance: FeatureMatrixCacheEngine = FeatureMatrixCacheEngine(cache_max_age_in_seconds=60)
+
+    for start, end in ((0, 500), (0, 501), (0, 900), (100, 1400), (1300, 3000)):
+        window: pd.DataFrame = data.iloc[start:end]
+        expected_x, expected_y = feature_pipeline.transform(window)
+
+        actual_x, actual_y = instance.get_features('key', feature_pipeline, window)
+
+        assert np.array_equal(actual_x, expected_x) and np.array_equal(actual_y, expected_y)
+
+    assert instance.get_statistics()['items'] == 1
+
+
+def test_get_features_should_featurize_the_open_candle_afresh_and_slice_by_start_time():
+    data: pd.DataFrame = get_market_data_frame(100)
+    feature_pipeline: FeaturePipelineEngine = __get_feature_pipeline__()
+    instance: FeatureMatrixCacheEngine = FeatureMatrixCacheEngine(cache_max_age_in_seconds=60)
+    instance.get_features('key', feature_pipeline, data)
+    updated_data: pd.DataFrame = data.copy()
+    updated_data.iloc[-1, updated_data.columns.get_loc('open')] += 1
+
+    actual_x, actual_y = instance.get_features('key', feature_pipeline, updated_data, start_time=data.time.iloc[90])
+
+    assert np.array_equal(actual_x, feature_pipeline.transform(updated_data.iloc[90:])[0])
+    assert len(actual_y) == 10
+
+
+def test_get_features_with_a_different_scale_should_rebuild_the_matrix():
+    data: pd.DataFrame = get_market_data_frame(100)
+    instance: FeatureMatrixCacheEngine = FeatureMatrixCacheEngine(cache_max_age_in_seconds=60)
+    instance.get_features('key', __get_feature_pipeline__(10), data)
+
+    actual_x, actual_y = instance.get_features('key', __get_feature_pipeline__(100), data)
+
+    assert np.array_equal(actual_x, __get_feature_pipeline__(100).transform(data)[0])
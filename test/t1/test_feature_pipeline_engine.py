@@ -0,0 +1,68 @@
+'''This module contains T1 tests for the feature_pipeline_engine module.'''
+
+# Setup root directory to allow for importing modules from a different adjacent directory.
+import sys
+import os
+
+root_repo_path = os.getcwd()
+sys.path.append(f'{root_repo_path}/src')
+
+# Testing
+import pytest # noqa
+import numpy as np # noqa
+import pandas as pd # noqa
+from engines.feature_pipeline_engine import FeaturePipelineEngine # noqa
+
+
+def test_init_with_invalid_column_name_to_predict_should_raise_error():
+    expected: str = 'Valid column_name_to_predict is required.'
+
+    with pytest.raises(Exception) as e_info:
+        FeaturePipelineEngine(column_name_to_predict=None)
+
+    assert str(e_info.value) == expected
+
+
+def test_determine_common_scale_should_leave_at_most_one_decimal_on_the_first_values():
+    instance: FeaturePipelineEngine = FeaturePipelineEngine(column_name_to_predict='close')
+    data: pd.DataFrame = pd.DataFrame({'open': [0.0712, 1.0], 'close': [29345.12, 1.0], 'volume': [10, 20]})
+
+    assert instance.determine_common_scale(data) == 1000
+    assert instance.determine_common_scale(data[['volume']]) == 1
+
+
+def test_get_time_features_should_match_pandas_calendar_accessors():
+    instance: FeaturePipelineEngine = FeaturePipelineEngine(column_name_to_predict='close')
+    times: pd.Series = pd.Series(pd.date_range('2019-12-30 22:45', periods=500, freq='97min'))
+
+    actual: dict = instance.get_time_features(times.to_numpy())
+
+    assert (actual['t_year'] == times.dt.year).all()
+    assert (actual['t_month'] == times.dt.month).all()
+    assert (actual['t_day'] == times.dt.day).all()
+    assert (actual['t_hour'] == times.dt.hour).all()
+    assert (actual['t_minute'] == times.dt.minute).all()
+    assert (actual['t_day_of_year'] == times.dt.dayofyear).all()
+    assert (actual['t_day_of_week'] == times.dt.dayofweek).all()
+    assert (actual['t_quarter'] == times.dt.quarter).all()
+
+
+def test_transform_without_feature_names_should_raise_error():
+    expected: str = 'A fitted feature pipeline is required.'
+
+    with pytest.raises(Exception) as e_info:
+        FeaturePipelineEngine(column_name_to_predict='close').transform(pd.DataFrame({'close': [1.0]}))
+
+    assert str(e_info.value) == expected
+
+
+def test_transform_should_scale_order_and_shift_into_float32_arrays():
+    instance: FeaturePipelineEngine = FeaturePipelineEngine(column_name_to_predict='close', data_time_column_name='time', global_scaling_factor=10, feature_names=['t_hour', 'open', 'volume'])
+    data: pd.DataFrame = pd.DataFrame({'time': pd.date_range('2022-01-01 05:00', periods=3, freq='h'), 'open': [1.5, 2.5, 3.5], 'close': [2.0, 3.0, 4.0], 'volume': [7, 8, 9]})
+
+    x, y = instance.transform(data, shift_label=True)
+
+    assert x.dtype == np.float32 and x.flags['C_CONTIGUOUS']
+    assert x.tolist() == [[5, 15, 7], [6, 25, 8], [7, 35, 9]]
+    assert y.tolist() == [0, 20, 30]
+    assert instance.transform(data, include_label=False)[1] is None
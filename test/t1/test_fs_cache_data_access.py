@@ -11,6 +11,8 @@ sys.path.append(f'{root_repo_path}/src')
 import pytest # noqa
 from data.config_data_access import ConfigDataAccess # noqa
 from data.fs_cache_data_access import FsCacheDataAccess # noqa
+import numpy as np # noqa
+import json # noqa
 
 # Clear out test data.
 import glob # noqa
@@ -119,3 +121,147 @@ def test_write_to_cache_with_valid_params_should_write_file():
     does_file_exist: bool = os.path.isfile(file_name)
 
     assert does_file_exist
+
+
+def test_write_klines_to_cache_with_valid_params_should_return_columns():
+    key: str = 'test.klines'
+    data = [
+        [1640995200000, '1.5', '2.5', '0.5', '2.0', '100.0', 1640998799999, '0', 1, '0', '0', '0'],
+        [1640998800000, '2.0', '3.0', '1.0', '2.5', '200.0', 1641002399999, '0', 1, '0', '0', '0']
+    ]
+    config: ConfigDataAccess = ConfigDataAccess()
+    config.data_dir_relative_path = f'{config.data_dir_relative_path}_tmp'
+    instance: FsCacheDataAccess = FsCacheDataAccess(config_data_access=config)
+
+    instance.write_klines_to_cache(key=key, data=data)
+
+    actual: dict = instance.get_klines_from_cache(key=key)
+
+    assert list(actual['time']) == [1640995200000, 1640998800000]
+    assert list(actual['close']) == [2.0, 2.5]
+    assert list(actual['volume']) == [100.0, 200.0]
+
+
+def test_decode_klines_with_exchange_payload_should_match_parsed_klines():
+    data = [
+        [1640995200000, '46216.93000000', '46731.39000000', '46208.37000000', '46656.13000000', '1503.33095000', 1640998799999, '69879374.46755150', 38608, '806.43860000', '37480120.60589830', '0'],
+        [1640998800000, '46656.14000000', '46949.99000000', '46574.06000000', '46778.14000000', '943.81539000', 1641002399999, '44127523.88264880', 24953, '479.89524000', '22438084.01592030', '0']
+    ]
+    config: ConfigDataAccess = ConfigDataAccess()
+    instance: FsCacheDataAccess = FsCacheDataAccess(config_data_access=config)
+    expected: dict = instance.klines_to_columns(data)
+
+    for payload in (json.dumps(data, separators=(',', ':')).encode(), json.dumps(data)):
+        actual: dict = instance.decode_klines(payload)
+
+        assert actual.keys() == expected.keys()
+
+        for name in expected.keys():
+            assert actual[name].dtype == expected[name].dtype
+            assert list(actual[name]) == list(expected[name])
+
+
+def test_decode_klines_with_empty_payload_should_return_empty_columns():
+    instance: FsCacheDataAccess = FsCacheDataAccess(config_data_access=ConfigDataAccess())
+
+    actual: dict = instance.decode_klines(b'[]')
+
+    assert len(actual['time']) == 0
+    assert actual['time'].dtype == np.int64
+
+
+def test_decode_klines_with_invalid_payload_should_raise_error():
+    expected: str = 'Valid kline payload is required.'
+    instance: FsCacheDataAccess = FsCacheDataAccess(config_data_access=ConfigDataAccess())
+
+    for payload in (b'{"code": -1121, "msg": "Invalid symbol."}', b'[[1000, "1", "1"]]', b'[[1000, "1", "1", "1", "1", "1"], [2000, "1", "1"]]'):
+        with pytest.raises(Exception) as e_info:
+            instance.decode_klines(payload)
+
+        assert str(e_info.value) == expected
+
+
+def test_get_klines_from_cache_with_start_time_should_return_window():
+    key: str = 'test.klines.window'
+    data = [[1000 * i, '1', '1', '1', str(i), '1'] for i in range(10)]
+    config: ConfigDataAccess = ConfigDataAccess()
+    config.data_dir_relative_path = f'{config.data_dir_relative_path}_tmp'
+    instance: FsCacheDataAccess = FsCacheDataAccess(config_data_access=config)
+
+    instance.write_klines_to_cache(key=key, data=data)
+
+    actual: dict = instance.get_klines_from_cache(key=key, start_time_ms=7000)
+
+    assert list(actual['time']) == [7000, 8000, 9000]
+
+
+def test_get_klines_from_cache_with_legacy_file_should_migrate_data():
+    key: str = 'test.klines.legacy'
+    data = [
+        [1000, '1', '1', '1', '1', '1'],
+        [2000, '2', '2', '2', '2', '2'],
+        [2000, '3', '3', '3', '3', '3'],
+        [3000, '4', '4', '4', '4', '4']
+    ]
+    config: ConfigDataAccess = ConfigDataAccess()
+    config.data_dir_relative_path = f'{config.data_dir_relative_path}_tmp'
+    instance: FsCacheDataAccess = FsCacheDataAccess(config_data_access=config)
+
+    instance.write_to_cache(key=key, data=data)
+
+    actual: dict = instance.get_klines_from_cache(key=key)
+
+    assert list(actual['time']) == [1000, 2000, 3000]
+    assert list(actual['close']) == [1.0, 3.0, 4.0]
+    assert os.path.isfile(f'{instance.data_dir_path}/{key}.fak')
+
+
+def test_append_klines_to_cache_with_overlapping_kline_should_replace_boundary():
+    key: str = 'test.klines.append'
+    config: ConfigDataAccess = ConfigDataAccess()
+    config.data_dir_relative_path = f'{config.data_dir_relative_path}_tmp'
+    instance: FsCacheDataAccess = FsCacheDataAccess(config_data_access=config)
+
+    instance.write_klines_to_cache(key=key, data=[[1000, '1', '1', '1', '1', '1'], [2000, '2', '2', '2', '2', '2']])
+
+    actual_last_time: int = instance.append_klines_to_cache(key=key, data=[[2000, '3', '3', '3', '3', '3'], [3000, '4', '4', '4', '4', '4']])
+    actual: dict = instance.get_klines_from_cache(key=key)
+
+    assert actual_last_time == 3000
+    assert list(actual['time']) == [1000, 2000, 3000]
+    assert list(actual['close']) == [1.0, 3.0, 4.0]
+
+
+def test_append_klines_to_cache_beyond_capacity_should_keep_all_klines():
+    key: str = 'test.klines.grow'
+    config: ConfigDataAccess = ConfigDataAccess()
+    config.data_dir_relative_path = f'{config.data_dir_relative_path}_tmp'
+    instance: FsCacheDataAccess = FsCacheDataAccess(config_data_access=config)
+
+    for page in range(3):
+        instance.append_klines_to_cache(key=key, data=[[i, '1', '1', '1', str(i), '1'] for i in range(page * 1000, (page + 1) * 1000 + 1)])
+
+    actual: dict = instance.get_klines_from_cache(key=key)
+
+    assert list(actual['time']) == list(range(3001))
+    assert list(actual['close']) == [float(i) for i in range(3001)]
+
+
+def test_append_klines_to_cache_after_interrupted_append_should_resume_from_last_durable_kline():
+    key: str = 'test.klines.resume'
+    config: ConfigDataAccess = ConfigDataAccess()
+    config.data_dir_relative_path = f'{config.data_dir_relative_path}_tmp'
+    instance: FsCacheDataAccess = FsCacheDataAccess(config_data_access=config)
+
+    instance.write_klines_to_cache(key=key, data=[[1000, '1', '1', '1', '1', '1']])
+
+    # Simulate a crash after the column data was written but before the header count was committed.
+    with open(f'{instance.data_dir_path}/{key}.fak', 'r+b') as f:
+        f.seek(64 + 8)
+        f.write((9999).to_bytes(8, 'little'))
+
+    assert list(instance.get_klines_from_cache(key=key)['time']) == [1000]
+
+    instance.append_klines_to_cache(key=key, data=[[1000, '1', '1', '1', '1', '1'], [2000, '2', '2', '2', '2', '2']])
+
+    assert list(instance.get_klines_from_cache(key=key)['time']) == [1000, 2000]
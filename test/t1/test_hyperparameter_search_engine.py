@@ -0,0 +1,72 @@
+'''This module contains T1 tests for the hyperparameter_search_engine module.'''
+
+# Setup root directory to allow for importing modules from a different adjacent directory.
+import sys
+import os
+
+root_repo_path = os.getcwd()
+sys.path.append(f'{root_repo_path}/src')
+
+# Testing
+import pytest # noqa
+import numpy as np # noqa
+from engines.hyperparameter_search_engine import HyperparameterSearchEngine # noqa
+
+parameter_range: dict = {
+    'learning_rate': [0.3, 0.03],
+    'max_depth': [2, 6],
+    'objective': ['reg:squarederror']
+}
+
+
+def test_init_with_invalid_parameter_range_should_raise_error():
+    expected: str = 'Valid parameter_range is required.'
+
+    with pytest.raises(Exception) as e_info:
+        HyperparameterSearchEngine(parameter_range={})
+
+    assert str(e_info.value) == expected
+
+
+def test_init_with_invalid_reduction_factor_should_raise_error():
+    expected: str = 'Valid reduction_factor is required.'
+
+    with pytest.raises(Exception) as e_info:
+        HyperparameterSearchEngine(parameter_range=parameter_range, reduction_factor=1)
+
+    assert str(e_info.value) == expected
+
+
+def test_get_candidates_should_sample_reproducibly_within_the_range():
+    instance: HyperparameterSearchEngine = HyperparameterSearchEngine(parameter_range=parameter_range, max_candidates=3)
+
+    actual: list = instance.get_candidates()
+
+    assert len(actual) == 3
+    assert actual == HyperparameterSearchEngine(parameter_range=parameter_range, max_candidates=3).get_candidates()
+    assert all(candidate['learning_rate'] in parameter_range['learning_rate'] and candidate['max_depth'] in parameter_range['max_depth'] for candidate in actual)
+
+
+def test_get_splits_should_always_validate_after_training():
+    instance: HyperparameterSearchEngine = HyperparameterSearchEngine(parameter_range=parameter_range, split_count=3)
+
+    assert instance.get_splits(10) == [(2, 4), (4, 6), (6, 10)]
+
+    with pytest.raises(Exception) as e_info:
+        instance.get_splits(3)
+
+    assert str(e_info.value) == 'At least 4 rows are required.'
+
+
+def test_search_should_return_parameters_from_the_range():
+    x: np.ndarray = np.arange(400, dtype=np.float32).reshape(200, 2)
+    y: np.ndarray = x[:, 0] * 2 + 1
+    instance: HyperparameterSearchEngine = HyperparameterSearchEngine(parameter_range=parameter_range, min_boost_rounds=5, max_boost_rounds=15, thread_count=1)
+
+    actual: dict = instance.search(x, y, base_parameters={'eval_metric': 'rmse'})
+
+    assert actual['parameters']['learning_rate'] in parameter_range['learning_rate']
+    assert actual['parameters']['max_depth'] in parameter_range['max_depth']
+    assert actual['parameters']['eval_metric'] == 'rmse'
+    assert 'nthread' not in actual['parameters']
+    assert 1 <= actual['num_boost_round'] <= 15
@@ -0,0 +1,58 @@
+'''This module contains T1 tests for the kline_resampling_data_access module.'''
+
+# Setup root directory to allow for importing modules from a different adjacent directory.
+import sys
+import os
+
+root_repo_path = os.getcwd()
+sys.path.append(f'{root_repo_path}/src')
+
+# Testing
+import pytest # noqa
+import numpy as np # noqa
+from datetime import datetime, timezone # noqa
+from data.kline_resampling_data_access import get_finer_periods, get_interval_start, resample_klines # noqa
+
+HOUR_IN_MS = 60 * 60 * 1000
+
+
+def test_get_finer_periods_should_only_return_aligned_intervals_coarsest_first():
+    assert get_finer_periods('4h') == ['2h', '1h', '30m', '15m', '5m', '3m', '1m']
+    assert '3d' not in get_finer_periods('1w')
+    assert get_finer_periods('1w')[0] == '1d'
+    assert get_finer_periods('1M') == []
+
+
+def test_get_interval_start_for_weekly_interval_should_return_monday():
+    time_ms: int = int(datetime(2022, 1, 6, 13, tzinfo=timezone.utc).timestamp() * 1000)
+
+    actual: datetime = datetime.fromtimestamp(get_interval_start(time_ms, '1w') / 1000, tz=timezone.utc)
+
+    assert actual == datetime(2022, 1, 3, tzinfo=timezone.utc)
+
+
+def test_resample_klines_should_aggregate_ohlcv_per_interval():
+    columns: dict = {
+        'time': np.arange(6, dtype=np.int64) * HOUR_IN_MS + 2 * HOUR_IN_MS,
+        'open': np.array([1.0, 2.0, 3.0, 4.0, 5.0, 6.0]),
+        'high': np.array([1.5, 2.5, 9.5, 4.5, 5.5, 6.5]),
+        'low': np.array([0.5, 1.5, 2.5, 0.1, 4.5, 5.5]),
+        'close': np.array([2.0, 3.0, 4.0, 5.0, 6.0, 7.0]),
+        'volume': np.array([10.0, 20.0, 30.0, 40.0, 50.0, 60.0])
+    }
+
+    actual: dict = resample_klines(columns, '4h')
+
+    assert list(actual['time']) == [0, 4 * HOUR_IN_MS]
+    assert list(actual['open']) == [1.0, 3.0]
+    assert list(actual['high']) == [2.5, 9.5]
+    assert list(actual['low']) == [0.5, 0.1]
+    assert list(actual['close']) == [3.0, 7.0]
+    assert list(actual['volume']) == [30.0, 180.0]
+
+
+def test_resample_klines_with_no_klines_should_return_empty_columns():
+    actual: dict = resample_klines({'time': np.empty(0, dtype=np.int64)}, '1d')
+
+    assert len(actual['time']) == 0
+    assert actual['time'].dtype == np.int64
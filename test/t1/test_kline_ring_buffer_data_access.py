@@ -0,0 +1,75 @@
+'''This module contains T1 tests for the kline_ring_buffer_data_access module.'''
+
+# Setup root directory to allow for importing modules from a different adjacent directory.
+import sys
+import os
+
+root_repo_path = os.getcwd()
+sys.path.append(f'{root_repo_path}/src')
+
+# Testing
+import pytest # noqa
+import numpy as np # noqa
+from data.kline_ring_buffer_data_access import KlineRingBufferDataAccess # noqa
+
+
+def __get_columns__(open_times: list, close: float = 1.0) -> dict:
+    count: int = len(open_times)
+
+    return {
+        'time': np.array(open_times, dtype=np.int64),
+        'open': np.full(count, close),
+        'high': np.full(count, close),
+        'low': np.full(count, close),
+        'close': np.full(count, close),
+        'volume': np.full(count, 10.0)
+    }
+
+
+def test_track_with_invalid_capacity_should_raise_error():
+    expected: str = 'Valid capacity is required.'
+
+    with pytest.raises(Exception) as e_info:
+        KlineRingBufferDataAccess().track('DOGEBTC.1h', 0)
+
+    assert str(e_info.value) == expected
+
+
+def test_upsert_before_seed_should_not_buffer():
+    instance: KlineRingBufferDataAccess = KlineRingBufferDataAccess()
+    instance.track('DOGEBTC.1h', 4)
+
+    assert not instance.upsert('DOGEBTC.1h', __get_columns__([1]))
+    assert instance.get_klines('DOGEBTC.1h') is None
+
+
+def test_upsert_should_replace_live_kline_and_wrap_around_oldest():
+    instance: KlineRingBufferDataAccess = KlineRingBufferDataAccess()
+    instance.track('DOGEBTC.1h', 4)
+    instance.seed('DOGEBTC.1h', __get_columns__([0, 1, 2, 3, 4]))
+
+    instance.upsert('DOGEBTC.1h', __get_columns__([4], close=2.0), interval_in_ms=1)
+    instance.upsert('DOGEBTC.1h', __get_columns__([3, 5, 6], close=3.0), interval_in_ms=1)
+    actual: dict = instance.get_klines('DOGEBTC.1h')
+
+    assert actual['time'].tolist() == [3, 4, 5, 6]
+    assert actual['close'].tolist() == [1.0, 2.0, 3.0, 3.0]
+    assert instance.get_klines('DOGEBTC.1h', start_time_ms=5)['time'].tolist() == [5, 6]
+
+
+def test_upsert_with_gap_should_unseed_key():
+    instance: KlineRingBufferDataAccess = KlineRingBufferDataAccess()
+    instance.track('DOGEBTC.1h', 4)
+    instance.seed('DOGEBTC.1h', __get_columns__([0, 1]))
+
+    assert not instance.upsert('DOGEBTC.1h', __get_columns__([3]), interval_in_ms=1)
+    assert instance.get_klines('DOGEBTC.1h') is None
+    assert instance.is_tracked('DOGEBTC.1h')
+
+
+def test_get_klines_older_than_max_age_should_return_none():
+    instance: KlineRingBufferDataAccess = KlineRingBufferDataAccess()
+    instance.track('DOGEBTC.1h', 4)
+    instance.seed('DOGEBTC.1h', __get_columns__([0, 1]))
+
+    assert instance.get_klines('DOGEBTC.1h', max_age_in_seconds=-1) is None
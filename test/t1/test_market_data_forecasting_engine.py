@@ -0,0 +1,157 @@
+'''This module contains T1 tests for the market_data_forecasting_engine module.'''
+
+# Setup root directory to allow for importing modules from a different adjacent directory.
+import sys
+import os
+
+root_repo_path = os.getcwd()
+sys.path.append(f'{root_repo_path}/src')
+sys.path.append(f'{root_repo_path}/test/stubs')
+
+# Testing
+import pytest # noqa
+import numpy as np # noqa
+import pandas as pd # noqa
+from synthetic_market_data_access import get_market_data_frame # noqa
+from data.config_data_access import ConfigDataAccess # noqa
+from data.model_registry_data_access import ModelRegistryDataAccess # noqa
+from engines.market_data_forecasting_engine import MarketDataForecastingEngine, __run_backtest_fold__ # noqa
+
+
+def test_backtest_with_invalid_retrain_stride_should_raise_error():
+    expected: str = 'Valid retrain_stride is required.'
+    data: pd.DataFrame = get_market_data_frame(200)
+    instance: MarketDataForecastingEngine = MarketDataForecastingEngine()
+
+    with pytest.raises(Exception) as e_info:
+        instance.backtest(data, data.time.iloc[0], data.time.iloc[-1], retrain_stride=0)
+
+    assert str(e_info.value) == expected
+
+
+def test_backtest_without_enough_training_candles_should_raise_error():
+    expected: str = 'At least 100 candles are required before the backtest start time.'
+    data: pd.DataFrame = get_market_data_frame(50)
+    instance: MarketDataForecastingEngine = MarketDataForecastingEngine()
+
+    with pytest.raises(Exception) as e_info:
+        instance.backtest(data, data.time.iloc[0], data.time.iloc[-1], retrain_stride=10)
+
+    assert str(e_info.value) == expected
+
+
+def test_backtest_with_missing_market_data_should_raise_error():
+    expected: str = 'Valid market_data is required.'
+    instance: MarketDataForecastingEngine = MarketDataForecastingEngine()
+
+    with pytest.raises(Exception) as e_info:
+        instance.backtest(None, '2022-01-01', '2022-01-02', retrain_stride=10)
+
+    assert str(e_info.value) == expected
+
+
+def test_backtest_should_predict_each_fold_and_summarize_errors():
+    data: pd.DataFrame = get_market_data_frame(125)
+    instance: MarketDataForecastingEngine = MarketDataForecastingEngine(training_profile='fast')
+
+    actual: list = list(instance.backtest(data, data.time.iloc[100], data.time.iloc[-1], retrain_stride=10, max_workers=2))
+    folds: list = sorted(actual[:-1], key=lambda fold: fold['fold'])
+    summary: dict = actual[-1]['summary']
+
+    assert [len(fold['time']) for fold in folds] == [10, 10, 5]
+
+    for fold, start in zip(folds, (100, 110, 120)):
+        testing_data: pd.DataFrame = data.iloc[start:start + len(fold['time'])]
+        expected: dict = __run_backtest_fold__(fold['fold'], data.iloc[:start], testing_data, 1, 'fast')
+
+        assert fold['time'] == [str(time) for time in testing_data.time]
+        assert fold['actual_closing_prices'] == testing_data.close.tolist()
+        assert fold['predicted_closing_prices'] == pytest.approx(expected['predicted_closing_prices'], rel=1e-4)
+
+    error: np.ndarray = np.concatenate([np.array(fold['actual_closing_prices']) - np.array(fold['predicted_closing_prices']) for fold in folds])
+    actual_closing_prices: np.ndarray = data.close.values[100:]
+
+    assert summary['fold_count'] == 3
+    assert summary['step_count'] == 25
+    assert summary['mae'] == pytest.approx(np.mean(np.abs(error)))
+    assert summary['rmse'] == pytest.approx(np.sqrt(np.mean(error ** 2)))
+    assert summary['mape'] == pytest.approx(np.mean(np.abs(error / actual_closing_prices)) * 100)
+
+
+def test_get_close_predictions_should_match_predicting_each_candle_on_its_own():
+    data: pd.DataFrame = get_market_data_frame(300)
+    instance: MarketDataForecastingEngine = MarketDataForecastingEngine(training_profile='fast')
+    window: pd.DataFrame = data.iloc[250:]
+
+    actual: pd.Series = instance.get_close_predictions(data, '1h', 'DOGEBTC', start_time=window.time.values[0])
+    model = instance.get_trained_model(data, '1h', 'DOGEBTC')
+    expected: list = [model.predict(future_data=window.loc[str(index):].head(1)).values[0] for index in window.index]
+
+    assert actual.index.equals(window.index)
+    assert actual.tolist() == pytest.approx(expected)
+
+
+def test_init_with_invalid_training_profile_should_raise_error():
+    expected: str = 'Valid training_profile is required.'
+
+    with pytest.raises(Exception) as e_info:
+        MarketDataForecastingEngine(training_profile='RandomProfile')
+
+    assert str(e_info.value) == expected
+
+
+def test_get_training_profile_should_prefer_requested_then_pair_then_default_profile():
+    instance: MarketDataForecastingEngine = MarketDataForecastingEngine(training_profile='balanced', training_profiles_by_pair={'BTCUSDT': 'accurate'})
+
+    assert instance.get_training_profile('1h', 'DOGEBTC') == 'balanced'
+    assert instance.get_training_profile('1h', 'BTCUSDT') == 'accurate'
+    assert instance.get_training_profile('1h', 'BTCUSDT', 'fast') == 'fast'
+    assert instance.get_training_profile('1h', 'BTCUSDT') == 'fast'
+    assert instance.get_training_profile('4h', 'BTCUSDT') == 'accurate'
+
+
+def test_restore_model_should_only_load_persisted_models(tmp_path):
+    config: ConfigDataAccess = ConfigDataAccess()
+    config.model_dir_relative_path = os.path.relpath(tmp_path, os.getcwd())
+    registry: ModelRegistryDataAccess = ModelRegistryDataAccess(config_data_access=config)
+    data: pd.DataFrame = get_market_data_frame(200)
+
+    assert not MarketDataForecastingEngine(model_registry_data_access=registry, training_profile='fast').restore_model(data, '1h', 'DOGEBTC')
+    assert registry.get_model('DOGEBTC-1h') is None
+
+    MarketDataForecastingEngine(model_registry_data_access=registry, training_profile='fast').get_trained_model(data, '1h', 'DOGEBTC')
+
+    assert MarketDataForecastingEngine(model_registry_data_access=registry, training_profile='fast').restore_model(data, '1h', 'DOGEBTC')
+
+
+def test_get_training_profile_with_registry_should_share_requested_profile_across_instances(tmp_path):
+    config: ConfigDataAccess = ConfigDataAccess()
+    config.model_dir_relative_path = os.path.relpath(tmp_path, os.getcwd())
+    registry: ModelRegistryDataAccess = ModelRegistryDataAccess(config_data_access=config)
+    instance: MarketDataForecastingEngine = MarketDataForecastingEngine(model_registry_data_access=registry, training_profile='balanced')
+    other_instance: MarketDataForecastingEngine = MarketDataForecastingEngine(model_registry_data_access=registry, training_profile='balanced')
+
+    assert other_instance.get_training_profile('1h', 'BTCUSDT') == 'balanced'
+    assert instance.get_training_profile('1h', 'BTCUSDT', 'fast') == 'fast'
+    assert MarketDataForecastingEngine(model_registry_data_access=registry, training_profile='balanced').get_training_profile('1h', 'BTCUSDT') == 'fast'
+    assert other_instance.get_training_profile('4h', 'BTCUSDT') == 'balanced'
+
+    other_instance.train_model(get_market_data_frame(200), '1h', 'BTCUSDT')
+
+    assert other_instance.get_training_profile('1h', 'BTCUSDT') == 'fast'
+
+
+def test_get_training_profile_with_registry_should_only_read_and_write_the_registry_when_needed(tmp_path, monkeypatch):
+    config: ConfigDataAccess = ConfigDataAccess()
+    config.model_dir_relative_path = os.path.relpath(tmp_path, os.getcwd())
+    registry: ModelRegistryDataAccess = ModelRegistryDataAccess(config_data_access=config)
+    instance: MarketDataForecastingEngine = MarketDataForecastingEngine(model_registry_data_access=registry, training_profile='balanced')
+    registry_calls: list = []
+    get_training_profile, save_training_profile = registry.get_training_profile, registry.save_training_profile
+    monkeypatch.setattr(registry, 'get_training_profile', lambda key: registry_calls.append('get') or get_training_profile(key))
+    monkeypatch.setattr(registry, 'save_training_profile', lambda key, training_profile: registry_calls.append('save') or save_training_profile(key, training_profile))
+
+    for training_profile in (None, 'fast', None, 'fast', None):
+        instance.get_training_profile('1h', 'BTCUSDT', training_profile)
+
+    assert registry_calls == ['get', 'save']
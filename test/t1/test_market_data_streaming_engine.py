@@ -0,0 +1,121 @@
+'''This module contains T1 tests for the market_data_streaming_engine module.'''
+
+# Setup root directory to allow for importing modules from a different adjacent directory.
+import sys
+import os
+
+root_repo_path = os.getcwd()
+sys.path.append(f'{root_repo_path}/src')
+sys.path.append(f'{root_repo_path}/test/stubs')
+
+# Testing
+import pytest # noqa
+import time # noqa
+from datetime import datetime # noqa
+from data.config_data_access import ConfigDataAccess # noqa
+from data.fs_cache_data_access import FsCacheDataAccess # noqa
+from data.binance_data_access import BinanceDataAccess # noqa
+from data.kline_ring_buffer_data_access import KlineRingBufferDataAccess # noqa
+from data.kline_stream_data_access import LocalKlineStreamDataAccess # noqa
+from synthetic_market_data_access import SyntheticMarketDataAccess # noqa
+from engines.market_data_streaming_engine import MarketDataStreamingEngine # noqa
+from models.binance import ForecastRequest # noqa
+
+HOUR_IN_MS = 60 * 60 * 1000
+
+
+def __get_data_access__(pair_name: str) -> BinanceDataAccess:
+    config: ConfigDataAccess = ConfigDataAccess()
+    config.data_dir_relative_path = f'{config.data_dir_relative_path}_tmp'
+    config.window_length_in_days = 7
+    cache_data_access: FsCacheDataAccess = FsCacheDataAccess(config_data_access=config)
+    instance: BinanceDataAccess = BinanceDataAccess(config_data_access=config, cache_data_access=cache_data_access, kline_buffer_data_access=KlineRingBufferDataAccess())
+    synthetic_data_access: SyntheticMarketDataAccess = SyntheticMarketDataAccess()
+    instance.__get_market_data_from_binance__ = lambda pair, start, end, period, *a, **k: synthetic_data_access.get_klines(pair, period, int(start), int(end), 1000)
+
+    for file_name in (f'{cache_data_access.data_dir_path}/{pair_name}.1h.fak', f'{cache_data_access.data_dir_path}/{pair_name}.1h'):
+        if os.path.isfile(file_name):
+            os.remove(file_name)
+
+    return instance
+
+
+def __wait_for__(condition, timeout_in_seconds: float = 5) -> bool:
+    deadline: float = time.monotonic() + timeout_in_seconds
+
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+
+        time.sleep(0.01)
+
+    return False
+
+
+def test_init_without_stream_when_enabled_should_raise_error():
+    expected: str = 'Valid stream_data_access is required.'
+
+    with pytest.raises(Exception) as e_info:
+        MarketDataStreamingEngine(stream_data_access=None, binance_data_access=__get_data_access__('STREAMA'))
+
+    assert str(e_info.value) == expected
+
+
+def test_register_when_disabled_should_not_subscribe():
+    stream_data_access: LocalKlineStreamDataAccess = LocalKlineStreamDataAccess()
+    instance: MarketDataStreamingEngine = MarketDataStreamingEngine(stream_data_access=stream_data_access, binance_data_access=__get_data_access__('STREAMB'), is_enabled=False)
+
+    instance.register('STREAMB', '1h')
+
+    assert instance.get_active_keys() == []
+    assert stream_data_access.get_subscriptions() == []
+
+
+def test_streamed_klines_should_be_served_from_memory_and_persisted_once_closed():
+    pair_name: str = 'STREAMC'
+    data_access: BinanceDataAccess = __get_data_access__(pair_name)
+    stream_data_access: LocalKlineStreamDataAccess = LocalKlineStreamDataAccess()
+    instance: MarketDataStreamingEngine = MarketDataStreamingEngine(stream_data_access=stream_data_access, binance_data_access=data_access)
+    request: ForecastRequest = ForecastRequest(pair_name, '1h', datetime.utcnow())
+
+    instance.register(pair_name, '1h')
+    seeded_data = data_access.get_market_data(request)
+    live_open_time: int = int(seeded_data.time.values[-1].astype('datetime64[ms]').astype('int64'))
+    live_kline: list = [live_open_time, '1.0', '3.0', '0.5', '2.0', '10.0', live_open_time + HOUR_IN_MS - 1, '0', 1, '0', '0', '0']
+    next_kline: list = [live_open_time + HOUR_IN_MS, '2.0', '2.0', '2.0', '2.0', '1.0', live_open_time + 2 * HOUR_IN_MS - 1, '0', 1, '0', '0', '0']
+    data_access.__get_market_data_from_binance__ = None
+
+    stream_data_access.publish(pair_name, '1h', live_kline, is_closed=True)
+    stream_data_access.publish(pair_name, '1h', next_kline)
+
+    assert __wait_for__(lambda: len(data_access.get_market_data(request)) == len(seeded_data) + 1)
+    actual = data_access.get_market_data(request)
+    cached_columns: dict = data_access.cache_data_access.get_klines_from_cache(f'{pair_name}.1h')
+
+    assert actual.close.values[-2:].tolist() == [2.0, 2.0]
+    assert actual.high.values[-2] == 3.0
+    assert int(cached_columns['time'][-1]) == live_open_time
+    assert cached_columns['close'][-1] == 2.0
+    assert instance.get_active_keys() == [(pair_name, '1h')]
+
+    instance.stop()
+
+
+def test_ingest_closed_klines_after_a_dropped_candle_should_keep_the_cache_contiguous():
+    pair_name: str = 'STREAMD'
+    data_access: BinanceDataAccess = __get_data_access__(pair_name)
+    synthetic_data_access: SyntheticMarketDataAccess = SyntheticMarketDataAccess()
+    live_open_time: int = int(time.time() * 1000) // HOUR_IN_MS * HOUR_IN_MS
+    data_access.cache_data_access.write_klines_to_cache(f'{pair_name}.1h', synthetic_data_access.get_klines(pair_name, '1h', live_open_time - 200 * HOUR_IN_MS, live_open_time - 4 * HOUR_IN_MS, 1000))
+
+    data_access.ingest_live_klines(pair_name, '1h', synthetic_data_access.get_klines(pair_name, '1h', live_open_time - 3 * HOUR_IN_MS, live_open_time - 3 * HOUR_IN_MS), is_closed=True)
+    # The candle opened 2 hours ago is dropped by the stream.
+    data_access.ingest_live_klines(pair_name, '1h', synthetic_data_access.get_klines(pair_name, '1h', live_open_time - HOUR_IN_MS, live_open_time - HOUR_IN_MS), is_closed=True)
+
+    assert int(data_access.cache_data_access.get_klines_from_cache(f'{pair_name}.1h')['time'][-1]) == live_open_time - 3 * HOUR_IN_MS
+
+    data_access.get_market_data(ForecastRequest(pair_name, '1h', datetime.utcnow()))
+    actual: dict = data_access.cache_data_access.get_klines_from_cache(f'{pair_name}.1h')
+
+    assert set((actual['time'][1:] - actual['time'][:-1]).tolist()) == {HOUR_IN_MS}
+    assert int(actual['time'][-1]) == live_open_time
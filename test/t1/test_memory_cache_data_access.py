@@ -0,0 +1,98 @@
+'''This module contains T1 tests for the memory_cache_data_access module.'''
+
+# Setup root directory to allow for importing modules from a different adjacent directory.
+import sys
+import os
+
+root_repo_path = os.getcwd()
+sys.path.append(f'{root_repo_path}/src')
+
+# Testing
+import pytest # noqa
+import numpy as np # noqa
+from data.memory_cache_data_access import MemoryCacheDataAccess # noqa
+
+
+def test_get_from_cache_with_invalid_key_should_raise_error():
+    expected: str = 'Valid key is required.'
+
+    with pytest.raises(Exception) as e_info:
+        MemoryCacheDataAccess().get_from_cache(key=None)
+
+    assert str(e_info.value) == expected
+
+
+def test_write_to_cache_with_invalid_data_should_raise_error():
+    expected: str = 'Valid data is required.'
+
+    with pytest.raises(Exception) as e_info:
+        MemoryCacheDataAccess().write_to_cache(key='test.key', data=None)
+
+    assert str(e_info.value) == expected
+
+
+def test_get_from_cache_with_existing_key_should_return_data_and_count_hit():
+    instance: MemoryCacheDataAccess = MemoryCacheDataAccess()
+
+    instance.write_to_cache(key='test.key', data=['hello', 'world'])
+
+    assert instance.get_from_cache(key='test.key') == ['hello', 'world']
+    assert instance.get_from_cache(key='RandomKey') is None
+    assert instance.get_statistics()['hits'] == 1
+    assert instance.get_statistics()['misses'] == 1
+
+
+def test_get_from_cache_with_expired_key_should_return_none():
+    instance: MemoryCacheDataAccess = MemoryCacheDataAccess(cache_max_age_in_seconds=-1)
+
+    instance.write_to_cache(key='test.key', data='data')
+
+    assert instance.get_from_cache(key='test.key') is None
+    assert instance.get_statistics()['expirations'] == 1
+
+
+def test_write_to_cache_beyond_byte_budget_should_evict_least_recently_used():
+    instance: MemoryCacheDataAccess = MemoryCacheDataAccess(cache_max_age_in_seconds=60, max_allowed_bytes=2000)
+
+    instance.write_to_cache(key='a', data=np.zeros(100))
+    instance.write_to_cache(key='b', data=np.zeros(100))
+    instance.get_from_cache(key='a')
+    instance.write_to_cache(key='c', data=np.zeros(100))
+
+    assert instance.get_from_cache(key='b') is None
+    assert instance.get_from_cache(key='a') is not None
+    assert instance.get_from_cache(key='c') is not None
+    assert instance.get_statistics()['evictions'] == 1
+    assert instance.get_statistics()['size_in_bytes'] == 1600
+
+
+def test_write_to_cache_should_never_render_values_in_logs(caplog):
+    class Unprintable():
+        def __repr__(self):
+            raise Exception('Values must not be rendered.')
+
+    instance: MemoryCacheDataAccess = MemoryCacheDataAccess(cache_max_age_in_seconds=60)
+
+    with caplog.at_level('DEBUG'):
+        instance.write_to_cache(key='test.key', data=Unprintable())
+        instance.get_from_cache(key='test.key')
+
+    assert 'test.key' in caplog.text
+
+
+def test_write_to_cache_with_model_should_use_its_measured_size_instead_of_serializing_it():
+    class UnserializableBooster():
+        def save_raw(self):
+            raise AssertionError('The booster should not be serialized on cache writes.')
+
+    class Model():
+        def __init__(self):
+            self.model = UnserializableBooster()
+            self.model_size_in_bytes = 5000
+            self.feature_names = ['a', 'b']
+
+    instance: MemoryCacheDataAccess = MemoryCacheDataAccess(cache_max_age_in_seconds=60)
+
+    instance.write_to_cache(key='model', data=Model())
+
+    assert instance.get_statistics()['size_in_bytes'] > 5000
@@ -0,0 +1,50 @@
+'''This module contains T1 tests for the metrics_data_access module.'''
+
+# Setup root directory to allow for importing modules from a different adjacent directory.
+import sys
+import os
+
+root_repo_path = os.getcwd()
+sys.path.append(f'{root_repo_path}/src')
+
+# Testing
+import pytest # noqa
+from data.metrics_data_access import MetricsDataAccess # noqa
+
+
+def test_render_with_counters_and_gauges_should_render_labeled_samples():
+    instance: MetricsDataAccess = MetricsDataAccess()
+
+    instance.increment('requests_total', {'status': 200})
+    instance.increment('requests_total', {'status': 200}, value=2)
+    instance.set_gauge('cache_items', 5, {'cache': 'model'})
+
+    actual: str = instance.render()
+
+    assert '# TYPE requests_total counter' in actual
+    assert 'requests_total{status="200"} 3' in actual
+    assert '# TYPE cache_items gauge' in actual
+    assert 'cache_items{cache="model"} 5' in actual
+
+
+def test_time_stage_should_observe_cumulative_histogram_buckets():
+    instance: MetricsDataAccess = MetricsDataAccess(histogram_buckets_in_seconds=(1, 10))
+
+    with instance.time_stage('training'):
+        pass
+
+    instance.observe('bifrost_stage_duration_seconds', 5, {'stage': 'training'})
+    actual: str = instance.render()
+
+    assert 'bifrost_stage_duration_seconds_bucket{stage="training",le="1"} 1' in actual
+    assert 'bifrost_stage_duration_seconds_bucket{stage="training",le="10"} 2' in actual
+    assert 'bifrost_stage_duration_seconds_bucket{stage="training",le="+Inf"} 2' in actual
+    assert 'bifrost_stage_duration_seconds_count{stage="training"} 2' in actual
+
+
+def test_render_should_invoke_registered_collectors():
+    instance: MetricsDataAccess = MetricsDataAccess()
+
+    instance.register_collector(lambda metrics: metrics.set_gauge('collected', 1))
+
+    assert 'collected 1' in instance.render()
@@ -0,0 +1,123 @@
+'''This module contains T1 tests for the model_registry_data_access module.'''
+
+# Setup root directory to allow for importing modules from a different adjacent directory.
+import sys
+import os
+
+root_repo_path = os.getcwd()
+sys.path.append(f'{root_repo_path}/src')
+
+# Testing
+import pytest # noqa
+import numpy as np # noqa
+import xgboost as xgb # noqa
+from data.config_data_access import ConfigDataAccess # noqa
+from data.model_registry_data_access import ModelRegistryDataAccess # noqa
+
+# Clear out test data.
+import shutil # noqa
+
+config = ConfigDataAccess()
+config.model_dir_relative_path = f'{config.model_dir_relative_path}_tmp'
+shutil.rmtree(config.model_dir_relative_path, ignore_errors=True)
+
+
+def __get_instance__() -> ModelRegistryDataAccess:
+    config: ConfigDataAccess = ConfigDataAccess()
+    config.model_dir_relative_path = f'{config.model_dir_relative_path}_tmp'
+
+    return ModelRegistryDataAccess(config_data_access=config)
+
+
+def __get_booster__() -> xgb.Booster:
+    x: np.ndarray = np.arange(20, dtype=np.float64).reshape(10, 2)
+    y: np.ndarray = np.arange(10, dtype=np.float64)
+
+    return xgb.train(params={'max_depth': 2}, dtrain=xgb.DMatrix(x, label=y), num_boost_round=2)
+
+
+def test_init_with_invalid_config_should_raise_error():
+    expected: str = 'Valid config_data_access is required.'
+
+    with pytest.raises(Exception) as e_info:
+        ModelRegistryDataAccess(config_data_access=None)
+
+    assert str(e_info.value) == expected
+
+
+def test_get_model_with_non_existing_key_should_return_none():
+    instance: ModelRegistryDataAccess = __get_instance__()
+
+    actual = instance.get_model(key='RandomKey')
+
+    assert actual is None
+
+
+def test_save_model_with_invalid_model_should_raise_error():
+    expected: str = 'Valid model is required.'
+    instance: ModelRegistryDataAccess = __get_instance__()
+
+    with pytest.raises(Exception) as e_info:
+        instance.save_model(key='test.model', model=None, metadata={})
+
+    assert str(e_info.value) == expected
+
+
+def test_save_model_with_valid_params_should_return_latest_model_and_metadata():
+    key: str = 'test.model'
+    booster: xgb.Booster = __get_booster__()
+    instance: ModelRegistryDataAccess = __get_instance__()
+
+    instance.save_model(key=key, model=booster, metadata={'global_scaling_factor': 100})
+    version: int = instance.save_model(key=key, model=booster, metadata={'global_scaling_factor': 1000})
+    actual_model, actual_metadata = instance.get_model(key=key)
+    x: xgb.DMatrix = xgb.DMatrix(np.arange(20, dtype=np.float64).reshape(10, 2))
+
+    assert actual_metadata['version'] == version
+    assert actual_metadata['global_scaling_factor'] == 1000
+    assert list(actual_model.predict(x)) == list(booster.predict(x))
+
+
+def test_get_model_older_than_max_age_should_return_none():
+    key: str = 'test.model.age'
+    instance: ModelRegistryDataAccess = __get_instance__()
+
+    instance.save_model(key=key, model=__get_booster__(), metadata={})
+
+    actual = instance.get_model(key=key, max_age_in_seconds=-1)
+
+    assert actual is None
+
+
+def test_prune_should_keep_only_newest_versions():
+    key: str = 'test.model.prune'
+    instance: ModelRegistryDataAccess = __get_instance__()
+    versions: list = [instance.save_model(key=key, model=__get_booster__(), metadata={}) for _ in range(4)]
+
+    removed_versions: list = instance.prune(key=key, versions_to_keep=2)
+
+    assert removed_versions == versions[:2]
+    assert instance.get_versions(key=key) == versions[2:]
+
+
+def test_save_parameters_should_replace_previous_parameters():
+    key: str = 'test.model.parameters'
+    instance: ModelRegistryDataAccess = __get_instance__()
+
+    instance.save_parameters(key=key, parameters={'max_depth': 2})
+    instance.save_parameters(key=key, parameters={'max_depth': 6})
+
+    assert instance.get_parameters(key=key) == {'max_depth': 6}
+    assert instance.get_parameters(key=key, max_age_in_seconds=-1) is None
+    assert instance.get_parameters(key='RandomKey') is None
+
+
+def test_save_training_profile_should_replace_previous_training_profile():
+    key: str = 'test.model.training_profile'
+    instance: ModelRegistryDataAccess = __get_instance__()
+
+    instance.save_training_profile(key=key, training_profile='fast')
+    instance.save_training_profile(key=key, training_profile='accurate')
+
+    assert instance.get_training_profile(key=key) == 'accurate'
+    assert instance.get_training_profile(key='RandomKey') is None
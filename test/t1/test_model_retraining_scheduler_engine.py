@@ -0,0 +1,60 @@
+'''This module contains T1 tests for the model_retraining_scheduler_engine module.'''
+
+# Setup root directory to allow for importing modules from a different adjacent directory.
+import sys
+import os
+
+root_repo_path = os.getcwd()
+sys.path.append(f'{root_repo_path}/src')
+
+# Testing
+import pytest # noqa
+import threading # noqa
+from engines.model_retraining_scheduler_engine import ModelRetrainingSchedulerEngine # noqa
+
+
+def test_init_with_invalid_retrain_model_should_raise_error():
+    expected: str = 'Valid retrain_model is required.'
+
+    with pytest.raises(Exception) as e_info:
+        ModelRetrainingSchedulerEngine(retrain_model=None)
+
+    assert str(e_info.value) == expected
+
+
+def test_get_next_due_time_should_align_to_next_candle_close():
+    instance: ModelRetrainingSchedulerEngine = ModelRetrainingSchedulerEngine(retrain_model=lambda pair_name, period: None, delay_after_candle_close_in_seconds=30)
+    now: float = 1656633600 + 20 * 60
+
+    actual: float = instance.get_next_due_time('1h', now)
+
+    assert actual == 1656633600 + 60 * 60 + 30
+
+
+def test_get_next_due_time_should_not_exceed_max_model_age():
+    instance: ModelRetrainingSchedulerEngine = ModelRetrainingSchedulerEngine(retrain_model=lambda pair_name, period: None, max_model_age_in_seconds=60)
+    now: float = 1656633600
+
+    actual: float = instance.get_next_due_time('1d', now)
+
+    assert actual == now + 60
+
+
+def test_register_when_disabled_should_not_schedule():
+    instance: ModelRetrainingSchedulerEngine = ModelRetrainingSchedulerEngine(retrain_model=lambda pair_name, period: None, is_enabled=False)
+
+    instance.register('DOGEBTC', '1h')
+
+    assert instance.get_active_keys() == []
+
+
+def test_register_should_retrain_model_in_background_when_due():
+    retrained = threading.Event()
+    instance: ModelRetrainingSchedulerEngine = ModelRetrainingSchedulerEngine(retrain_model=lambda pair_name, period: retrained.set(), max_model_age_in_seconds=0.01)
+
+    instance.register('DOGEBTC', '1h')
+
+    assert retrained.wait(timeout=5)
+    assert instance.get_active_keys() == [('DOGEBTC', '1h')]
+
+    instance.stop()
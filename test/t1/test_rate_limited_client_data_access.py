@@ -0,0 +1,127 @@
+'''This module contains T1 tests for the rate_limited_client_data_access module.'''
+
+# Setup root directory to allow for importing modules from a different adjacent directory.
+import sys
+import os
+
+root_repo_path = os.getcwd()
+sys.path.append(f'{root_repo_path}/src')
+sys.path.append(f'{root_repo_path}/test/stubs')
+
+# Testing
+import pytest # noqa
+import threading # noqa
+import time # noqa
+import requests # noqa
+from datetime import datetime # noqa
+from werkzeug.serving import make_server # noqa
+from binance_stub_server import create_app # noqa
+from data.config_data_access import ConfigDataAccess # noqa
+from data.fs_cache_data_access import FsCacheDataAccess # noqa
+from data.binance_data_access import BinanceDataAccess # noqa
+from data.rate_limited_client_data_access import RateLimitedClientDataAccess # noqa
+from models.binance import ForecastRequest # noqa
+
+KLINE_REQUEST = {'symbol': 'BTCUSDT', 'interval': '1h', 'limit': 1000}
+
+
+@pytest.fixture
+def stub_server():
+    '''Serve a stub server app, set by the test, on a free local port.'''
+    servers: list = []
+
+    def serve(app) -> str:
+        server = make_server('127.0.0.1', 0, app, threaded=True)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+
+        return f'http://127.0.0.1:{server.server_port}/api/v3/klines'
+
+    yield serve
+
+    for server in servers:
+        server.shutdown()
+
+
+def test_init_with_invalid_weight_budget_should_raise_error():
+    expected: str = 'Valid weight_budget_per_minute is required.'
+
+    with pytest.raises(Exception) as e_info:
+        RateLimitedClientDataAccess(session=requests.Session(), weight_budget_per_minute=0)
+
+    assert str(e_info.value) == expected
+
+
+def test_get_with_used_weight_header_should_track_used_weight(stub_server):
+    url: str = stub_server(create_app())
+    instance: RateLimitedClientDataAccess = RateLimitedClientDataAccess(session=requests.Session(), weight_budget_per_minute=100)
+
+    instance.get(url, params=KLINE_REQUEST, weight=5)
+    instance.get(url, params=KLINE_REQUEST, weight=5)
+
+    assert instance.get_used_weight() == 10
+
+
+def test_get_over_budget_should_wait_for_next_window(stub_server):
+    url: str = stub_server(create_app())
+    instance: RateLimitedClientDataAccess = RateLimitedClientDataAccess(session=requests.Session(), weight_budget_per_minute=10, window_length_in_seconds=1)
+    window_starts: list = []
+
+    for _ in range(3):
+        instance.get(url, params=KLINE_REQUEST, weight=5)
+        window_starts.append(int(time.time()))
+
+    assert window_starts[2] > window_starts[0]
+
+
+def test_get_with_ban_longer_than_max_wait_should_raise_error(stub_server):
+    url: str = stub_server(create_app(error_rate=1, error_status=418, retry_after_in_seconds=120))
+    instance: RateLimitedClientDataAccess = RateLimitedClientDataAccess(session=requests.Session(), weight_budget_per_minute=100, max_wait_in_seconds=1)
+
+    with pytest.raises(Exception) as e_info:
+        instance.get(url, params=KLINE_REQUEST, weight=5)
+
+    assert 'request weight budget is exhausted' in str(e_info.value)
+
+
+def test_get_with_persistent_errors_should_return_last_response_after_retries(stub_server):
+    app = create_app(error_rate=1, error_status=503, retry_after_in_seconds=0)
+    url: str = stub_server(app)
+    instance: RateLimitedClientDataAccess = RateLimitedClientDataAccess(session=requests.Session(), weight_budget_per_minute=100, max_retries=2, backoff_in_seconds=0.01)
+
+    actual: requests.Response = instance.get(url, params=KLINE_REQUEST, weight=5)
+
+    assert actual.status_code == 503
+    assert app.config['STUB_STATISTICS']['requests'] == 3
+
+
+def test_get_when_rate_limited_should_honour_retry_after(stub_server):
+    app = create_app(weight_limit_per_minute=5, retry_after_in_seconds=1)
+    url: str = stub_server(app)
+    instance: RateLimitedClientDataAccess = RateLimitedClientDataAccess(session=requests.Session(), weight_budget_per_minute=100, max_retries=1, backoff_in_seconds=0.01)
+
+    instance.get(url, params=KLINE_REQUEST, weight=5)
+    started_at: float = time.monotonic()
+    actual: requests.Response = instance.get(url, params=KLINE_REQUEST, weight=5)
+
+    assert actual.status_code == 429
+    assert time.monotonic() - started_at >= 1
+    assert app.config['STUB_STATISTICS']['rate_limited'] == 2
+
+
+def test_get_market_data_against_a_flaky_stub_server_should_retry_failed_pages(stub_server, tmp_path):
+    app = create_app(error_rate=0.3, error_status=500)
+    config: ConfigDataAccess = ConfigDataAccess()
+    config.data_dir_relative_path = os.path.relpath(tmp_path, os.getcwd())
+    config.window_length_in_days = 7
+    config.binance_max_klines_per_request = 50
+    config.binance_max_retries = 10
+    config.binance_base_api_url = stub_server(app).replace('/klines', '')
+    instance: BinanceDataAccess = BinanceDataAccess(config_data_access=config, cache_data_access=FsCacheDataAccess(config_data_access=config))
+    instance.client.backoff_in_seconds = 0.01
+
+    actual = instance.get_market_data(ForecastRequest('BTCUSDT', '1h', datetime.utcnow()))
+
+    assert app.config['STUB_STATISTICS']['injected_errors'] > 0
+    assert len(actual) >= 7 * 24
+    assert actual.time.is_unique and actual.time.is_monotonic_increasing
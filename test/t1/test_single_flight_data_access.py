@@ -0,0 +1,83 @@
+'''This module contains T1 tests for the single_flight_data_access module.'''
+
+# Setup root directory to allow for importing modules from a different adjacent directory.
+import sys
+import os
+
+root_repo_path = os.getcwd()
+sys.path.append(f'{root_repo_path}/src')
+
+# Testing
+import pytest # noqa
+import threading # noqa
+import time # noqa
+from concurrent.futures import ThreadPoolExecutor # noqa
+from data.single_flight_data_access import SingleFlightDataAccess # noqa
+
+
+def test_execute_with_invalid_key_should_raise_error():
+    expected: str = 'Valid key is required.'
+
+    with pytest.raises(Exception) as e_info:
+        SingleFlightDataAccess().execute(key=None, load=lambda: 1)
+
+    assert str(e_info.value) == expected
+
+
+def test_execute_with_concurrent_callers_should_load_once():
+    release = threading.Event()
+    load_count: list = []
+    instance: SingleFlightDataAccess = SingleFlightDataAccess(timeout_in_seconds=5)
+
+    def load():
+        load_count.append(1)
+        release.wait(timeout=5)
+
+        return 'result'
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures: list = [executor.submit(instance.execute, 'key', load) for _ in range(4)]
+        time.sleep(0.2)
+        release.set()
+        actual: list = [future.result() for future in futures]
+
+    assert actual == ['result'] * 4
+    assert len(load_count) == 1
+
+
+def test_execute_with_failing_load_should_raise_error_to_waiting_callers():
+    release = threading.Event()
+    instance: SingleFlightDataAccess = SingleFlightDataAccess(timeout_in_seconds=5)
+
+    def load():
+        release.wait(timeout=5)
+
+        raise Exception('Load failed.')
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures: list = [executor.submit(instance.execute, 'key', load) for _ in range(2)]
+        time.sleep(0.2)
+        release.set()
+
+        for future in futures:
+            with pytest.raises(Exception) as e_info:
+                future.result()
+
+            assert str(e_info.value) == 'Load failed.'
+
+
+def test_execute_when_waiting_longer_than_timeout_should_raise_error():
+    started = threading.Event()
+    release = threading.Event()
+    instance: SingleFlightDataAccess = SingleFlightDataAccess(timeout_in_seconds=0.01)
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        executor.submit(instance.execute, 'key', lambda: started.set() or release.wait(timeout=5))
+        started.wait(timeout=5)
+
+        with pytest.raises(Exception) as e_info:
+            instance.execute('key', lambda: None)
+
+        release.set()
+
+    assert str(e_info.value) == 'Timed out after 0.01 seconds waiting for "key".'
@@ -0,0 +1,56 @@
+'''This module contains T1 tests for the synthetic_market_data_access module.'''
+
+# Setup root directory to allow for importing modules from a different adjacent directory.
+import sys
+import os
+
+root_repo_path = os.getcwd()
+sys.path.append(f'{root_repo_path}/src')
+sys.path.append(f'{root_repo_path}/test/stubs')
+
+# Testing
+import pytest # noqa
+from synthetic_market_data_access import SyntheticMarketDataAccess, SyntheticKlineStreamDataAccess # noqa
+from data.kline_stream_data_access import get_kline_from_event # noqa
+
+HOUR_IN_MS = 60 * 60 * 1000
+START_TIME_MS = 1600000000000 // HOUR_IN_MS * HOUR_IN_MS
+
+
+def test_get_klines_with_invalid_period_should_raise_error():
+    expected: str = 'Valid period is required.'
+
+    with pytest.raises(Exception) as e_info:
+        SyntheticMarketDataAccess().get_klines('BTCUSDT', '1M', START_TIME_MS)
+
+    assert str(e_info.value) == expected
+
+
+def test_get_klines_should_honour_start_end_and_limit():
+    instance: SyntheticMarketDataAccess = SyntheticMarketDataAccess()
+
+    klines: list = instance.get_klines('BTCUSDT', '1h', START_TIME_MS + 1, START_TIME_MS + 10 * HOUR_IN_MS, limit=5)
+
+    assert [k[0] for k in klines] == [START_TIME_MS + i * HOUR_IN_MS for i in range(1, 6)]
+    assert len(instance.get_klines('BTCUSDT', '1h', START_TIME_MS, START_TIME_MS + 10 * HOUR_IN_MS, limit=100)) == 11
+
+
+def test_get_klines_with_overlapping_windows_should_agree():
+    instance: SyntheticMarketDataAccess = SyntheticMarketDataAccess()
+
+    first_window: list = instance.get_klines('BTCUSDT', '1h', START_TIME_MS, START_TIME_MS + 9 * HOUR_IN_MS)
+    second_window: list = instance.get_klines('BTCUSDT', '1h', START_TIME_MS + 5 * HOUR_IN_MS, START_TIME_MS + 14 * HOUR_IN_MS)
+
+    assert first_window[5:] == second_window[:5]
+    assert all(float(k[3]) <= min(float(k[1]), float(k[4])) and float(k[2]) >= max(float(k[1]), float(k[4])) for k in first_window)
+
+
+def test_synthetic_kline_stream_should_publish_the_live_synthetic_candle_of_each_subscription():
+    instance: SyntheticKlineStreamDataAccess = SyntheticKlineStreamDataAccess()
+    instance.subscribe('BTCUSDT', '1h')
+
+    pair_name, period, kline, is_closed = get_kline_from_event(instance.get_events(timeout_in_seconds=0)[-1])
+    expected: list = SyntheticMarketDataAccess().get_klines('BTCUSDT', '1h', kline[0], kline[0], 1)[0]
+
+    assert (pair_name, period, is_closed) == ('BTCUSDT', '1h', False)
+    assert kline[:6] == expected[:6]